@@ -0,0 +1 @@
+#noqa: D104
@@ -0,0 +1,65 @@
+"""File size and save/load latency of the session file formats.
+
+Usage: python -m benchmarks.bench_compression [--dates 12 60 240]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+from pathlib import Path
+
+from src.sortfin.cmd import SESSION_FORMATS, load_session, save_session
+
+from .generator import generate_session
+from .timing import best_time
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dates", type=int, nargs="+", default=[12, 60, 240])
+    parser.add_argument("--branches", type=int, default=2)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fan-out", type=int, default=4)
+    parser.add_argument(
+        "--formats", nargs="+", default=["yaml", "yaml.gz", "yaml.xz"],
+        choices=list(SESSION_FORMATS),
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logger.info(
+        "%6s %8s %12s %7s %10s %10s",
+        "dates", "format", "size (kB)", "ratio", "save (s)", "load (s)",
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_dates in args.dates:
+            session = generate_session(
+                n_dates=n_dates,
+                n_branches=args.branches,
+                depth=args.depth,
+                fan_out=args.fan_out,
+            )
+            ref_size = None
+            for session_format in args.formats:
+                file_path = Path(tmp_dir) / f"bench{SESSION_FORMATS[session_format]}"
+                save = best_time(
+                    lambda p=file_path: save_session(session, p), args.repeat,
+                )
+                load = best_time(
+                    lambda p=file_path: load_session(p).keys(), args.repeat,
+                )
+                size = file_path.stat().st_size
+                if ref_size is None:
+                    ref_size = size
+                logger.info(
+                    "%6d %8s %12.1f %7.2f %10.4f %10.4f",
+                    n_dates, session_format, size / 1e3, ref_size / size, save, load,
+                )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
@@ -0,0 +1,78 @@
+"""JSON versus YAML for session files.
+
+Times the text parsing/dumping of the list encoding alone and the full
+load_session/save_session round trip.
+
+Usage: python -m benchmarks.bench_json [--dates 12 60 240]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import tempfile
+from pathlib import Path
+
+import yaml
+
+from src.sortfin.cmd import load_session, save_session
+from src.sortfin.to_yaml import from_session_to_list
+
+from .generator import generate_session
+from .timing import best_time
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dates", type=int, nargs="+", default=[12, 60, 240])
+    parser.add_argument("--branches", type=int, default=2)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fan-out", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logger.info(
+        "%6s %6s %10s %10s %10s %10s %10s",
+        "dates", "format", "size (kB)", "parse (s)", "dump (s)", "load (s)", "save (s)",
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_dates in args.dates:
+            session = generate_session(
+                n_dates=n_dates,
+                n_branches=args.branches,
+                depth=args.depth,
+                fan_out=args.fan_out,
+            )
+            session_list = from_session_to_list(session)
+            codecs = {
+                "yaml": (yaml.safe_load, yaml.safe_dump),
+                "json": (json.loads, json.dumps),
+            }
+            ref = None
+            for name, (parse, dump) in codecs.items():
+                text = dump(session_list)
+                file_path = Path(tmp_dir) / f"bench.{name}"
+                parse_time = best_time(lambda p=parse, t=text: p(t), args.repeat)
+                dump_time = best_time(lambda d=dump: d(session_list), args.repeat)
+                save_time = best_time(
+                    lambda f=file_path: save_session(session, f), args.repeat,
+                )
+                load_time = best_time(lambda f=file_path: load_session(f), args.repeat)
+                times = (parse_time, dump_time, load_time, save_time)
+                if ref is None:
+                    ref = times
+                logger.info(
+                    "%6d %6s %10.1f %10.4f %10.4f %10.4f %10.4f",
+                    n_dates, name, len(text) / 1e3, *times,
+                )
+            logger.info(
+                "%6s %6s %10s %9.1fx %9.1fx %9.1fx %9.1fx",
+                "", "gain", "", *(r / t for r, t in zip(ref, times, strict=True)),
+            )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
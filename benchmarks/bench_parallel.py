@@ -0,0 +1,61 @@
+"""Scaling of parallel statement decoding/encoding with the number of workers.
+
+Usage: python -m benchmarks.bench_parallel [--dates 240] [--max-workers 8]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+
+from src.sortfin.to_yaml import from_list_to_session, from_session_to_list
+
+from .generator import generate_session
+from .timing import best_time
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dates", type=int, default=240)
+    parser.add_argument("--branches", type=int, default=3)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fan-out", type=int, default=5)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    session = generate_session(
+        n_dates=args.dates,
+        n_branches=args.branches,
+        depth=args.depth,
+        fan_out=args.fan_out,
+    )
+    session_list = from_session_to_list(session)
+    logger.info(
+        "%d statements, %d workers max\n%8s %12s %8s %12s %8s",
+        len(session.data), args.max_workers,
+        "workers", "decode (s)", "speedup", "encode (s)", "speedup",
+    )
+    ref_decode = ref_encode = 0.0
+    for workers in range(1, args.max_workers + 1):
+        decode = best_time(
+            lambda w=workers: from_list_to_session(session_list, workers=w),
+            args.repeat,
+        )
+        encode = best_time(
+            lambda w=workers: from_session_to_list(session, workers=w),
+            args.repeat,
+        )
+        if workers == 1:
+            ref_decode, ref_encode = decode, encode
+        logger.info(
+            "%8d %12.4f %8.2f %12.4f %8.2f",
+            workers, decode, ref_decode / decode, encode, ref_encode / encode,
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
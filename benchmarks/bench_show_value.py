@@ -0,0 +1,72 @@
+"""Asset.show_value versus the original digit-list formatting.
+
+Formats random values (mixed magnitudes and signs) with assets of several
+separator/decimal settings, checks that both give the same strings and times
+them.
+
+Usage: python -m benchmarks.bench_show_value [--values 1000000]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+
+from src.sortfin.asset import Asset, _show_value_slow
+
+from .timing import best_time
+
+logger = logging.getLogger(__name__)
+
+ASSETS = [
+    Asset("USD", "$"),
+    Asset("EUR", "€", decimal_symbol=",", separator_symbol="."),
+    Asset("JPY", "¥", separator_param=4, decimal_param=0),
+    Asset("BTC", "₿", decimal_param=8),
+]
+
+
+def show_value_slow(asset: Asset, value: float) -> str:
+    return _show_value_slow(
+        value, asset.symbol, asset.separator_symbol,
+        asset.decimal_param, asset.separator_param,
+    )
+
+
+def generate_values(n_values: int, seed: int = 0) -> list[float]:
+    rng = random.Random(seed)
+    return [
+        rng.choice([-1, 1]) * 10 ** rng.uniform(-1, 7)
+        for _ in range(n_values)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--values", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    values = generate_values(args.values)
+    logger.info("%6s %12s %12s %8s", "asset", "slow (s)", "fast (s)", "gain")
+    for asset in ASSETS:
+        fast = [asset.show_value(v) for v in values]
+        slow = [show_value_slow(asset, v) for v in values]
+        if fast != slow:
+            msg = f"show_value output differs for {asset.name}"
+            raise AssertionError(msg)
+        slow_time = best_time(
+            lambda a=asset: [show_value_slow(a, v) for v in values], args.repeat,
+        )
+        fast_time = best_time(
+            lambda a=asset: [a.show_value(v) for v in values], args.repeat,
+        )
+        logger.info(
+            "%6s %12.3f %12.3f %7.1fx",
+            asset.name, slow_time, fast_time, slow_time / fast_time,
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
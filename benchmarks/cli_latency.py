@@ -0,0 +1,231 @@
+"""End-to-end latency of the sortfin-cli commands, as felt by users.
+
+Creates a temporary workspace (.sortfin/.info plus a generated session per
+size, see suite.SIZES) and runs each command many times in a subprocess:
+process start, imports, argument parsing, session load, command and save
+are all measured. Reports the p50/p95/p99 wall times and the peak RSS of
+the subprocesses, per command and session size.
+
+Usage:
+    python -m benchmarks.cli_latency [--sizes small medium] [--runs 20]
+    python -m benchmarks.cli_latency --cli sortfin-cli  # installed entry point
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.sortfin.account_path import AccountPath
+from src.sortfin.cli.cli_statement import save_session_info
+from src.sortfin.cmd import SESSION_FORMATS, save_session
+from src.sortfin.session import Session
+
+from .generator import generate_session
+from .suite import SIZES
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SESSION_NAME = "bench"
+# run from the sources, as `sortfin-cli` would once installed
+SOURCE_CLI = [
+    sys.executable, "-c",
+    "from src.sortfin.cli.cli_statement import main; main()",
+]
+# {account} is a terminal account of the session, {value} changes at each run
+COMMANDS = {
+    "show-branches": ["show-branches"],
+    "show-dates": ["show-dates"],
+    "print-structure": ["print-structure"],
+    "print-summary": ["print-summary"],
+    "diff": ["diff"],
+    "change-account-value": ["change-account-value", "{account}", "{value}"],
+}
+
+
+def _get_terminal_path(session: Session, branch: str) -> str:
+    account = session.get_statement(session.dates(branch)[-1], branch).account
+    parts = []
+    while account.sub_accounts is not None:
+        account = account.sub_accounts[0]
+        parts.append(account.name)
+    return str(AccountPath("/".join(parts)))
+
+
+def create_workspace(workspace: Path, size: str, session_format: str) -> str:
+    """Write a generated session and its .sortfin/.info, get a terminal account path."""
+    session = generate_session(**SIZES[size])
+    branch = Session.DEFAULT_WORKING_BRANCH
+    save_session(session, workspace / (SESSION_NAME + SESSION_FORMATS[session_format]))
+    (workspace / ".sortfin").mkdir()
+    save_session_info(
+        SESSION_NAME, branch, session.dates(branch)[-1], workspace / ".sortfin" / ".info",
+    )
+    return _get_terminal_path(session, branch)
+
+
+# Runs the commands (output discarded) and measures them, one JSON request and
+# result per line. The peak RSS of a forked process starts at the one of its
+# parent: commands are spawned from this minimal process rather than from the
+# benchmark process.
+LAUNCHER_CODE = """
+import json, os, sys, time
+for line in sys.stdin:
+    request = json.loads(line)
+    os.chdir(request["cwd"])
+    start = time.perf_counter()
+    pid = os.posix_spawnp(
+        request["argv"][0], request["argv"], request["env"],
+        file_actions=[
+            (os.POSIX_SPAWN_OPEN, fd, os.devnull, os.O_WRONLY, 0) for fd in (1, 2)
+        ],
+    )
+    _, status, rusage = os.wait4(pid, 0)
+    elapsed = time.perf_counter() - start
+    print(json.dumps([elapsed, rusage.ru_maxrss, os.waitstatus_to_exitcode(status)]), flush=True)
+"""
+
+
+class Launcher:
+    """Run commands from a minimal subprocess, for their wall time and peak RSS.
+
+    Without os.wait4 (Windows), commands are run directly and the peak RSS is
+    not measured.
+    """
+
+    def __init__(self) -> None:
+        self._process : subprocess.Popen|None = None
+        if hasattr(os, "wait4"):
+            self._process = subprocess.Popen(  # noqa: S603
+                [sys.executable, "-S", "-I", "-c", LAUNCHER_CODE],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+
+    def run(self, argv: list[str], cwd: Path, env: dict[str, str]) -> tuple[float, int|None, int]:
+        """Run a command, get its (wall time in s, peak RSS in kB, exit code)."""
+        if self._process is None:
+            start = time.perf_counter()
+            returncode = subprocess.run(  # noqa: S603
+                argv, cwd=cwd, env=env, check=False,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            ).returncode
+            return time.perf_counter() - start, None, returncode
+        assert self._process.stdin is not None #noqa: S101
+        assert self._process.stdout is not None #noqa: S101
+        self._process.stdin.write(
+            json.dumps({"argv": argv, "cwd": str(cwd), "env": env}) + "\n",
+        )
+        self._process.stdin.flush()
+        elapsed, peak_rss, returncode = json.loads(self._process.stdout.readline())
+        # ru_maxrss is in kB on Linux, in bytes on macOS
+        return elapsed, peak_rss // 1024 if sys.platform == "darwin" else peak_rss, returncode
+
+    def close(self) -> None:
+        if self._process is not None:
+            self._process.communicate()
+            self._process = None
+
+
+def get_stats(times: list[float], peak_rss: list[int|None]) -> dict:
+    """Get the p50/p95/p99 wall times (in s) and the max peak RSS (in kB)."""
+    if len(times) > 1:
+        percentiles = statistics.quantiles(times, n=100, method="inclusive")
+        p50, p95, p99 = percentiles[49], percentiles[94], percentiles[98]
+    else:
+        p50 = p95 = p99 = times[0]
+    rss = [r for r in peak_rss if r is not None]
+    return {
+        "runs": len(times),
+        "p50": p50,
+        "p95": p95,
+        "p99": p99,
+        "peak_rss_kb": max(rss) if len(rss) > 0 else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"])
+    parser.add_argument("--commands", nargs="+", choices=list(COMMANDS), default=list(COMMANDS))
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs per command")
+    parser.add_argument("--format", choices=list(SESSION_FORMATS), default="yaml")
+    parser.add_argument(
+        "--cli",
+        type=str,
+        default=None,
+        help="Command running sortfin-cli (default: python running the sources)",
+    )
+    parser.add_argument(
+        "--cli-args",
+        type=str,
+        default="",
+        help="Global sortfin-cli options, e.g. '--no-cache'",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    cli = shlex.split(args.cli) if args.cli is not None else SOURCE_CLI
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT)}
+    launcher = Launcher()
+    results : dict[str, dict[str, dict]] = {}
+    logger.info(
+        "%8s %22s %9s %9s %9s %12s",
+        "size", "command", "p50 (s)", "p95 (s)", "p99 (s)", "peak RSS (MB)",
+    )
+    for size in args.sizes:
+        results[size] = {}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            workspace = Path(tmp_dir)
+            account = create_workspace(workspace, size, args.format)
+            for command in args.commands:
+                times, peak_rss = [], []
+                for i in range(args.warmup + args.runs):
+                    argv = [
+                        *cli, *shlex.split(args.cli_args),
+                        *(a.format(account=account, value=i) for a in COMMANDS[command]),
+                    ]
+                    elapsed, rss, returncode = launcher.run(argv, workspace, env)
+                    if returncode != 0:
+                        msg = f"{shlex.join(argv)} failed with exit code {returncode}"
+                        raise RuntimeError(msg)
+                    if i >= args.warmup:
+                        times.append(elapsed)
+                        peak_rss.append(rss)
+                stats = get_stats(times, peak_rss)
+                results[size][command] = stats
+                logger.info(
+                    "%8s %22s %9.3f %9.3f %9.3f %12s",
+                    size, command, stats["p50"], stats["p95"], stats["p99"],
+                    f"{stats['peak_rss_kb'] / 1024:.1f}"
+                    if stats["peak_rss_kb"] is not None else "-",
+                )
+    launcher.close()
+    if args.output is not None:
+        args.output.write_text(json.dumps({
+            "python": sys.version.split()[0],
+            "format": args.format,
+            "cli": cli,
+            "cli_args": args.cli_args,
+            "sizes": {size: SIZES[size] for size in args.sizes},
+            "results": results,
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
@@ -0,0 +1,138 @@
+"""Generate synthetic sessions for the benchmarks."""
+from __future__ import annotations
+
+import datetime as dt
+import random
+
+from src.sortfin.account import Account
+from src.sortfin.asset import Asset
+from src.sortfin.asset_database import AssetDatabase
+from src.sortfin.fx_market import FxMarket
+from src.sortfin.session import Session
+from src.sortfin.statement import Statement
+
+CURRENCIES = [
+    Asset("USD", "$"),
+    Asset("EUR", "€"),
+    Asset("GBP", "£"),
+    Asset("JPY", "¥", decimal_param=0, separator_param=4),
+    Asset("CHF", "Fr"),
+    Asset("CAD", "C$"),
+    Asset("AUD", "A$"),
+    Asset("SEK", "kr", decimal_symbol=",", separator_symbol=" "),
+]
+START_DATE = dt.datetime(2020, 1, 31, tzinfo=dt.timezone.utc)
+
+
+def generate_asset_db(n_assets: int) -> AssetDatabase:
+    """Get an asset database with `n_assets` currencies."""
+    asset_db = AssetDatabase()
+    for i in range(n_assets):
+        if i < len(CURRENCIES):
+            asset_db.add_asset(CURRENCIES[i].copy())
+        else:
+            asset_db.add_asset(Asset(f"X{i:02d}", f"x{i}"))
+    return asset_db
+
+
+FX_SHAPES = ["star", "chain", "tree"]
+
+
+def generate_fx_market(
+        asset_names: list[str],
+        rng: random.Random,
+        fx_shape: str = "star",
+    ) -> FxMarket:
+    """Quote each asset against one of the previous ones.
+
+    star: every asset against the first one, chain: against the previous one
+    (the longest quote paths), tree: against a random previous one.
+    """
+    if fx_shape not in FX_SHAPES:
+        msg = f"unknown FX shape: {fx_shape} (available: {', '.join(FX_SHAPES)})"
+        raise ValueError(msg)
+    fx_mkt = FxMarket()
+    for i, name in enumerate(asset_names[1:], start=1):
+        if fx_shape == "star":
+            other = asset_names[0]
+        elif fx_shape == "chain":
+            other = asset_names[i - 1]
+        else:
+            other = asset_names[rng.randrange(i)]
+        fx_mkt.quotes[(name, other)] = round(rng.uniform(0.01, 2.0), 6)
+    return fx_mkt
+
+
+def generate_account(  # noqa: PLR0913
+        name: str,
+        unit: str,
+        asset_names: list[str],
+        rng: random.Random,
+        depth: int,
+        fan_out: int,
+    ) -> Account:
+    """Get a folder with `fan_out` children per level and terminal leaves."""
+    if depth == 0:
+        return Account(name, unit, value=round(rng.uniform(-1e4, 1e6), 2))
+    return Account(
+        name,
+        unit,
+        sub_accounts=[
+            generate_account(
+                f"{name[0]}{depth}_{i}",
+                rng.choice(asset_names) if rng.random() < 0.2 else unit,  # noqa: PLR2004
+                asset_names,
+                rng,
+                depth - 1,
+                fan_out,
+            )
+            for i in range(fan_out)
+        ],
+    )
+
+
+def _perturb(statement: Statement, date: dt.datetime, rng: random.Random) -> Statement:
+    res = statement.copy(date=date)
+    accounts = [res.account]
+    while len(accounts) > 0:
+        acc = accounts.pop()
+        if acc.sub_accounts is None:
+            acc.value = round(acc.value * rng.uniform(0.9, 1.1), 2)
+        else:
+            accounts += acc.sub_accounts
+    res.fx_market.quotes = {
+        k: round(v * rng.uniform(0.98, 1.02), 6)
+        for k, v in res.fx_market.quotes.items()
+    }
+    return res
+
+
+def generate_session(  # noqa: PLR0913
+        n_dates: int = 12,
+        n_branches: int = 2,
+        depth: int = 3,
+        fan_out: int = 4,
+        n_assets: int = 4,
+        seed: int = 0,
+        fx_shape: str = "star",
+    ) -> Session:
+    """Get a session with monthly statements for `n_dates` dates per branch."""
+    rng = random.Random(seed)  # noqa: S311
+    asset_db = generate_asset_db(n_assets)
+    asset_names = [a.name for a in CURRENCIES[:n_assets]] + [
+        f"X{i:02d}" for i in range(len(CURRENCIES), n_assets)
+    ]
+    base = Statement(
+        START_DATE,
+        generate_fx_market(asset_names, rng, fx_shape),
+        generate_account("root", asset_names[0], asset_names, rng, depth, fan_out),
+    )
+    branches = [Session.DEFAULT_BRANCH, Session.DEFAULT_WORKING_BRANCH] + [
+        f"branch_{i}" for i in range(2, n_branches)
+    ]
+    session = Session(asset_db)
+    for branch in branches[:n_branches]:
+        for i in range(n_dates):
+            date = START_DATE + dt.timedelta(days=30 * i)
+            session.data[(date, branch)] = _perturb(base, date, rng)
+    return session
@@ -0,0 +1,197 @@
+"""Benchmark suite of the main session operations, with baseline comparison.
+
+Generates sessions of several sizes (see SIZES) and times load/save (YAML
+and JSON), get_quote, print-summary, print-structure, diff, copy_statement
+and add_asset on each of them. The results are written as JSON and compared
+to a baseline file: operations slower than the baseline by more than the
+tolerance are flagged as regressions.
+
+Usage:
+    python -m benchmarks.suite [--sizes small medium] [--output results.json]
+    python -m benchmarks.suite --save-baseline  # store the reference results
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import logging
+import platform
+import sys
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.sortfin.cmd import add_asset, load_session, save_session
+from src.sortfin.session import Session
+
+from .generator import generate_session
+from .timing import best_time
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+RESULTS_VERSION = 1
+DEFAULT_BASELINE_PATH = Path(__file__).parent / "baseline.json"
+# regressions smaller than this (in seconds) are considered as noise
+MIN_DELTA = 0.001
+
+SIZES = {
+    "small": {
+        "n_dates": 12, "n_branches": 2, "depth": 3, "fan_out": 4,
+        "n_assets": 4, "fx_shape": "star",
+    },
+    "medium": {
+        "n_dates": 60, "n_branches": 2, "depth": 4, "fan_out": 4,
+        "n_assets": 8, "fx_shape": "tree",
+    },
+    "large": {
+        "n_dates": 120, "n_branches": 3, "depth": 3, "fan_out": 6,
+        "n_assets": 16, "fx_shape": "chain",
+    },
+}
+
+
+def get_operations(session: Session, tmp_dir: Path) -> dict[str, Callable[[], object]]:
+    """Get the benchmarked operations on a session (name -> function)."""
+    branch = Session.DEFAULT_BRANCH
+    dates = session.dates(branch)
+    first_date, last_date = dates[0], dates[-1]
+    asset_names = [a.name for a in session.asset_db]
+    statements = [session.data[key] for key in session.keys()]
+    paths = {
+        session_format: tmp_dir / f"bench.{session_format}"
+        for session_format in ["yaml", "json"]
+    }
+    for file_path in paths.values():
+        save_session(session, file_path)
+    new_assets = iter(range(1_000_000))
+
+    def _get_quote() -> None:
+        # cold FX caches: every statement is valued as after a load
+        for statement in statements:
+            statement.fx_market.clear_cache()
+            for name in asset_names:
+                statement.fx_market.get_quote(session.asset_db, name, asset_names[0])
+
+    def _copy_statement() -> None:
+        paste_date = last_date + dt.timedelta(days=1)
+        session.copy_statement(last_date, paste_date, branch, branch)
+        session.delete_statement(paste_date, branch)
+
+    def _add_asset() -> None:
+        name = f"B{next(new_assets):06d}"
+        add_asset(session, branch, first_date, name, "b", f"{name}/{asset_names[0]}", 1.5, 2)
+
+    operations : dict[str, Callable[[], object]] = {}
+    for session_format, file_path in paths.items():
+        operations[f"load.{session_format}"] = lambda f=file_path: load_session(f)
+        operations[f"save.{session_format}"] = \
+            lambda f=file_path: save_session(session, f)
+    operations.update({
+        "get_quote": _get_quote,
+        "print_summary": lambda: session.print_summary(last_date, branch),
+        "print_structure": lambda: session.print_structure(last_date, branch),
+        "diff": lambda: session.diff(first_date, last_date, branch, branch),
+        "copy_statement": _copy_statement,
+        # last: the asset database grows with each call
+        "add_asset": _add_asset,
+    })
+    return operations
+
+
+def run_suite(sizes: list[str], repeat: int) -> dict:
+    """Time all the operations on the sessions of `sizes`."""
+    results : dict[str, dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            session = generate_session(**SIZES[size])
+            results[size] = {}
+            for name, operation in get_operations(session, Path(tmp_dir)).items():
+                results[size][name] = best_time(operation, repeat)
+                logger.info("%8s %16s %10.4f", size, name, results[size][name])
+    return {
+        "version": RESULTS_VERSION,
+        "date": dt.datetime.now(tz=dt.timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "sizes": {size: SIZES[size] for size in sizes},
+        "results": results,
+    }
+
+
+def compare_results(
+        results: dict,
+        baseline: dict,
+        tolerance: float,
+    ) -> list[tuple[str, str, float, float]]:
+    """Get the (size, operation, baseline time, time) of the regressions.
+
+    An operation regresses when it is more than `tolerance` (relative) and
+    MIN_DELTA (absolute) slower than in the baseline. Sizes are only compared
+    if they were generated with the same parameters.
+    """
+    regressions = []
+    for size, times in results["results"].items():
+        if baseline.get("sizes", {}).get(size) != results["sizes"][size]:
+            continue
+        for name, time in times.items():
+            base_time = baseline["results"][size].get(name)
+            if base_time is not None and \
+                time > base_time * (1 + tolerance) and time - base_time > MIN_DELTA:
+                regressions.append((size, name, base_time, time))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=None, help="Write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write the results to the baseline file instead of comparing them",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Relative slowdown flagged as a regression (default: 0.2)",
+    )
+    args = parser.parse_args()
+
+    logger.info("%8s %16s %10s", "size", "operation", "time (s)")
+    results = run_suite(args.sizes, args.repeat)
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        logger.info("Baseline saved to %s", args.baseline)
+        return
+    if not args.baseline.exists():
+        logger.info("No baseline at %s (create one with --save-baseline)", args.baseline)
+        return
+    regressions = compare_results(
+        results, json.loads(args.baseline.read_text()), args.tolerance,
+    )
+    for size, name, base_time, time in regressions:
+        logger.warning(
+            "REGRESSION %8s %16s %10.4f -> %10.4f (%+.0f%%)",
+            size, name, base_time, time, 100 * (time / base_time - 1),
+        )
+    if len(regressions) > 0:
+        sys.exit(1)
+    logger.info("No regression against %s", args.baseline)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
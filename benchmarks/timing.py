@@ -0,0 +1,18 @@
+"""Timing helpers shared by the benchmarks."""
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """Get the best wall time of `repeat` calls to `func`, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
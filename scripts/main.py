@@ -5,11 +5,8 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from src.sortfin.account_path import AccountPath
-from src.sortfin.cli.cli_statement import (
-    load_session_from_yaml,
-    load_session_info,
-)
-from src.sortfin.cmd import show_diff
+from src.sortfin.cli.cli_statement import load_session_info
+from src.sortfin.cmd import load_session_from_yaml, show_diff
 from src.sortfin.session import Session
 
 logging.basicConfig(level=logging.INFO)
@@ -1,9 +1,16 @@
-from .account import Account  # noqa: D104
+from __future__ import annotations  # noqa: D104
+
+from typing import TYPE_CHECKING
+
+from .account import Account
 from .account_path import AccountPath
 from .asset import Asset
-from .cli import main
 from .fx_market import FxMarket
 from .statement import Statement, initialize_statement
+from .valuation import ValuationReport
+
+if TYPE_CHECKING:
+    from .cli import main
 
 __all__ = [
     "Account",
@@ -11,6 +18,16 @@ __all__ = [
     "Asset",
     "FxMarket",
     "Statement",
+    "ValuationReport",
     "initialize_statement",
     "main",
 ]
+
+
+def __getattr__(name: str) -> object:
+    # the CLI (argparse, session files...) is only imported when used
+    if name == "main":
+        from .cli import main  # noqa: PLC0415
+        return main
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -4,9 +4,11 @@ from typing import TYPE_CHECKING, Any, Iterator
 
 from .account_path import AccountPath
 from .colors import Color
+from .counters import COUNTERS
 from .price import Price
 
 if TYPE_CHECKING:
+    from .asset import Asset
     from .asset_database import AssetDatabase
     from .fx_market import FxMarket
 
@@ -74,6 +76,13 @@ class Account:  # noqa: PLW1641
         self.value = new_value
 
     def get_account(self, path: AccountPath | None) -> Account:
+        if COUNTERS.enabled:
+            COUNTERS.add("account.get_account.calls")
+        return self._get_account(path)
+
+    def _get_account(self, path: AccountPath | None) -> Account:
+        if COUNTERS.enabled:
+            COUNTERS.add("account.get_account.nodes")
         if path is None or path.is_empty:
             return self
         if self.sub_accounts is None:
@@ -93,7 +102,7 @@ class Account:  # noqa: PLW1641
         if len(sa_match_list) > 1:
             msg= f"multiple matches for {path.root_folder} in {self.name}"
             raise ValueError(msg)
-        return sa_match_list[0].get_account(path.get_child())
+        return sa_match_list[0]._get_account(path.get_child()) #noqa: SLF001
 
     def delete_account(self, path: AccountPath) -> bool:
         if path.is_empty:
@@ -189,17 +198,40 @@ class Account:  # noqa: PLW1641
             fx_mkt: FxMarket,
             unit: str,
         ) -> float:
+        # the rates to unit come from a single table of the FX market, indexed
+        # by the asset codes of the account units
+        test, asset_unit = asset_db.find_asset_from_input(unit)
+        if not test or asset_unit is None:
+            msg=f"asset {unit} not found in asset database"
+            raise ValueError(msg)
+        if COUNTERS.enabled:
+            COUNTERS.add("valuation.calls")
+            COUNTERS.add("valuation.nodes", self.count_accounts())
+        return self._sum_value(
+            asset_db, fx_mkt.get_rate_table(asset_db, asset_unit.name), unit,
+        )
+
+    def _sum_value(
+            self,
+            asset_db: AssetDatabase,
+            rates: list[float|None],
+            unit: str,
+        ) -> float:
         if self.sub_accounts is None:
             if self.value is None:
                 msg="account is not terminal"
                 raise ValueError(msg)
-            fx_rate = fx_mkt.get_quote(asset_db, self.unit, unit)
+            code = asset_db.get_code(self.unit)
+            if code is None:
+                msg=f"asset {self.unit} not found in asset database"
+                raise ValueError(msg)
+            fx_rate = rates[code]
             if fx_rate is None:
                 msg=f"no quote for {self.unit} to {unit}"
                 raise ValueError(msg)
             return self.value * fx_rate
         return sum([
-            sa._get_account_value(asset_db, fx_mkt, unit) #noqa: SLF001
+            sa._sum_value(asset_db, rates, unit) #noqa: SLF001
             for sa in self.sub_accounts
         ])
 
@@ -267,46 +299,12 @@ class Account:  # noqa: PLW1641
             path: AccountPath|None = None,
             unit: str|None = None,
         ) -> str:
-        res = ""
-        total = 0
-        def _line_to_str(name: str, price1: Price|None, price2: Price) -> str:
-            _price1 = price1 if price1 is not None else ""
-            color1 = Color.GREEN if price1 is not None and price1.value > 0 \
-                else Color.MAGENTA
-            len_name = len(name)
-            space1 = 30 - len_name
-            len_val1 = len(str(_price1))
-            space2 = 25 - len_val1
-            color2 = Color.GREEN if price2 is not None and price2.value > 0 \
-                else Color.MAGENTA
-            return (
-                f"\n{name}:{' ' * space1}"
-                f"{color1}{_price1}{Color.RESET}{' ' * space2}"
-                f"{color2}{price2}{Color.RESET}"
-            )
-
-        for name, price1, price2 in self.get_account_summary(
-            asset_db,
-            fx_mkt,
-            path,
-            unit,
-        ):
-            total += price2.value
-            res += _line_to_str(f"{Color.CYAN}{name}{Color.RESET}", price1, price2)
+        summary = self.get_account_summary(asset_db, fx_mkt, path, unit)
         asset_unit = asset_db.get_asset_from_name(self.unit)
         if asset_unit is None:
             msg=f"asset {self.unit} not found in asset database"
             raise ValueError(msg)
-        return (
-            f"Account Summary: "
-            f"{Color.RED}{self.name if self.name != 'root' else 'TOTAL'}{Color.RESET}"
-            f" {Color.YELLOW}{asset_unit.name}{Color.RESET}{res}"
-            f"{_line_to_str(
-                f'{Color.YELLOW}TOTAL{Color.RESET}',
-                None,
-                Price(total, asset_unit)
-            )}\n"
-        )
+        return format_account_summary(self.name, asset_unit, summary)
 
     def add_account(
             self,
@@ -337,6 +335,17 @@ class Account:  # noqa: PLW1641
                 Account(path.name, sub_accounts=[], unit=unit_to_use),
             ]
 
+    def count_accounts(self) -> int:
+        """Count this account and all its sub-accounts."""
+        count = 0
+        stack = [self]
+        while len(stack) > 0:
+            account = stack.pop()
+            count += 1
+            if account.sub_accounts is not None:
+                stack.extend(account.sub_accounts)
+        return count
+
     def copy(self) -> Account:
         if self.sub_accounts is None:
             return Account(
@@ -421,4 +430,40 @@ class Account:  # noqa: PLW1641
         return ""
 
 
+def format_account_summary(
+        name: str,
+        asset_unit: Asset,
+        summary: list[tuple[str, Price, Price]],
+    ) -> str:
+    """Format the (name, native price, price) lines of an account summary."""
+    res = ""
+    total = 0
+    def _line_to_str(name: str, price1: Price|None, price2: Price) -> str:
+        _price1 = price1 if price1 is not None else ""
+        color1 = Color.GREEN if price1 is not None and price1.value > 0 \
+            else Color.MAGENTA
+        len_name = len(name)
+        space1 = 30 - len_name
+        len_val1 = len(str(_price1))
+        space2 = 25 - len_val1
+        color2 = Color.GREEN if price2 is not None and price2.value > 0 \
+            else Color.MAGENTA
+        return (
+            f"\n{name}:{' ' * space1}"
+            f"{color1}{_price1}{Color.RESET}{' ' * space2}"
+            f"{color2}{price2}{Color.RESET}"
+        )
 
+    for sa_name, price1, price2 in summary:
+        total += price2.value
+        res += _line_to_str(f"{Color.CYAN}{sa_name}{Color.RESET}", price1, price2)
+    return (
+        f"Account Summary: "
+        f"{Color.RED}{name if name != 'root' else 'TOTAL'}{Color.RESET}"
+        f" {Color.YELLOW}{asset_unit.name}{Color.RESET}{res}"
+        f"{_line_to_str(
+            f'{Color.YELLOW}TOTAL{Color.RESET}',
+            None,
+            Price(total, asset_unit)
+        )}\n"
+    )
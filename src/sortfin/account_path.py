@@ -61,6 +61,11 @@ class AccountPath:
     def name(self) -> str:
         return self.parts[-1]
 
+    @property
+    def normalized(self) -> str:
+        """Get the path as matched against accounts (names are case-insensitive)."""
+        return "/".join(part.upper() for part in self.parts)
+
     def get_child(self) -> AccountPath:
         return AccountPath("/".join(self.parts[1:]))
 
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import functools
 import math
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
 
 class Asset:
@@ -21,12 +26,19 @@ class Asset:
         return self.name
 
     def __hash__(self) -> int:
-        return (
-            self.name + self.symbol + self.decimal_symbol + self.separator_symbol,
-            str(self.decimal_param)+ str(self.separator_param),
-        ).__hash__()
+        try:
+            return self._hash
+        except AttributeError:
+            # not computed yet, or reset by a change of the asset fields
+            self.__dict__["_hash"] = (
+                self.name + self.symbol + self.decimal_symbol + self.separator_symbol,
+                str(self.decimal_param)+ str(self.separator_param),
+            ).__hash__()
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Asset):
             return  False
         return self.__hash__() == other.__hash__()
@@ -43,33 +55,142 @@ class Asset:
 
     def show_value(self, value: float) -> str:
         """Format the value with the asset's symbol and separators."""
+        try:
+            return self._value_format(value)
+        except AttributeError:
+            # not compiled yet, or reset by a change of the asset format
+            self.__dict__["_value_format"] = _compile_value_format(
+                self.symbol, self.separator_symbol,
+                self.decimal_param, self.separator_param,
+            )
+        return self._value_format(value)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        super().__setattr__(name, value)
+        if name in _HASH_FIELDS:
+            self.__dict__.pop("_hash", None)
+        if name in _VALUE_FORMAT_FIELDS:
+            self.__dict__.pop("_value_format", None)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # string hashes are salted per process: never reuse a pickled one
+        state.pop("_hash", None)
+        state.pop("_value_format", None)
+        return state
+
+
+_HASH_FIELDS = frozenset([
+    "name", "symbol", "decimal_symbol", "separator_symbol",
+    "decimal_param", "separator_param",
+])
+
+
+_VALUE_FORMAT_FIELDS = frozenset(
+    ["symbol", "separator_symbol", "decimal_param", "separator_param"],
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_value_format(
+        symbol: str,
+        separator_symbol: str,
+        decimal_param: int,
+        separator_param: int,
+    ) -> Callable[[float], str]:
+    """Build the show_value function of an asset format.
+
+    The original algorithm counts the integer digits with log10: its output
+    only differs from the usual grouping for values below 0.1 or when the
+    integer part is only made of 9s (log10 rounding up just below a power of 10).
+    These rare values are still formatted by `_show_value_slow`, so the output
+    is always identical.
+    """
+    scale = 10 ** decimal_param
+    zero = f"{symbol} 0"
+    positive_prefix = f"{symbol} "
+    negative_prefix = f"- {symbol} "
+    decimal_spec = f"0{decimal_param}d"
+
+    def _slow(value: float) -> str:
+        return _show_value_slow(
+            value, symbol, separator_symbol, decimal_param, separator_param,
+        )
+
+    if separator_param == 3:  # noqa: PLR2004
+        def _group(int_value: int) -> str:
+            return f"{int_value:,}".replace(",", separator_symbol)
+        if separator_symbol == ",":
+            def _group(int_value: int) -> str:
+                return f"{int_value:,}"
+    else:
+        def _group(int_value: int) -> str:
+            digits = str(int_value)
+            first = len(digits) % separator_param or separator_param
+            return separator_symbol.join([
+                digits[:first],
+                *(
+                    digits[i:i + separator_param]
+                    for i in range(first, len(digits), separator_param)
+                ),
+            ])
+
+    def _show_value(value: float) -> str:
         if value == 0:
-            return f"{self.symbol} 0"
-        factor = 1 if value >= 0 else -1
-        value = abs(value)
-        remainer = int(round(
-            value * 10 ** self.decimal_param - int(value)* 10 ** self.decimal_param,
-            0,
-        ))
-        delta = 0
-        if remainer == 10 ** self.decimal_param:
+            return zero
+        abs_value = abs(value)
+        int_value = int(abs_value)
+        remainer = round(abs_value * scale - int_value * scale)
+        if remainer == scale:
             remainer = 0
-            delta = 1
-        n = int(math.log10(value + 1e-10 + delta)) + 1
-        m = n % self.separator_param
-        value_list = list(str(int(value) + delta))
-        res = "".join(value_list[:m])
-        for i in range(int((n - m) / self.separator_param)):
-            if res != "":
-                res += self.separator_symbol
-            res += "".join(
-                value_list[(m+i*self.separator_param):(m+(i+1)*self.separator_param)],
-            )
-        adding_zero_to_decimal = "".join([
-            "0"
-            for k in range(self.decimal_param - int(math.log10(remainer+1e-10)) - 1)
-        ])
-        return (
-            f"{'- ' if factor<0 else ''}{self.symbol} {res}"
-            f"{'.' + adding_zero_to_decimal + str(remainer) if remainer !=0 else ''}"
+            int_value += 1
+        if (int_value == 0 and abs_value < 0.11) or (  # noqa: PLR2004
+                (int_value + 1) % 10 == 0 and str(int_value + 1)[1:].strip("0") == ""
+            ):
+            return _slow(value)
+        prefix = negative_prefix if value < 0 else positive_prefix
+        if remainer == 0:
+            return prefix + _group(int_value)
+        return f"{prefix}{_group(int_value)}.{remainer:{decimal_spec}}"
+
+    return _show_value
+
+
+def _show_value_slow(  # noqa: PLR0913
+        value: float,
+        symbol: str,
+        separator_symbol: str,
+        decimal_param: int,
+        separator_param: int,
+    ) -> str:
+    """Format a value with the original digit-counting algorithm."""
+    if value == 0:
+        return f"{symbol} 0"
+    factor = 1 if value >= 0 else -1
+    value = abs(value)
+    remainer = int(round(
+        value * 10 ** decimal_param - int(value)* 10 ** decimal_param,
+        0,
+    ))
+    delta = 0
+    if remainer == 10 ** decimal_param:
+        remainer = 0
+        delta = 1
+    n = int(math.log10(value + 1e-10 + delta)) + 1
+    m = n % separator_param
+    value_list = list(str(int(value) + delta))
+    res = "".join(value_list[:m])
+    for i in range(int((n - m) / separator_param)):
+        if res != "":
+            res += separator_symbol
+        res += "".join(
+            value_list[(m+i*separator_param):(m+(i+1)*separator_param)],
         )
+    adding_zero_to_decimal = "".join([
+        "0"
+        for k in range(decimal_param - int(math.log10(remainer+1e-10)) - 1)
+    ])
+    return (
+        f"{'- ' if factor<0 else ''}{symbol} {res}"
+        f"{'.' + adding_zero_to_decimal + str(remainer) if remainer !=0 else ''}"
+    )
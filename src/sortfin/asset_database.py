@@ -6,8 +6,21 @@ from .asset import Asset
 
 
 class AssetDatabase:
+    """Set of assets, indexed by name.
+
+    Each asset also gets a dense integer code (its index in `names`), so that
+    per-asset tables (see `FxMarket.get_rate_table`) can be plain lists.
+    `assets`, the name index and the codes are kept in sync by `add_asset` and
+    `remove_asset`: use them rather than modifying `assets` directly.
+    """
+
     def __init__(self) -> None:
         self.assets : set[Asset] = set()
+        self._by_name : dict[str, Asset] = {}
+        # replaced (never modified) when codes change, tables built for a
+        # database check it by identity
+        self.names : tuple[str, ...] = ()
+        self.codes : dict[str, int] = {}
 
     def __str__(self) -> str:
         res = "AssetDatabase: \n"
@@ -22,7 +35,10 @@ class AssetDatabase:
     def copy(self) -> AssetDatabase:
         """Create a copy of the AssetDatabase."""
         res = AssetDatabase()
-        res.assets = {a.copy() for a in self.assets}
+        res._by_name = {name: a.copy() for name, a in self._by_name.items()}  # noqa: SLF001
+        res.assets = set(res._by_name.values())  # noqa: SLF001
+        res.names = self.names
+        res.codes = self.codes.copy()
         return res
 
     def find_asset_from_input(self, asset_input: Asset|str) -> tuple[bool, Asset|None]:
@@ -31,26 +47,29 @@ class AssetDatabase:
         if not isinstance(asset_input, str):
             msg = f"Asset input must be of type asset or str, not {type(asset_input)}"
             raise TypeError(msg)
-        asset_list = [a for a in self.assets if a.name == asset_input]
-        if len(asset_list) == 0:
-            return False, None
-        if len(asset_list) > 1:
-            msg=(
-                f"AssetDatabase is corrupted as there are more than one {asset_input}:"
-                f" {','.join([a.name + '-' +  a.symbol for a in asset_list])}"
-            )
-            raise ValueError(msg)
-        return True, asset_list[0]
+        asset = self._by_name.get(asset_input)
+        return asset is not None, asset
 
     def add_asset(self, asset: Asset) -> None:
-        test, _ = self.find_asset_from_input(asset)
-        if test:
+        existing = self._by_name.get(asset.name)
+        if existing is not None:
             msg = (
                 f"Asset {asset} already exists in the AssetDatabase"
-                f" (available assets: {', '.join([a.name for a in self.assets])})"
+                f"{'' if existing == asset else f' with symbol {existing.symbol}'}"
+                f" (available assets: {', '.join(self._by_name)})"
             )
             raise ValueError(msg)
         self.assets.add(asset)
+        self._by_name[asset.name] = asset
+        self.codes[asset.name] = len(self.names)
+        self.names = (*self.names, asset.name)
+
+    def get_code(self, asset_input: Asset|str) -> int|None:
+        """Get the code of an asset (None if it is not in the database)."""
+        if isinstance(asset_input, str):
+            return self.codes.get(asset_input)
+        test, asset = self.find_asset_from_input(asset_input)
+        return self.codes[asset.name] if test and asset is not None else None
 
     def get_asset_from_name(self, asset_id: str) -> Asset|None:
         test, asset = self.find_asset_from_input(asset_id)
@@ -60,3 +79,7 @@ class AssetDatabase:
         test, _ = self.find_asset_from_input(asset)
         if test:
             self.assets.discard(asset)
+            if self._by_name.get(asset.name) == asset:
+                del self._by_name[asset.name]
+                self.names = tuple(name for name in self.names if name != asset.name)
+                self.codes = {name: code for code, name in enumerate(self.names)}
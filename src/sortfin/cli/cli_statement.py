@@ -1,21 +1,32 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import csv
 import logging
+import pickle
+import shlex
+import sys
+from collections.abc import Iterator
 from pathlib import Path
 import datetime as dt
 
-import yaml
-
 from ..account import Account
 from ..account_path import AccountPath
 from ..asset import Asset
 from ..colors import Color
+from ..counters import COUNTERS
+from ..file_io import FileLock, LockTimeoutError, atomic_open, get_lock_path
+from ..profiling import Profiler
 from ..session import Session, initialize_session
+from ..session_header import SessionHeader
 
-from ..cmd import load_session_from_yaml, save_session_to_yaml, \
-                    show_branches, show_dates, show_diff, \
-                    add_asset, change_account_value, change_fx_quote, checkout_date, delete_date
+from ..cmd import SESSION_FORMATS, SessionConflictError, SessionFileError, convert_session, get_session_file_path, load_session, save_session, \
+                    load_session_header, load_session_with_cache, store_session_cache, \
+                    ReportCache, get_memory_report, show_branches, show_dates, show_diff, show_structure, show_summary, \
+                    add_asset, change_account_value, import_fx, import_values, change_fx_quote, checkout_date, delete_date
+from ..cmd.memory import PERIODS
+from ..cmd.report_cache import REPORT_CACHE_DIR_NAME
 
 
 
@@ -29,10 +40,9 @@ def datetime_from_str(date_str: str, with_time: bool) -> dt.datetime:
     return res
 
 def load_session_info(info_path: Path) -> tuple[str, str, dt.datetime]|None:
-    session_info = None
-    with info_path.open("r") as info_file:
-        session_info=yaml.safe_load(info_file)
-    if session_info is None:
+    # plain "session,branch,date" line (read without yaml, which is slow to import)
+    session_info = info_path.read_text().strip()
+    if session_info == "":
         return None
     session_info_split = session_info.split(",")
     assert len(session_info_split) == 3
@@ -48,39 +58,174 @@ def save_session_info(
         date: dt.datetime,
         file_path: Path,
     ) -> None:
-    file_path.write_text(f"{session},{branch},{date.isoformat()}")
+    with atomic_open(file_path) as info_file:
+        info_file.write(f"{session},{branch},{date.isoformat()}")
     return
 
-def main(logger: logging.Logger|None = None) -> None:
-    """Handle command line arguments and execute."""
-    if logger is None:
-        logging.basicConfig(level=logging.INFO, format="%(message)s")
-        logger = logging.getLogger(__name__)
+class CliState:
+    """Session and .sortfin/.info state shared by the commands of a CLI run.
+
+    The session is loaded on first use and changes stay in memory until `flush`
+    writes them to disk.
+    """
+
+    UNSET_SESSION = "<UNSET>"
+
+    def __init__(
+            self,
+            info_path: Path,
+            *,
+            workers: int|None = None,
+            use_cache: bool = True,
+            lock_timeout: float = 10.0,
+        ) -> None:
+        self.info_path = info_path
+        self.workers = workers
+        self.use_cache = use_cache
+        self.lock_timeout = lock_timeout
+        self.info_session: str = self.UNSET_SESSION
+        self.info_branch: str|None = None
+        self.info_date: dt.datetime|None = None
+        self.pending_changes = 0
+        self._info_modified = False
+        self._session: Session|None = None
+        self._lock: FileLock|None = None
+
+        if info_path.exists():
+            session_info = load_session_info(info_path)
+            if session_info is not None:
+                self.info_session, self.info_branch, self.info_date = session_info
+        else:
+            if not info_path.parent.exists():
+                info_path.parent.mkdir()
+            info_path.touch()
+            #TODO what happens if file empty??
+            logging.error("No info file found. Creating a new one.\n")
+
+    @property
+    def file_path(self) -> Path:
+        return get_session_file_path(self.info_session)
+
+    @property
+    def session(self) -> Session:
+        if self._session is None:
+            self._session = load_session(self.file_path, workers=self.workers) \
+                if not self.use_cache else \
+                load_session_with_cache(self.file_path, self.info_path.parent, workers=self.workers)
+        return self._session
+
+    @property
+    def report_cache(self) -> ReportCache|None:
+        """Get the rendered report cache of .sortfin/ (None if caches are disabled)."""
+        if not self.use_cache:
+            return None
+        return ReportCache(self.info_path.parent / REPORT_CACHE_DIR_NAME)
+
+    @property
+    def catalog(self) -> Session|SessionHeader:
+        """Get the session, or only the header of its file if not loaded yet."""
+        if self._session is None:
+            header = load_session_header(self.file_path)
+            if header is not None:
+                return header
+        return self.session
+
+    def prompt(self) -> str:
+        date = self.info_date.date().isoformat() if self.info_date is not None else ""
+        pending = "*" if self.pending_changes > 0 else ""
+        return f"({self.info_session}|{self.info_branch}|{date}){pending} sortfin> "
+
+    @contextlib.contextmanager
+    def locked(self) -> Iterator[bool]:
+        """Hold the write lock of the session file (yields whether it was taken here).
+
+        Readers never take it. Nested calls share the lock taken by the outer one.
+        """
+        if self._lock is not None:
+            yield False
+            return
+        self._lock = FileLock(get_lock_path(self.file_path), timeout=self.lock_timeout)
+        try:
+            with self._lock:
+                yield True
+        finally:
+            self._lock = None
+
+    def reload(self) -> None:
+        """Discard the changes made in memory: the session is loaded again on next use."""
+        self._session = None
+        self.pending_changes = 0
+
+    def snapshot(self) -> tuple:
+        """Get a copy of the in-memory state, to `restore` if a command fails midway."""
+        session_data = pickle.dumps(self._session, protocol=pickle.HIGHEST_PROTOCOL) \
+            if self._session is not None else None
+        return (
+            session_data,
+            self.pending_changes,
+            self.info_branch,
+            self.info_date,
+            self._info_modified,
+        )
 
-    info_session="<UNSET>"
-    info_branch=None
-    info_date=None
-    info_path = Path.cwd() / ".sortfin" / ".info"
-    
-    if info_path.exists():
-        session_info = load_session_info(info_path)
-        if session_info is not None:
-            info_session, info_branch, info_date = session_info
-    else:
-        if not info_path.parent.exists():
-            info_path.parent.mkdir()
-        info_path.touch()
-        #TODO what happens if file empty??
-        logging.error("No info file found. Creating a new one.\n")
-        
-    parser = argparse.ArgumentParser(description="Accounting Library CLI")
-    subparser = parser.add_subparsers(
-        dest="command",
-        help="Sub-command to execute",
-    )
+    def restore(self, snapshot: tuple) -> None:
+        """Go back to the state of `snapshot` (see `snapshot`)."""
+        session_data, self.pending_changes, self.info_branch, self.info_date, \
+            self._info_modified = snapshot
+        self._session = None
+        if session_data is not None:
+            self._session = pickle.loads(session_data)  # noqa: S301
+
+    def mark_modified(self) -> None:
+        self.pending_changes += 1
+
+    def set_info(self, branch: str, date: dt.datetime) -> None:
+        self.info_branch = branch
+        self.info_date = date
+        self._info_modified = True
+
+    def switch_session(
+            self,
+            session_name: str,
+            branch: str,
+            date: dt.datetime,
+            logger: logging.Logger,
+        ) -> None:
+        """Write pending changes, then make `session_name` the current session."""
+        self.flush(logger)
+        self.info_session = session_name
+        self.set_info(branch, date)
+        self._session = None
+        self.flush(logger)
+
+    def flush(self, logger: logging.Logger) -> None:
+        """Write the pending session changes and .info state to disk."""
+        if self.pending_changes > 0 and self._session is not None:
+            with self.locked():
+                file_path = self.file_path
+                save_session(
+                    self._session,
+                    file_path,
+                    workers=self.workers,
+                    check_revision=True,
+                )
+                self.pending_changes = 0
+                if self.use_cache:
+                    store_session_cache(self._session, file_path, self.info_path.parent)
+                msg=f"Session modified and saved to {file_path}.\n"
+                logger.info(msg)
+        if self._info_modified:
+            save_session_info(
+                self.info_session,
+                self.info_branch,
+                self.info_date,
+                self.info_path,
+            )
+            self._info_modified = False
 
 #region create
 
+def _add_create_parser(subparser: argparse._SubParsersAction) -> None:
     create_parser = subparser.add_parser(
         "create",
         help="Create a new session",
@@ -108,11 +253,21 @@ def main(logger: logging.Logger|None = None) -> None:
         default=None,
         help="Initial Date (format: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS) (default=now utc)",
     )
+    create_parser.add_argument(
+        "--format",
+        choices=list(SESSION_FORMATS),
+        default="yaml",
+        help=(
+            "Format of the session file (default: yaml, "
+            "yaml.gz/yaml.xz: compressed, json: fast to load, sfdb: indexed statements)"
+        ),
+    )
 
 #endregion
 
 #region change-session
 
+def _add_change_session_parser(subparser: argparse._SubParsersAction) -> None:
     checkout_session_parser = subparser.add_parser(
         "change-session",
         help="Change to another existing session",
@@ -120,22 +275,44 @@ def main(logger: logging.Logger|None = None) -> None:
     checkout_session_parser.add_argument(
         "file_name",
         type=str,
-        help="Name of the YAML file (without extension)",
+        help="Name of the session file (without extension)",
+    )
+
+#endregion
+
+#region convert-session
+
+def _add_convert_session_parser(subparser: argparse._SubParsersAction) -> None:
+    convert_session_parser = subparser.add_parser(
+        "convert-session",
+        help="Convert a session file to another file format (the new file replaces it)",
+    )
+    convert_session_parser.add_argument(
+        "file_name",
+        type=str,
+        help="Name of the session file (without extension)",
+    )
+    convert_session_parser.add_argument(
+        "format",
+        choices=list(SESSION_FORMATS),
+        help="Format of the new session file",
     )
 
 #endregion
 
 #region show-branches
 
+def _add_show_branches_parser(subparser: argparse._SubParsersAction) -> None:
     _ = subparser.add_parser(
         "show-branches",
         help="Show all available branches",
     )
-    
+
 #endregion
 
 #region show-dates
 
+def _add_show_dates_parser(subparser: argparse._SubParsersAction) -> None:
     showdates_parser = subparser.add_parser(
         "show-dates",
         help=(
@@ -149,11 +326,12 @@ def main(logger: logging.Logger|None = None) -> None:
         default=Session.DEFAULT_BRANCH,
         help="Specify a branch in particular"
     )
-    
+
 #endregion
 
 #region checkout-date
 
+def _add_checkout_date_parser(subparser: argparse._SubParsersAction) -> None:
     showdates_parser = subparser.add_parser(
         "checkout-date",
         help="checkout an existing date",
@@ -169,6 +347,7 @@ def main(logger: logging.Logger|None = None) -> None:
 
 #region push
 
+def _add_push_parser(subparser: argparse._SubParsersAction) -> None:
     push_parser = subparser.add_parser(
         "push",
         help="Push the current working branch to the main branch.\n",
@@ -183,6 +362,8 @@ def main(logger: logging.Logger|None = None) -> None:
 #endregion
 
 #region restore
+
+def _add_restore_parser(subparser: argparse._SubParsersAction) -> None:
     restore_parser = subparser.add_parser(
         "restore",
         help="Restore the current working branch to the main branch.\n",
@@ -193,10 +374,12 @@ def main(logger: logging.Logger|None = None) -> None:
         default=Session.DEFAULT_BRANCH,
         help="Branch to restore to (default: main branch)",
     )
+
 #endregion
 
 #region add-date
 
+def _add_add_date_parser(subparser: argparse._SubParsersAction) -> None:
     newdate_parser = subparser.add_parser(
         "add-date",
         help="Create a new date in the session",
@@ -212,6 +395,7 @@ def main(logger: logging.Logger|None = None) -> None:
 
 #region delete-date
 
+def _add_delete_date_parser(subparser: argparse._SubParsersAction) -> None:
     del_date_parser = subparser.add_parser(
         "delete-date",
         help="Delete a date from the session",
@@ -231,7 +415,8 @@ def main(logger: logging.Logger|None = None) -> None:
 #endregion
 
 #region diff
-    
+
+def _add_diff_parser(subparser: argparse._SubParsersAction) -> None:
     diff_parser = subparser.add_parser(
         "diff",
         help=(
@@ -272,6 +457,7 @@ def main(logger: logging.Logger|None = None) -> None:
 
 #region print-structure
 
+def _add_print_structure_parser(subparser: argparse._SubParsersAction) -> None:
     print_structure_parser = subparser.add_parser(
         "print-structure",
         help="Print the structure of the current statement",
@@ -287,6 +473,7 @@ def main(logger: logging.Logger|None = None) -> None:
 
 #region print-summary
 
+def _add_print_summary_parser(subparser: argparse._SubParsersAction) -> None:
     print_summary_parser = subparser.add_parser(
         "print-summary",
         help="Print the summary of the session",
@@ -308,6 +495,7 @@ def main(logger: logging.Logger|None = None) -> None:
 
 #region add-account
 
+def _add_add_account_parser(subparser: argparse._SubParsersAction) -> None:
     add_account_parser = subparser.add_parser(
         "add-account",
         help="Add a new account within a folder account",
@@ -331,6 +519,8 @@ def main(logger: logging.Logger|None = None) -> None:
 #endregion
 
 #region delete-account
+
+def _add_delete_account_parser(subparser: argparse._SubParsersAction) -> None:
     delete_account_parser = subparser.add_parser(
         "delete-account",
         help="Delete an account",
@@ -340,10 +530,12 @@ def main(logger: logging.Logger|None = None) -> None:
         type=str,
         help="Path to the account to delete",
     )
+
 #endregion
 
 #region change-account-value
 
+def _add_change_account_value_parser(subparser: argparse._SubParsersAction) -> None:
     change_account_value_parser = subparser.add_parser(
         "change-account-value",
         help="Change the value of an account",
@@ -363,6 +555,7 @@ def main(logger: logging.Logger|None = None) -> None:
 
 #region add-asset
 
+def _add_add_asset_parser(subparser: argparse._SubParsersAction) -> None:
     add_asset_parser = subparser.add_parser(
         "add-asset",
         help="Add a new asset to the session",
@@ -398,6 +591,7 @@ def main(logger: logging.Logger|None = None) -> None:
 
 #region change-account-asset
 
+def _add_change_account_asset_parser(subparser: argparse._SubParsersAction) -> None:
     change_asset_parser = subparser.add_parser(
         "change-account-asset",
         help="Change asset of account",
@@ -412,11 +606,12 @@ def main(logger: logging.Logger|None = None) -> None:
         type=str,
         help="Name of the new asset",
     )
-    
+
 #endregion
 
 #region change-fx-quote
 
+def _add_change_fx_quote_parser(subparser: argparse._SubParsersAction) -> None:
     change_fx_quote_parser = subparser.add_parser(
         "change-fx-quote",
         help="Change the FX quote for a given pair of assets in the session",
@@ -434,9 +629,258 @@ def main(logger: logging.Logger|None = None) -> None:
 
 #endregion
 
+#region import-values
 
-    args = parser.parse_args()
-    if info_session == "<UNSET>" and args.command not in ["create", "checkout"]:
+def _add_import_values_parser(subparser: argparse._SubParsersAction) -> None:
+    import_values_parser = subparser.add_parser(
+        "import-values",
+        help=(
+            "Set account values from a CSV file of date,branch,account_path,value[,unit] rows "
+            "(applied all at once, or not at all if a row is invalid)"
+        ),
+    )
+    import_values_parser.add_argument(
+        "file_name",
+        type=str,
+        help="CSV file to import (an optional first line starting with `date` is skipped)",
+    )
+
+#endregion
+
+#region import-fx
+
+def _add_import_fx_parser(subparser: argparse._SubParsersAction) -> None:
+    import_fx_parser = subparser.add_parser(
+        "import-fx",
+        help=(
+            "Set FX quotes from a CSV file of date,asset1/asset2,rate rows: each row goes "
+            "to the statement at or before its date (applied all at once, or not at all)"
+        ),
+    )
+    import_fx_parser.add_argument(
+        "file_name",
+        type=str,
+        help="CSV file to import (an optional first line starting with `date` is skipped)",
+    )
+    import_fx_parser.add_argument(
+        "--branch",
+        type=str,
+        default=Session.DEFAULT_BRANCH,
+        help="Branch of the modified statements (default: main branch)",
+    )
+
+#endregion
+
+#region mem-report
+
+def _add_mem_report_parser(subparser: argparse._SubParsersAction) -> None:
+    mem_report_parser = subparser.add_parser(
+        "mem-report",
+        help=(
+            "Load the session file and report its memory by component (accounts, FX "
+            "markets, datetimes, strings...), branch and period"
+        ),
+    )
+    mem_report_parser.add_argument(
+        "--branch",
+        type=str,
+        nargs="+",
+        default=None,
+        help="Branches of the reported statements (default: all)",
+    )
+    mem_report_parser.add_argument(
+        "--date_from",
+        type=str,
+        default=None,
+        help="First date of the reported statements (format: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
+    )
+    mem_report_parser.add_argument(
+        "--date_to",
+        type=str,
+        default=None,
+        help="Last date of the reported statements (format: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
+    )
+    mem_report_parser.add_argument(
+        "--period",
+        choices=PERIODS,
+        default="all",
+        help="Report the statements by year or month (default: all together)",
+    )
+    mem_report_parser.add_argument(
+        "--no-trace",
+        action="store_true",
+        help="Only count the objects (tracemalloc makes the load several times slower)",
+    )
+    mem_report_parser.add_argument(
+        "--json",
+        type=Path,
+        default=None,
+        help="Also write the report to this JSON file",
+    )
+
+#endregion
+
+#region shell
+
+def _add_shell_parser(subparser: argparse._SubParsersAction) -> None:
+    shell_parser = subparser.add_parser(
+        "shell",
+        help="Run commands interactively against one in-memory session",
+    )
+    shell_parser.add_argument(
+        "--autosave",
+        type=int,
+        default=0,
+        help="Save after this many modifying commands (default: 0, on save/exit only)",
+    )
+
+#endregion
+
+#region run
+
+def _add_run_parser(subparser: argparse._SubParsersAction) -> None:
+    run_parser = subparser.add_parser(
+        "run",
+        help=(
+            "Run a script of commands (one per line) against one in-memory session: "
+            "the session is saved once at the end, and not at all if a command fails"
+        ),
+    )
+    run_parser.add_argument(
+        "script",
+        type=str,
+        nargs="?",
+        default="-",
+        help="File of commands (default: -, read from stdin)",
+    )
+
+#endregion
+
+COMMAND_PARSERS = {
+    "create": _add_create_parser,
+    "change-session": _add_change_session_parser,
+    "convert-session": _add_convert_session_parser,
+    "show-branches": _add_show_branches_parser,
+    "show-dates": _add_show_dates_parser,
+    "checkout-date": _add_checkout_date_parser,
+    "push": _add_push_parser,
+    "restore": _add_restore_parser,
+    "add-date": _add_add_date_parser,
+    "delete-date": _add_delete_date_parser,
+    "diff": _add_diff_parser,
+    "print-structure": _add_print_structure_parser,
+    "print-summary": _add_print_summary_parser,
+    "add-account": _add_add_account_parser,
+    "delete-account": _add_delete_account_parser,
+    "change-account-value": _add_change_account_value_parser,
+    "add-asset": _add_add_asset_parser,
+    "change-account-asset": _add_change_account_asset_parser,
+    "change-fx-quote": _add_change_fx_quote_parser,
+    "import-values": _add_import_values_parser,
+    "import-fx": _add_import_fx_parser,
+    "mem-report": _add_mem_report_parser,
+    "shell": _add_shell_parser,
+    "run": _add_run_parser,
+}
+
+def get_command(argv: list[str]) -> str|None:
+    """Get the sortfin-cli command of a command line, without building its sub-parser.
+
+    Only the global options are parsed (so that their values are not taken for
+    the command). None is returned if there is no command or they are invalid:
+    the full parser reports the errors.
+    """
+    parser = argparse.ArgumentParser(add_help=False, exit_on_error=False)
+    _add_global_arguments(parser)
+    try:
+        _, remaining_argv = parser.parse_known_args(argv)
+    except argparse.ArgumentError:
+        return None
+    if len(remaining_argv) == 0 or remaining_argv[0] not in COMMAND_PARSERS:
+        return None
+    return remaining_argv[0]
+
+def _add_global_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of processes used to load/save large sessions (default: 1)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not use the caches of .sortfin/ (parsed session, rendered reports)",
+    )
+    parser.add_argument(
+        "--lock-timeout",
+        type=float,
+        default=10.0,
+        help="Seconds to wait for another process writing the session (default: 10)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the time of each phase (load, FX, render, save...) and the peak memory",
+    )
+    parser.add_argument(
+        "--profile-json",
+        type=Path,
+        default=None,
+        help="Write the phase times and peak memory to this JSON file",
+    )
+    parser.add_argument(
+        "--profile-cprofile",
+        type=Path,
+        default=None,
+        help="Also profile the command with cProfile and dump its stats to this file",
+    )
+    parser.add_argument(
+        "--profile-no-memory",
+        action="store_true",
+        help="Do not measure the peak memory (tracemalloc slows down Python code several times)",
+    )
+    parser.add_argument(
+        "--counters",
+        action="store_true",
+        help="Print the counts of FX searches, account lookups, valuations and copies",
+    )
+    parser.add_argument(
+        "--counters-json",
+        type=Path,
+        default=None,
+        help="Write the counts of --counters to this JSON file",
+    )
+
+def build_parser(command: str|None = None) -> argparse.ArgumentParser:
+    """Build the parser of sortfin-cli commands.
+
+    With `command`, only its sub-parser is built (all of them otherwise, e.g. for
+    help, unknown commands and the shell): a single command line does not pay
+    for building the others.
+    """
+    parser = argparse.ArgumentParser(description="Accounting Library CLI")
+    _add_global_arguments(parser)
+    subparser = parser.add_subparsers(
+        dest="command",
+        help="Sub-command to execute",
+    )
+
+    if command in COMMAND_PARSERS:
+        COMMAND_PARSERS[command](subparser)
+        return parser
+    for add_command_parser in COMMAND_PARSERS.values():
+        add_command_parser(subparser)
+    return parser
+
+def run_command(
+        args: argparse.Namespace,
+        state: CliState,
+        logger: logging.Logger,
+    ) -> None:
+    """Execute one parsed command against the in-memory session of `state`."""
+    if state.info_session == CliState.UNSET_SESSION and \
+        args.command not in ["create", "checkout", "convert-session"]:
         logger.error("Session name not set. Please create a new session first.")
         return
     
@@ -452,47 +896,92 @@ def main(logger: logging.Logger|None = None) -> None:
             )
             
         session = initialize_session(Asset(args.asset_name, args.asset_symbol), initial_date)
-        file_path = Path(args.file_name + ".yaml")
-        if file_path.exists():
-            err_msg=f"file already exists: {file_path}"
+        existing_file_path = get_session_file_path(args.file_name)
+        if existing_file_path.exists():
+            err_msg=f"file already exists: {existing_file_path}"
             logger.error(err_msg)
             return
-        save_session_to_yaml(session, file_path)
-        save_session_info(args.file_name, Session.DEFAULT_WORKING_BRANCH, initial_date, info_path)
+        file_path = get_session_file_path(args.file_name, args.format)
+        save_session(session, file_path)
+        state.switch_session(args.file_name, Session.DEFAULT_WORKING_BRANCH, initial_date, logger)
         msg=f"Session created and saved to {file_path}"
         logger.info(msg)
         return
     
     if args.command == "change-session":
-        file_path = Path(args.file_name + ".yaml")
+        file_path = get_session_file_path(args.file_name)
         if not file_path.exists():
             err_msg=f"file does not exist: {file_path}"
             logger.error(err_msg)
             return
-        last_date = load_session_from_yaml(file_path).dates()[-1]
-        save_session_info(
+        header = load_session_header(file_path)
+        last_date = (
+            header if header is not None
+            else load_session(file_path, workers=state.workers)
+        ).dates()[-1]
+        state.switch_session(
             args.file_name,
             Session.DEFAULT_BRANCH,
             last_date,
-            info_path,
+            logger,
         )
         return
 
-#endregion
+    if args.command == "convert-session":
+        source_path = get_session_file_path(args.file_name)
+        target_path = get_session_file_path(args.file_name, args.format)
+        if not source_path.exists():
+            err_msg=f"file does not exist: {source_path}"
+            logger.error(err_msg)
+            return
+        if target_path.exists():
+            err_msg=f"session {args.file_name} is already in {args.format} format: {target_path}"
+            logger.error(err_msg)
+            return
+        state.flush(logger)
+        # the new file replaces the source: a session has a single file
+        with FileLock(get_lock_path(source_path), timeout=state.lock_timeout):
+            convert_session(source_path, target_path, workers=state.workers)
+            source_path.unlink()
+        if args.file_name == state.info_session:
+            state.reload()
+        msg=f"Session {source_path} converted to {target_path}.\n"
+        logger.info(msg)
+        return
 
-    file_path = Path(info_session + ".yaml")
-    session : Session = load_session_from_yaml(file_path)
-    modified = False
+#endregion
 
     if args.command == "show-branches":
-        logger.info(show_branches(session))
+        logger.info(show_branches(state.catalog))
+        return
+
+    if args.command == "show-dates":
+        logger.info(show_dates(state.catalog, args.branch))
         return
 
-    elif args.command == "show-dates":
-        logger.info(show_dates(session, args.branch))
+    if args.command == "mem-report":
+        # measures the session as loaded from its file, without the pending changes
+        report = get_memory_report(
+            state.file_path,
+            branches=args.branch,
+            date_from=datetime_from_str(args.date_from, with_time=args.date_from.find(":") != -1)
+            if args.date_from is not None else None,
+            date_to=datetime_from_str(args.date_to, with_time=args.date_to.find(":") != -1)
+            if args.date_to is not None else None,
+            period=args.period,
+            trace=not args.no_trace,
+        )
+        logger.info(report.format_table())
+        if args.json is not None:
+            report.write_json(args.json)
         return
 
-    elif args.command == "checkout-date":
+    session : Session = state.session
+    info_branch = state.info_branch
+    info_date = state.info_date
+    modified = False
+
+    if args.command == "checkout-date":
         modified = False
         if args.date is None:
             args.date = dt.datetime.now(tz=dt.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
@@ -503,12 +992,7 @@ def main(logger: logging.Logger|None = None) -> None:
             Session.DEFAULT_WORKING_BRANCH, _date,
         )
         logger.info(msg)
-        save_session_info(
-            info_session,
-            new_info_branch,
-            new_info_date,
-            info_path,
-        )
+        state.set_info(new_info_branch, new_info_date)
 
     elif args.command == "push":
         if args.branch is None:
@@ -623,16 +1107,18 @@ def main(logger: logging.Logger|None = None) -> None:
         return
 
     elif args.command == "print-structure":
-        logger.info(session.print_structure(date=info_date, branch=args.branch))
+        logger.info(show_structure(session, info_date, args.branch, state.report_cache))
         return
 
 
     elif args.command == "print-summary":
         logger.info(
-            session.print_summary(
-                date=info_date,
-                branch=args.branch,
-                acc_path=AccountPath(args.account_path)
+            show_summary(
+                session,
+                info_date,
+                args.branch,
+                AccountPath(args.account_path),
+                state.report_cache,
             ),
         )
         return
@@ -800,17 +1286,283 @@ def main(logger: logging.Logger|None = None) -> None:
         modified, msg = change_fx_quote(session, info_branch, info_date, asset_pair[0], asset_pair[1], args.new_quote)
         logger.info(msg)
 
+    elif args.command == "import-values":
+        with Path(args.file_name).open("r", newline="") as csv_file:
+            modified, msg = import_values(session, csv.reader(csv_file))
+        logger.info(msg)
+
+    elif args.command == "import-fx":
+        with Path(args.file_name).open("r", newline="") as csv_file:
+            modified, msg = import_fx(session, csv.reader(csv_file), args.branch)
+        logger.info(msg)
+
     else:
         msg=f"Command {args.command} not recognized"
         logger.error(msg)
         return
 
     if modified:
-        save_session_to_yaml(session, file_path)
-        msg=f"Session modified and saved to {file_path}.\n"
-        logger.info(msg)
+        state.mark_modified()
     return
 
+READ_ONLY_COMMANDS = [
+    "show-branches", "show-dates", "diff", "print-structure", "print-summary", "mem-report",
+]
+SESSION_COMMANDS = ["create", "change-session", "convert-session"]
+
+def write_lock(state: CliState, command: str) -> contextlib.AbstractContextManager:
+    """Get the lock to hold while running `command` (none for read-only commands)."""
+    if state.info_session == CliState.UNSET_SESSION or \
+        command in READ_ONLY_COMMANDS or command in SESSION_COMMANDS:
+        return contextlib.nullcontext()
+    return state.locked()
+
+def _try_flush(state: CliState, logger: logging.Logger) -> bool:
+    """Write the pending changes, logging why if it fails (returns whether it worked)."""
+    try:
+        state.flush(logger)
+    except Exception as e:  # noqa: BLE001
+        logger.error(f"{type(e).__name__}: {e}\nChanges not saved.")
+        return False
+    return True
+
+def run_shell(
+        parser: argparse.ArgumentParser,
+        state: CliState,
+        logger: logging.Logger,
+        autosave: int = 0,
+    ) -> bool:
+    """Read and execute commands against one in-memory session until exit.
+
+    Besides the sortfin-cli commands, `save` writes pending changes, `reload`
+    discards them and `exit` (or end of input) saves and quits. If that save
+    fails, `exit` does not quit, and end of input quits with the changes lost
+    (False is returned, True otherwise). A command that
+    raises is rolled back: the session is restored as before it. With `autosave`
+    > 0, changes are also written after every `autosave` modifying commands.
+    The session file is only locked while it is saved: if another process saved
+    it in the meantime, the save fails and the changes stay in memory.
+    """
+    logger.info(
+        "sortfin shell: `help` lists commands, `save` writes changes, `exit` quits.",
+    )
+    while True:
+        try:
+            line = input(state.prompt() if sys.stdin.isatty() else "")
+        except EOFError:
+            break
+        except KeyboardInterrupt:
+            logger.info("")
+            continue
+        try:
+            tokens = shlex.split(line, comments=True)
+        except ValueError as e:
+            logger.error(str(e))
+            continue
+        if len(tokens) == 0:
+            continue
+        if tokens[0] in ["exit", "quit"]:
+            if _try_flush(state, logger):
+                return True
+            logger.error(
+                "Shell not exited: `save` retries, `reload` discards the changes.",
+            )
+            continue
+        if tokens[0] == "save":
+            if not _try_flush(state, logger):
+                logger.error("`save` retries, `reload` discards the changes.")
+            continue
+        if tokens[0] == "reload":
+            state.reload()
+            continue
+        if tokens[0] == "help":
+            parser.print_help()
+            continue
+        try:
+            args = parser.parse_args(tokens)
+        except SystemExit:
+            # argparse already printed the error
+            continue
+        if args.command in [None, "shell", "run"]:
+            logger.error("Please provide a command (`help` lists them).")
+            continue
+        # a failing command must not leave half of its changes in the session
+        snapshot = state.snapshot() if args.command not in READ_ONLY_COMMANDS and \
+            args.command not in SESSION_COMMANDS else None
+        try:
+            run_command(args, state, logger)
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"{type(e).__name__}: {e}")
+            if snapshot is not None:
+                state.restore(snapshot)
+                logger.error(f"Changes of `{args.command}` discarded.")
+            continue
+        if autosave > 0 and state.pending_changes >= autosave and \
+            not _try_flush(state, logger):
+            logger.error("`save` retries, `reload` discards the changes.")
+    if _try_flush(state, logger):
+        return True
+    logger.error("End of input: the changes not saved are lost.")
+    return False
+
+BATCH_EXCLUDED_COMMANDS = ["create", "change-session", "convert-session", "shell", "run"]
+
+class _ErrorRecorder(logging.Handler):
+    """Record the errors logged by the commands of a batch."""
+
+    def __init__(self) -> None:
+        super().__init__(level=logging.ERROR)
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+def parse_batch(
+        parser: argparse.ArgumentParser,
+        lines: list[str],
+        logger: logging.Logger,
+    ) -> list[tuple[int, argparse.Namespace]]|None:
+    """Parse all the commands of a batch script (None if any line is invalid)."""
+    commands : list[tuple[int, argparse.Namespace]] = []
+    for line_number, line in enumerate(lines, start=1):
+        try:
+            tokens = shlex.split(line, comments=True)
+        except ValueError as e:
+            logger.error(f"line {line_number}: {e}")
+            return None
+        if len(tokens) == 0:
+            continue
+        try:
+            args = parser.parse_args(tokens)
+        except SystemExit:
+            # argparse already printed the error
+            logger.error(f"line {line_number}: invalid command: {line.strip()}")
+            return None
+        if args.command is None or args.command in BATCH_EXCLUDED_COMMANDS:
+            logger.error(
+                f"line {line_number}: command not allowed in a batch: {line.strip()} "
+                f"(excluded: {', '.join(BATCH_EXCLUDED_COMMANDS)})"
+            )
+            return None
+        commands.append((line_number, args))
+    return commands
+
+def run_batch(
+        parser: argparse.ArgumentParser,
+        state: CliState,
+        logger: logging.Logger,
+        lines: list[str],
+    ) -> bool:
+    """Execute a script of commands against one in-memory session.
+
+    The whole script is parsed before anything runs. The session is loaded once
+    and saved once at the end; if a command fails (raises or logs an error), the
+    batch stops and nothing is written, neither the session nor .info.
+    """
+    commands = parse_batch(parser, lines, logger)
+    if commands is None:
+        logger.error("Batch aborted: nothing was executed.")
+        return False
+    recorder = _ErrorRecorder()
+    logger.addHandler(recorder)
+    try:
+        for line_number, args in commands:
+            try:
+                run_command(args, state, logger)
+            except Exception as e:  # noqa: BLE001
+                logger.error(f"{type(e).__name__}: {e}")
+            if len(recorder.records) > 0:
+                logger.error(
+                    f"Batch aborted at line {line_number}: no change was saved.",
+                )
+                return False
+    finally:
+        logger.removeHandler(recorder)
+    msg=f"Batch of {len(commands)} commands done."
+    logger.info(msg)
+    state.flush(logger)
+    return True
+
+def main(logger: logging.Logger|None = None) -> None:
+    """Handle command line arguments and execute."""
+    if logger is None:
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        logger = logging.getLogger(__name__)
+
+    parser = build_parser(get_command(sys.argv[1:]))
+    args = parser.parse_args()
+    profiler = None
+    if args.profile or args.profile_json is not None or args.profile_cprofile is not None:
+        profiler = Profiler(
+            trace_memory=not args.profile_no_memory,
+            cprofile_path=args.profile_cprofile,
+        )
+        profiler.start()
+    if args.counters or args.counters_json is not None:
+        COUNTERS.reset()
+        COUNTERS.enable()
+    try:
+        _run_instrumented(args, parser, logger)
+    finally:
+        if COUNTERS.enabled:
+            COUNTERS.disable()
+            if args.counters:
+                logger.info(COUNTERS.format_table())
+            if args.counters_json is not None:
+                COUNTERS.write_json(args.counters_json)
+        if profiler is not None:
+            profiler.stop()
+            if args.profile:
+                logger.info(profiler.format_table())
+            if args.profile_json is not None:
+                profiler.write_json(args.profile_json)
+
+def _run_instrumented(
+        args: argparse.Namespace,
+        parser: argparse.ArgumentParser,
+        logger: logging.Logger,
+    ) -> None:
+    state = CliState(
+        Path.cwd() / ".sortfin" / ".info",
+        workers=args.workers,
+        use_cache=not args.no_cache,
+        lock_timeout=args.lock_timeout,
+    )
+    try:
+        _run_main(args, parser, state, logger)
+    except (LockTimeoutError, SessionConflictError, SessionFileError) as e:
+        logger.error(f"{e}\nNo change was saved.")
+        sys.exit(1)
+
+def _run_main(
+        args: argparse.Namespace,
+        parser: argparse.ArgumentParser,
+        state: CliState,
+        logger: logging.Logger,
+    ) -> None:
+    if args.command in ["shell", "run"]:
+        # the commands of a shell/script can be any of them
+        parser = build_parser()
+    if args.command == "shell":
+        if not run_shell(parser, state, logger, autosave=args.autosave):
+            sys.exit(1)
+        return
+    if args.command == "run":
+        if args.script == "-":
+            lines = sys.stdin.readlines()
+        else:
+            with Path(args.script).open("r") as script_file:
+                lines = script_file.readlines()
+        with write_lock(state, args.command):
+            if not run_batch(parser, state, logger, lines):
+                sys.exit(1)
+        return
+    # the lock is taken before loading the session: concurrent writers wait
+    # for each other instead of overwriting each other's changes
+    with write_lock(state, args.command):
+        run_command(args, state, logger)
+        state.flush(logger)
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)
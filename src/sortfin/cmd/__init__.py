@@ -5,18 +5,61 @@ from .action import (  # noqa: D104
     checkout_date,
     delete_date,
 )
-from .main import load_session_from_yaml, save_session_to_yaml
-from .show import show_branches, show_dates, show_diff
+from .cache import load_session_with_cache, store_session_cache
+from .imports import import_fx, import_values
+from .main import (
+    SESSION_FORMATS,
+    SessionConflictError,
+    SessionFileError,
+    check_session_revision,
+    convert_session,
+    get_session_file_path,
+    get_session_format,
+    load_session,
+    load_session_from_json,
+    load_session_from_yaml,
+    load_session_header,
+    load_session_list,
+    save_session,
+    save_session_to_json,
+    save_session_to_yaml,
+)
+from .memory import MemoryReport, get_memory_report, get_session_memory
+from .report_cache import ReportCache
+from .show import show_branches, show_dates, show_diff, show_structure, show_summary
 
 __all__ = [
+    "SESSION_FORMATS",
+    "MemoryReport",
+    "ReportCache",
+    "SessionConflictError",
+    "SessionFileError",
     "add_asset",
     "change_account_value",
     "change_fx_quote",
+    "check_session_revision",
     "checkout_date",
+    "convert_session",
     "delete_date",
+    "get_memory_report",
+    "get_session_file_path",
+    "get_session_format",
+    "get_session_memory",
+    "import_fx",
+    "import_values",
+    "load_session",
+    "load_session_from_json",
     "load_session_from_yaml",
+    "load_session_header",
+    "load_session_list",
+    "load_session_with_cache",
+    "save_session",
+    "save_session_to_json",
     "save_session_to_yaml",
     "show_branches",
     "show_dates",
     "show_diff",
+    "show_structure",
+    "show_summary",
+    "store_session_cache",
 ]
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import pickle
+import time
+from typing import TYPE_CHECKING
+
+from ..file_io import atomic_open  # noqa: TID252
+from ..profiling import phase  # noqa: TID252
+from ..session import Session  # noqa: TID252
+from .main import get_session_format, load_session
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CACHE_FILE_NAME = ".session_cache"
+CACHE_VERSION = 6
+# coarsest modification time granularity of common file systems: a file
+# modified less than this before its fingerprint may change again without
+# changing its modification time
+MTIME_GRANULARITY_NS = 2_000_000_000
+_CACHE_ERRORS = (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError)
+
+
+def _is_recent(mtime_ns: int, time_ns: int) -> bool:
+    return time_ns < mtime_ns + MTIME_GRANULARITY_NS
+
+
+def get_file_fingerprint(file_path: Path) -> dict:
+    """Get the size, modification time and, if just modified, content hash of a file.
+
+    The content hash (None otherwise) is only needed while the modification
+    time can still hide a change (see MTIME_GRANULARITY_NS).
+    """
+    time_ns = time.time_ns()
+    stat = file_path.stat()
+    return {
+        "path": str(file_path.resolve()),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": hashlib.sha256(file_path.read_bytes()).hexdigest()
+        if _is_recent(stat.st_mtime_ns, time_ns) else None,
+    }
+
+
+def _read_cache_header(cache_path: Path) -> dict|None:
+    try:
+        with cache_path.open("rb") as file:
+            return pickle.load(file)  # noqa: S301
+    except _CACHE_ERRORS:
+        return None
+
+
+def _is_valid(header: dict|None, file_path: Path) -> bool:
+    if not isinstance(header, dict) or header.get("version") != CACHE_VERSION:
+        return False
+    stat = file_path.stat()
+    if header["path"] != str(file_path.resolve()) or header["size"] != stat.st_size \
+        or header["mtime_ns"] != stat.st_mtime_ns:
+        return False
+    # the content is only hashed if the file had just been modified when cached
+    return header["sha256"] is None or \
+        header["sha256"] == hashlib.sha256(file_path.read_bytes()).hexdigest()
+
+
+def load_cached_session(file_path: Path, cache_dir: Path) -> Session|None:
+    """Get the cached session of `file_path`, if the cache is still valid."""
+    with phase("load.cache"):
+        return _load_cached_session(file_path, cache_dir / CACHE_FILE_NAME)
+
+
+def _load_cached_session(file_path: Path, cache_path: Path) -> Session|None:
+    header = _read_cache_header(cache_path)
+    if not _is_valid(header, file_path):
+        return None
+    try:
+        with cache_path.open("rb") as file:
+            _ = pickle.load(file)  # noqa: S301
+            session = pickle.load(file)  # noqa: S301
+    except _CACHE_ERRORS:
+        return None
+    if not isinstance(session, Session):
+        return None
+    if header["sha256"] is not None and \
+        not _is_recent(header["mtime_ns"], time.time_ns()):
+        # the modification time can be trusted now: later hits skip the hash
+        store_session_cache(session, file_path, cache_path.parent)
+    return session
+
+
+def store_session_cache(session: Session, file_path: Path, cache_dir: Path) -> None:
+    """Cache the parsed session of `file_path` (which must be up to date)."""
+    if get_session_format(file_path) == "sfdb":
+        # indexed sessions are already loaded lazily
+        return
+    header = {"version": CACHE_VERSION, **get_file_fingerprint(file_path)}
+    with phase("save.cache"), atomic_open(cache_dir / CACHE_FILE_NAME, "wb") as file:
+        pickle.dump(header, file, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(session, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_session_with_cache(
+        file_path: Path,
+        cache_dir: Path,
+        *,
+        workers: int|None = None,
+    ) -> Session:
+    """Load a session from the cache in `cache_dir`, rebuilding it when stale.
+
+    The cache is keyed by the file path, size and modification time (and
+    content hash for files cached right after being modified), so any change
+    to the session file invalidates it.
+    """
+    if get_session_format(file_path) == "sfdb":
+        return load_session(file_path)
+    session = load_cached_session(file_path, cache_dir)
+    if session is not None:
+        return session
+    session = load_session(file_path, workers=workers)
+    store_session_cache(session, file_path, cache_dir)
+    return session
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import bisect
+import datetime as dt
+import time
+from typing import TYPE_CHECKING
+
+from ..account_path import AccountPath  # noqa: TID252
+from ..session import Session  # noqa: TID252
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from ..account import Account  # noqa: TID252
+
+type StatementKey = tuple[dt.datetime, str]
+
+
+def parse_import_date(date_str: str) -> dt.datetime:
+    """Parse a date of an import file (a date alone stands for the end of that day)."""
+    date = dt.datetime.fromisoformat(date_str.strip())
+    if "T" not in date_str and " " not in date_str.strip():
+        date = date.replace(hour=23, minute=59, second=59, microsecond=999999)
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=dt.timezone.utc)
+    return date
+
+
+def _is_header_row(row: list[str]) -> bool:
+    return len(row) > 0 and row[0].strip().lower() == "date"
+
+
+def import_values(
+        session: Session,
+        rows: Iterable[list[str]],
+    ) -> tuple[bool, str]:
+    """Set account values from (date, branch, account_path, value[, unit]) rows.
+
+    Rows are grouped by statement and every statement is resolved once, then
+    account paths go through a path index of the statement. All the rows are
+    checked before any value is changed: on error, the session is left as is.
+    """
+    start = time.perf_counter()
+    statement_keys : dict[tuple[str, str], StatementKey] = {}
+    changes : dict[StatementKey, list[tuple[int, str, float, str|None]]] = {}
+    n_rows = 0
+    for line_number, row in enumerate(rows, start=1):
+        if len(row) == 0 or (line_number == 1 and _is_header_row(row)):
+            continue
+        if len(row) not in (4, 5):  # noqa: PLR2004
+            msg = (
+                f"line {line_number}: expected date,branch,account_path,value[,unit],"
+                f" got {','.join(row)}"
+            )
+            raise ValueError(msg)
+        date_str, branch = row[0].strip(), row[1].strip()
+        key = statement_keys.get((date_str, branch))
+        if key is None:
+            key = (
+                session.get_date(
+                    parse_import_date(date_str), branch=branch, is_exact_date=True,
+                ),
+                branch,
+            )
+            statement_keys[(date_str, branch)] = key
+        try:
+            value = float(row[3])
+        except ValueError:
+            msg = f"line {line_number}: invalid value: {row[3]}"
+            raise ValueError(msg) from None
+        unit = row[4].strip() if len(row) == 5 and row[4].strip() != "" else None  # noqa: PLR2004
+        if unit is not None and session.asset_db.get_asset_from_name(unit) is None:
+            msg = f"line {line_number}: asset not found: {unit}"
+            raise ValueError(msg)
+        changes.setdefault(key, []).append((line_number, row[2].strip(), value, unit))
+        n_rows += 1
+
+    updates : list[tuple[Account, float, str|None]] = []
+    for key, statement_changes in changes.items():
+        path_index = session.data[key].get_path_index()
+        for line_number, account_path, value, unit in statement_changes:
+            path = AccountPath(account_path).normalized
+            if path not in path_index:
+                msg = f"line {line_number}: account not found: {account_path}"
+                raise ValueError(msg)
+            account = path_index[path]
+            if account is None:
+                msg = f"line {line_number}: multiple accounts match {account_path}"
+                raise ValueError(msg)
+            if not account.is_terminal:
+                msg = f"line {line_number}: account {account_path} is not a terminal account"
+                raise ValueError(msg)
+            updates.append((account, value, unit))
+
+    modified = False
+    for account, value, unit in updates:
+        if account.value != value or (unit is not None and account.unit != unit):
+            modified = True
+        account.value = value
+        if unit is not None:
+            account.unit = unit
+    elapsed = time.perf_counter() - start
+    return modified, (
+        f"Imported {n_rows} values into {len(changes)} statements"
+        f" in {elapsed:.3f}s ({n_rows / elapsed if elapsed > 0 else 0:.0f} rows/s).\n"
+    )
+
+
+def import_fx(
+        session: Session,
+        rows: Iterable[list[str]],
+        branch: str = Session.DEFAULT_BRANCH,
+    ) -> tuple[bool, str]:
+    """Set FX quotes from (date, asset1/asset2, rate) rows.
+
+    Each row goes to the statement of `branch` at or before its date (found by
+    bisection in the sorted dates); when several rows of a pair go to the same
+    statement, the latest one wins. Quotes are then modified in one batch per
+    FX market. All the rows are checked first: on error, nothing is modified.
+    """
+    start = time.perf_counter()
+    dates = session.dates(branch)
+    # statement date -> pair -> (row date, rate)
+    changes : dict[dt.datetime, dict[tuple[str, str], tuple[dt.datetime, float]]] = {}
+    n_rows = 0
+    for line_number, row in enumerate(rows, start=1):
+        if len(row) == 0 or (line_number == 1 and _is_header_row(row)):
+            continue
+        if len(row) != 3:  # noqa: PLR2004
+            msg = f"line {line_number}: expected date,asset1/asset2,rate, got {','.join(row)}"
+            raise ValueError(msg)
+        date = parse_import_date(row[0])
+        pair = tuple(asset.strip() for asset in row[1].split("/"))
+        if len(pair) != 2 or pair[0] == pair[1]:  # noqa: PLR2004
+            msg = f"line {line_number}: invalid asset pair (format: asset1/asset2): {row[1]}"
+            raise ValueError(msg)
+        try:
+            rate = float(row[2])
+        except ValueError:
+            msg = f"line {line_number}: invalid rate: {row[2]}"
+            raise ValueError(msg) from None
+        if rate <= 0:
+            msg = f"line {line_number}: rate must be positive, not {rate}"
+            raise ValueError(msg)
+        i = bisect.bisect_right(dates, date) - 1
+        if i < 0:
+            msg = f"line {line_number}: no statement of branch {branch} on or before {date}"
+            raise ValueError(msg)
+        statement_quotes = changes.setdefault(dates[i], {})
+        if pair not in statement_quotes or statement_quotes[pair][0] <= date:
+            statement_quotes[pair] = (date, rate)
+        n_rows += 1
+
+    fx_markets = {date: session.data[(date, branch)].fx_market for date in changes}
+    for date, statement_quotes in changes.items():
+        quotes = fx_markets[date].quotes
+        for asset1, asset2 in statement_quotes:
+            if (asset1, asset2) not in quotes and (asset2, asset1) not in quotes:
+                msg = f"quote for {asset1}/{asset2} does not exist at date {date}"
+                raise ValueError(msg)
+
+    modified = False
+    for date, statement_quotes in changes.items():
+        modified |= fx_markets[date].modify_quotes(
+            {pair: rate for pair, (_, rate) in statement_quotes.items()},
+        )[0]
+    elapsed = time.perf_counter() - start
+    return modified, (
+        f"Imported {n_rows} quotes into {len(changes)} statements of branch {branch}"
+        f" in {elapsed:.3f}s ({n_rows / elapsed if elapsed > 0 else 0:.0f} rows/s).\n"
+    )
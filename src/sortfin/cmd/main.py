@@ -1,19 +1,261 @@
+import json
 from pathlib import Path
 
-import yaml
-
+from ..file_io import BackgroundTask, open_text  # noqa: TID252
+from ..profiling import phase  # noqa: TID252
 from ..session import Session  # noqa: TID252
+from ..session_header import (  # noqa: TID252
+    SessionHeader,
+    get_json_session,
+    get_session_header,
+    read_json_header,
+    read_yaml_header,
+    write_json_header,
+    write_yaml_header,
+)
+from ..session_index import (  # noqa: TID252
+    load_indexed_session,
+    load_session_index,
+    write_indexed_session,
+)
 from ..to_yaml import from_list_to_session, from_session_to_list  # noqa: TID252
 
+SESSION_FORMATS = {
+    "yaml": ".yaml",
+    "yaml.gz": ".yaml.gz",
+    "yaml.xz": ".yaml.xz",
+    "json": ".json",
+    "sfdb": ".sfdb",
+}
+DEFAULT_SESSION_FORMAT = "yaml"
+
+
+class SessionConflictError(ValueError):
+    """Raised when a session file was saved by someone else since it was loaded."""
+
+
+class SessionFileError(ValueError):
+    """Raised when the file of a session cannot be told (files in several formats)."""
+
+
+
+def _read_yaml_session_list(file_path: Path) -> tuple[SessionHeader|None, list]:
+    # slow to import, not needed by other formats
+    import yaml  # noqa: PLC0415
+
+    with phase("load.parse"), open_text(file_path) as file:
+        header = read_yaml_header(file)
+        return header, yaml.safe_load(file)
+
+def load_session_from_yaml(file_path: Path, *, workers: int|None = None) -> Session:
+    """Load a session from a YAML file (gzip/xz compressed if .gz/.xz)."""
+    header, session_list = _read_yaml_session_list(file_path)
+    with phase("load.build"):
+        session = from_list_to_session(session_list, workers=workers)
+    if header is not None:
+        session.revision = header.revision
+    return session
+
+def _write_session_list_to_yaml(
+        session_list: list,
+        file_path: Path,
+        revision: int = 0,
+    ) -> None:
+    import yaml  # noqa: PLC0415
+
+    with open_text(file_path, "w") as file:
+        write_yaml_header(get_session_header(session_list, revision), file)
+        yaml.safe_dump(session_list, file)
+
+def save_session_to_yaml(
+        session: Session,
+        file_path: Path,
+        *,
+        workers: int|None = None,
+    ) -> None:
+    """Save a session to a YAML file (gzip/xz compressed if .gz/.xz).
+
+    The revision is incremented as by `save_session`.
+    """
+    session_dict = from_session_to_list(session, workers=workers)
+    revision = session.revision + 1
+    _write_session_list_to_yaml(session_dict, file_path, revision)
+    session.revision = revision
+
+def _read_json_session_list(file_path: Path) -> tuple[SessionHeader|None, list]:
+    with phase("load.parse"), open_text(file_path) as file:
+        return get_json_session(json.load(file))
+
+def load_session_from_json(file_path: Path, *, workers: int|None = None) -> Session:
+    """Load a session from a JSON file (same list encoding as the YAML files)."""
+    header, session_list = _read_json_session_list(file_path)
+    with phase("load.build"):
+        session = from_list_to_session(session_list, workers=workers)
+    if header is not None:
+        session.revision = header.revision
+    return session
+
+def _write_session_list_to_json(
+        session_list: list,
+        file_path: Path,
+        revision: int = 0,
+    ) -> None:
+    with open_text(file_path, "w") as file:
+        write_json_header(get_session_header(session_list, revision), file)
+        json.dump(session_list, file, separators=(",", ":"))
+        file.write("}")
+
+def save_session_to_json(
+        session: Session,
+        file_path: Path,
+        *,
+        workers: int|None = None,
+    ) -> None:
+    """Save a session to a JSON file (same list encoding as the YAML files).
+
+    The revision is incremented as by `save_session`.
+    """
+    revision = session.revision + 1
+    _write_session_list_to_json(
+        from_session_to_list(session, workers=workers),
+        file_path,
+        revision,
+    )
+    session.revision = revision
+
+def get_session_format(file_path: Path) -> str:
+    """Get the session format of a file from its extension."""
+    for session_format, suffix in SESSION_FORMATS.items():
+        if file_path.name.endswith(suffix):
+            return session_format
+    msg = (
+        f"unknown session file extension: {file_path.name}"
+        f" (available: {', '.join(SESSION_FORMATS.values())})"
+    )
+    raise ValueError(msg)
+
+def get_session_file_path(name: str, session_format: str|None = None) -> Path:
+    """Get the file of session `name` (an existing file of any format if not set)."""
+    if session_format is not None:
+        return Path(name + SESSION_FORMATS[session_format])
+    file_paths = [
+        Path(name + suffix)
+        for suffix in SESSION_FORMATS.values()
+        if Path(name + suffix).exists()
+    ]
+    if len(file_paths) > 1:
+        msg = (
+            f"several files found for session {name}: "
+            f"{', '.join(map(str, file_paths))} (keep only one of them)"
+        )
+        raise SessionFileError(msg)
+    if len(file_paths) == 1:
+        return file_paths[0]
+    return Path(name + SESSION_FORMATS[DEFAULT_SESSION_FORMAT])
+
+def load_session_header(file_path: Path) -> SessionHeader|None:
+    """Read the header of a session file, without decoding its statements.
+
+    Files written before headers were introduced have none (None is returned).
+    """
+    session_format = get_session_format(file_path)
+    if session_format == "sfdb":
+        return load_session_index(file_path).header
+    with open_text(file_path) as file:
+        if session_format == "json":
+            return read_json_header(file)
+        return read_yaml_header(file)
+
+def load_session_list(file_path: Path) -> tuple[SessionHeader|None, list]:
+    """Decode a YAML/JSON session file to its list encoding, without building the session.
+
+    Indexed (sfdb) files have no such encoding: a ValueError is raised.
+    """
+    session_format = get_session_format(file_path)
+    if session_format == "sfdb":
+        msg = f"no list encoding for indexed session files: {file_path}"
+        raise ValueError(msg)
+    if session_format == "json":
+        return _read_json_session_list(file_path)
+    return _read_yaml_session_list(file_path)
+
+def load_session(file_path: Path, *, workers: int|None = None) -> Session:
+    """Load a session from a file, using the format given by its extension."""
+    session_format = get_session_format(file_path)
+    if session_format == "sfdb":
+        with phase("load.index"):
+            return load_indexed_session(file_path)
+    if session_format == "json":
+        return load_session_from_json(file_path, workers=workers)
+    return load_session_from_yaml(file_path, workers=workers)
+
+def _write_session_list(session_list: list, file_path: Path, revision: int = 0) -> None:
+    session_format = get_session_format(file_path)
+    if session_format == "sfdb":
+        write_indexed_session(session_list, file_path, revision)
+        return
+    if session_format == "json":
+        _write_session_list_to_json(session_list, file_path, revision)
+        return
+    _write_session_list_to_yaml(session_list, file_path, revision)
+
+def _write_session_revision(session: Session, session_list: list, file_path: Path) -> None:
+    # the revision of the session only moves on once the file holds it
+    revision = session.revision + 1
+    _write_session_list(session_list, file_path, revision)
+    session.revision = revision
+
+def check_session_revision(session: Session, file_path: Path) -> None:
+    """Check that `file_path` was not saved since `session` was loaded from it."""
+    if not file_path.exists():
+        return
+    header = load_session_header(file_path)
+    file_revision = header.revision if header is not None else 0
+    if file_revision != session.revision:
+        msg = (
+            f"session file {file_path} was modified since it was loaded "
+            f"(revision {file_revision} on disk, {session.revision} loaded)"
+        )
+        raise SessionConflictError(msg)
+
+def save_session(
+        session: Session,
+        file_path: Path,
+        *,
+        workers: int|None = None,
+        background: bool = False,
+        check_revision: bool = False,
+    ) -> BackgroundTask|None:
+    """Save a session to a file, using the format given by its extension.
 
-def load_session_from_yaml(file_path: Path) -> Session:
-    """Load a session from a YAML file."""
-    with Path.open(file_path) as file:
-        session_dict = yaml.safe_load(file)
-    return from_list_to_session(session_dict)
+    The file is replaced atomically and its revision is incremented (the one
+    of the session too, once the file is written). With
+    `check_revision`, a SessionConflictError is raised instead if the file was
+    saved by someone else since the session was loaded. With `background`, the
+    session is encoded right away but written on a background thread: the
+    returned task must be waited for (it is anyway before the process exits).
+    """
+    if check_revision:
+        check_session_revision(session, file_path)
+    with phase("save.encode"):
+        session_list = from_session_to_list(session, workers=workers)
+    if background:
+        return BackgroundTask(
+            _write_session_revision, session, session_list, file_path,
+            name="sortfin-save",
+        )
+    with phase("save.write"):
+        _write_session_revision(session, session_list, file_path)
+    return None
 
-def save_session_to_yaml(session: Session, file_path: Path) -> None:
-    """Save a session to a YAML file."""
-    session_dict = from_session_to_list(session)
-    with Path.open(file_path, "w") as file:
-        yaml.safe_dump(session_dict, file)
+def convert_session(
+        source_path: Path,
+        target_path: Path,
+        *,
+        workers: int|None = None,
+    ) -> None:
+    """Convert a session file to the format given by the extension of target_path."""
+    if target_path.exists():
+        msg = f"file already exists: {target_path}"
+        raise ValueError(msg)
+    save_session(load_session(source_path, workers=workers), target_path, workers=workers)
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import datetime as dt
+import gc
+import json
+import sys
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from ..session_index import load_indexed_session  # noqa: TID252
+from ..to_yaml import from_list_to_session  # noqa: TID252
+from .main import get_session_format, load_session_list
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from ..account import Account  # noqa: TID252
+    from ..fx_market import FxMarket  # noqa: TID252
+    from ..session import Session  # noqa: TID252
+    from ..statement import Statement  # noqa: TID252
+
+MEMORY_REPORT_VERSION = 1
+COMPONENTS = ("accounts", "fx_markets", "datetimes", "strings", "numbers", "statements")
+PERIODS = ("all", "year", "month")
+TOP_ALLOCATIONS = 10
+
+
+def _get_period(date: dt.datetime, period: str) -> str:
+    if period == "year":
+        return f"{date.year:04d}"
+    if period == "month":
+        return f"{date.year:04d}-{date.month:02d}"
+    return "all"
+
+
+class _ObjectCounter:
+    """Count the objects (and their sizes) of statements by component.
+
+    Counts go to `totals`, which can be switched between statements. Objects
+    shared by several statements (e.g. strings) are only counted the first
+    time they are found. Instances are sized with sys.getsizeof, without their
+    attribute dict (reading it would allocate one on recent Pythons).
+    """
+
+    def __init__(self) -> None:
+        self.totals : dict[str, list[int]] = {}
+        self._seen : set[int] = set()
+        # the objects stay alive while counted: their ids cannot be reused
+        self._objects : list[object] = []
+
+    def add(self, component: str, obj: object) -> None:
+        if id(obj) in self._seen:
+            return
+        self._seen.add(id(obj))
+        self._objects.append(obj)
+        totals = self.totals.setdefault(component, [0, 0])
+        totals[0] += 1
+        totals[1] += sys.getsizeof(obj)
+
+    def _add_value(self, obj: object) -> None:
+        if isinstance(obj, str):
+            self.add("strings", obj)
+        elif isinstance(obj, dt.datetime):
+            self.add("datetimes", obj)
+        elif isinstance(obj, (int, float)):
+            self.add("numbers", obj)
+
+    def add_account(self, account: Account) -> None:
+        stack = [account]
+        while len(stack) > 0:
+            account = stack.pop()
+            self.add("accounts", account)
+            self._add_value(account.name)
+            self._add_value(account.unit)
+            if account.sub_accounts is None:
+                self._add_value(account.value)
+            else:
+                self.add("accounts", account.sub_accounts)
+                stack.extend(account.sub_accounts)
+
+    def add_fx_market(self, fx_market: FxMarket) -> None:
+        self.add("fx_markets", fx_market)
+        for quotes in [fx_market.quotes, fx_market.secondary_quotes]:
+            self.add("fx_markets", quotes)
+            for key, rate in quotes.items():
+                self.add("fx_markets", key)
+                self._add_value(key[0])
+                self._add_value(key[1])
+                self._add_value(rate)
+        rate_tables = fx_market._rate_tables  # noqa: SLF001
+        self.add("fx_markets", rate_tables)
+        for table in rate_tables.values():
+            self.add("fx_markets", table)
+            self.add("fx_markets", table[1])
+
+    def add_statement(self, key: tuple[dt.datetime, str], statement: Statement) -> None:
+        self.add("statements", key)
+        self.add("statements", statement)
+        self._add_value(key[0])
+        self._add_value(key[1])
+        self._add_value(statement.date)
+        self.add_fx_market(statement.fx_market)
+        self.add_account(statement.account)
+
+
+class MemoryReport:
+    """Memory used by a session, by component, branch and period of dates.
+
+    `groups` maps (branch, period) to the (objects, bytes) of each component:
+    account nodes, FX markets, datetimes, strings, numbers and the statement
+    objects themselves (with their keys). Sizes are shallow sizes of the
+    objects found by walking the statements, so they add up without double
+    counting but miss allocator overheads.
+    When measured from a file, `traced` holds the tracemalloc measures of the
+    whole file (in bytes): the raw list decoded from YAML/JSON, the session
+    built from it (retained once the raw list is freed) and the peak of the
+    load, and `top_allocations` the source lines holding the most memory of
+    the session.
+    """
+
+    def __init__(self) -> None:
+        self.groups : dict[tuple[str, str], dict[str, list[int]]] = {}
+        self.n_statements : dict[tuple[str, str], int] = {}
+        self.traced : dict[str, int|None]|None = None
+        self.top_allocations : list[tuple[str, int, int]] = []
+
+    def to_dict(self) -> dict:
+        return {
+            "version": MEMORY_REPORT_VERSION,
+            "traced": self.traced,
+            "top_allocations": [
+                {"line": line, "size": size, "count": count}
+                for line, size, count in self.top_allocations
+            ],
+            "groups": [
+                {
+                    "branch": branch,
+                    "period": period,
+                    "statements": self.n_statements[(branch, period)],
+                    "components": {
+                        component: {"objects": objects, "size": size}
+                        for component, (objects, size) in components.items()
+                    },
+                }
+                for (branch, period), components in self.groups.items()
+            ],
+        }
+
+    def write_json(self, file_path: Path) -> None:
+        file_path.write_text(json.dumps(self.to_dict(), indent=2))
+
+    def format_table(self) -> str:
+        lines = [
+            f"{'branch':<16} {'period':<8} {'component':<11} {'objects':>10} {'size (KiB)':>11}",
+        ]
+        for (branch, period), components in self.groups.items():
+            for component in COMPONENTS:
+                if component not in components:
+                    continue
+                objects, size = components[component]
+                lines.append(
+                    f"{branch:<16} {period:<8} {component:<11} {objects:>10} {size / 1024:>11.1f}",
+                )
+            n_objects = sum(objects for objects, _ in components.values())
+            size = sum(size for _, size in components.values())
+            lines.append(
+                f"{branch:<16} {period:<8} {'total':<11} {n_objects:>10} {size / 1024:>11.1f}"
+                f"  ({self.n_statements[(branch, period)]} statements)",
+            )
+        if self.traced is not None:
+            lines.append("traced memory of the whole file (tracemalloc):")
+            for name, size in self.traced.items():
+                if size is not None:
+                    lines.append(f"  {name:<16} {size / 2**20:>9.2f} MiB")
+        if len(self.top_allocations) > 0:
+            lines.append("largest allocations of the session:")
+            lines += [
+                f"  {size / 1024:>9.1f} KiB {count:>8} objects  {line}"
+                for line, size, count in self.top_allocations
+            ]
+        return "\n".join(lines)
+
+
+def get_session_memory(
+        session: Session,
+        *,
+        branches: list[str]|None = None,
+        date_from: dt.datetime|None = None,
+        date_to: dt.datetime|None = None,
+        period: str = "all",
+    ) -> MemoryReport:
+    """Count the objects of the statements of a session, by branch and period.
+
+    Only the statements of `branches` (all by default) dated from `date_from`
+    to `date_to` (included) are counted. `period` is one of PERIODS.
+    """
+    if period not in PERIODS:
+        msg = f"unknown period {period} (available: {', '.join(PERIODS)})"
+        raise ValueError(msg)
+    report = MemoryReport()
+    # objects shared by several groups are counted in the first one
+    counter = _ObjectCounter()
+    for date, branch in session.keys():
+        if (branches is not None and branch not in branches) or \
+            (date_from is not None and date < date_from) or \
+            (date_to is not None and date > date_to):
+            continue
+        group = (branch, _get_period(date, period))
+        counter.totals = report.groups.setdefault(group, {})
+        counter.add_statement((date, branch), session.data[(date, branch)])
+        report.n_statements[group] = report.n_statements.get(group, 0) + 1
+    report.groups = dict(sorted(report.groups.items()))
+    return report
+
+
+def get_memory_report(
+        file_path: Path,
+        *,
+        branches: list[str]|None = None,
+        date_from: dt.datetime|None = None,
+        date_to: dt.datetime|None = None,
+        period: str = "all",
+        trace: bool = True,
+    ) -> MemoryReport:
+    """Load a session file and report its memory (see MemoryReport).
+
+    With `trace`, the load is measured with tracemalloc, which makes it
+    several times slower. Indexed (sfdb) files have no raw list: all their
+    statements are decoded instead.
+    """
+    # tracemalloc may already be tracing, e.g. for sortfin-cli --profile
+    start_tracing = trace and not tracemalloc.is_tracing()
+    if start_tracing:
+        tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        raw_size = None
+        if get_session_format(file_path) == "sfdb":
+            session = load_indexed_session(file_path)
+            for key in session.keys():
+                _ = session.data[key]
+        else:
+            header, session_list = load_session_list(file_path)
+            raw_size = tracemalloc.get_traced_memory()[0] - base
+            session = from_list_to_session(session_list)
+            if header is not None:
+                session.revision = header.revision
+            del session_list
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot() if trace else None
+        current, peak = tracemalloc.get_traced_memory()
+        if not start_tracing:
+            # the peak of the tracing started before may not be the one of the load
+            peak = None
+    finally:
+        if start_tracing:
+            tracemalloc.stop()
+    report = get_session_memory(
+        session, branches=branches, date_from=date_from, date_to=date_to, period=period,
+    )
+    if snapshot is not None:
+        report.traced = {
+            "raw_list": raw_size,
+            "session": current - base,
+            "peak": peak - base if peak is not None else None,
+        }
+        report.top_allocations = [
+            (str(stat.traceback), stat.size, stat.count)
+            for stat in snapshot.filter_traces([
+                tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__),
+            ]).statistics("lineno")[:TOP_ALLOCATIONS]
+        ]
+    return report
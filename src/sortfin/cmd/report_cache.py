@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING
+
+from ..file_io import atomic_open  # noqa: TID252
+from ..profiling import phase  # noqa: TID252
+from ..to_yaml import _from_assetdb_to_list, from_statement_to_list  # noqa: TID252
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from ..asset_database import AssetDatabase  # noqa: TID252
+    from ..statement import Statement  # noqa: TID252
+
+REPORT_CACHE_DIR_NAME = "reports"
+REPORT_CACHE_VERSION = 1
+REPORT_SUFFIX = ".txt"
+DEFAULT_REPORT_CACHE_SIZE = 8 * 1024 * 1024
+
+
+def get_statement_hash(statement: Statement, asset_db: AssetDatabase) -> str:
+    """Hash the content of a statement (date, FX quotes and accounts)."""
+    return hashlib.sha256(
+        json.dumps(from_statement_to_list(statement, asset_db), default=str).encode(),
+    ).hexdigest()
+
+
+def get_asset_db_hash(asset_db: AssetDatabase) -> str:
+    """Hash the assets (and their formats) of an asset database."""
+    return hashlib.sha256(
+        json.dumps(sorted(_from_assetdb_to_list(asset_db))).encode(),
+    ).hexdigest()
+
+
+class ReportCache:
+    """Rendered reports of statements, one file per report in `cache_dir`.
+
+    Reports are keyed by the content hash of the statement and of the asset
+    database, plus the command and its options (account path, unit...), so a
+    report is served again as long as the statement it shows is unchanged,
+    whatever happens to the other statements of the session. Hits refresh the
+    modification time of the report file, and the least recently used reports
+    are deleted when the files exceed `max_size` bytes.
+    """
+
+    def __init__(self, cache_dir: Path, max_size: int = DEFAULT_REPORT_CACHE_SIZE) -> None:
+        self.cache_dir: Path = cache_dir
+        self.max_size: int = max_size
+
+    def _get_path(self, key: tuple) -> Path:
+        digest = hashlib.sha256(
+            json.dumps([REPORT_CACHE_VERSION, *key], default=str).encode(),
+        ).hexdigest()
+        return self.cache_dir / (digest + REPORT_SUFFIX)
+
+    def get(self, key: tuple) -> str|None:
+        """Get a cached report (None if missing)."""
+        path = self._get_path(key)
+        try:
+            report = path.read_bytes().decode("utf-8")
+            os.utime(path)
+        except (OSError, UnicodeDecodeError):
+            return None
+        return report
+
+    def put(self, key: tuple, report: str) -> None:
+        """Cache a report, then evict the least recently used ones if needed."""
+        if not self.cache_dir.exists():
+            self.cache_dir.mkdir(parents=True)
+        with atomic_open(self._get_path(key), "wb") as file:
+            file.write(report.encode("utf-8"))
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete the least recently used reports until they fit in max_size."""
+        entries = []
+        for path in self.cache_dir.glob("*" + REPORT_SUFFIX):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= size
+
+    def get_or_render(
+            self,
+            command: str,
+            statement: Statement,
+            asset_db: AssetDatabase,
+            options: tuple,
+            render: Callable[[], str],
+        ) -> str:
+        """Get the report of `command` on a statement, rendering it on a miss."""
+        with phase("report_cache"):
+            key = (
+                command,
+                get_statement_hash(statement, asset_db),
+                get_asset_db_hash(asset_db),
+                *options,
+            )
+            report = self.get(key)
+            if report is None:
+                report = render()
+                self.put(key, report)
+            return report
@@ -1,14 +1,18 @@
 import datetime as dt
 
+from ..account_path import AccountPath  # noqa: TID252
 from ..colors import Color  # noqa: TID252
+from ..profiling import phase  # noqa: TID252
 from ..session import Session  # noqa: TID252
+from ..session_header import SessionHeader  # noqa: TID252
+from .report_cache import ReportCache
 
 
-def show_branches(session: Session) -> str:
+def show_branches(session: Session|SessionHeader) -> str:
     """Display all branches in the session."""
     return "Branches:\n" + "\n".join(session.branches())
 
-def show_dates(session: Session, branch: str) -> str:
+def show_dates(session: Session|SessionHeader, branch: str) -> str:
     """Display all dates in the specified branch of the session."""
     datetime_list=list(map(dt.datetime.isoformat,session.dates(branch=branch)))
     date_list = [d.split("T")[0] for d in datetime_list]
@@ -44,4 +48,49 @@ def show_diff(
         f" -     {diff_date} {Color.GREEN}{branch}{Color.RESET}\n"
         f" - vs. {diff_dateref} {Color.GREEN}{branch_ref}{Color.RESET}\n\n"
     )
-    return msg + session.diff(diff_dateref, diff_date, branch_ref, branch)
+    with phase("render"):
+        return msg + session.diff(diff_dateref, diff_date, branch_ref, branch)
+
+def show_structure(
+        session: Session,
+        date: dt.datetime|None,
+        branch: str,
+        report_cache: ReportCache|None = None,
+    ) -> str:
+    """Show the structure of a statement (from the report cache if set)."""
+    def _render() -> str:
+        with phase("render"):
+            return session.print_structure(date, branch)
+
+    if report_cache is None:
+        return _render()
+    return report_cache.get_or_render(
+        "print-structure",
+        session.get_statement(date, branch),
+        session.asset_db,
+        (branch,),
+        _render,
+    )
+
+def show_summary(
+        session: Session,
+        date: dt.datetime,
+        branch: str,
+        acc_path: AccountPath|None = None,
+        report_cache: ReportCache|None = None,
+    ) -> str:
+    """Show the summary of an account of a statement (from the report cache if set)."""
+    def _render() -> str:
+        with phase("render"):
+            return session.print_summary(date, branch, acc_path)
+
+    if report_cache is None:
+        return _render()
+    return report_cache.get_or_render(
+        "print-summary",
+        session.get_statement(date, branch),
+        session.asset_db,
+        # unit: summaries are in the unit of the account
+        (branch, str(acc_path if acc_path is not None else AccountPath()).upper(), None),
+        _render,
+    )
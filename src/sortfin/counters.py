@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import contextlib
+import json
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+class CounterRegistry:
+    """Counts of the work done by the core engines (FX, account traversal, copies).
+
+    Disabled by default: the instrumented code only checks `enabled` before
+    counting, and traversals are only counted (walked again) when enabled.
+    Counters are named "<engine>.<event>":
+    - fx.quote_search.calls: calls of the recursive quote search
+      (FxMarket._get_quote, one per asset visited)
+    - fx.rate_table.hits/misses: FX rate tables served from the cache/built
+    - fx.rate_table.nodes: assets visited while building rate tables
+    - account.get_account.calls: path resolutions (Account.get_account)
+    - account.get_account.nodes: accounts walked through by the resolutions
+    - valuation.calls/nodes: valuations of account trees, accounts valued
+    - statement.path_index.builds: path indexes of statements built
+    - statement.copies/account.copies: statements copied, accounts copied
+    Counts of worker processes (see `workers` of load/save) are not recorded.
+    """
+
+    def __init__(self) -> None:
+        self.enabled : bool = False
+        self._counts : dict[str, int] = {}
+
+    def add(self, name: str, count: int = 1) -> None:
+        self._counts[name] = self._counts.get(name, 0) + count
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        self._counts = {}
+
+    def snapshot(self) -> dict[str, int]:
+        """Get a copy of the counts, by counter name."""
+        return dict(sorted(self._counts.items()))
+
+    @contextlib.contextmanager
+    def recording(self) -> Iterator[CounterRegistry]:
+        """Enable the counters in the block (their counts are not reset)."""
+        enabled = self.enabled
+        self.enabled = True
+        try:
+            yield self
+        finally:
+            self.enabled = enabled
+
+    def write_json(self, file_path: Path) -> None:
+        file_path.write_text(json.dumps(self.snapshot(), indent=2))
+
+    def format_table(self) -> str:
+        lines = [f"{'counter':<28} {'count':>10}"]
+        lines += [
+            f"{name:<28} {count:>10}" for name, count in self.snapshot().items()
+        ]
+        return "\n".join(lines)
+
+
+# the registry of the process, instrumented code counts in it
+COUNTERS = CounterRegistry()
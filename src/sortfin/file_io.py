@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import atexit
+import contextlib
+import gzip
+import io
+import lzma
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from types import TracebackType
+
+LOCK_SUFFIX = ".lock"
+
+_new_file_mode : int|None = None
+_new_file_mode_lock = threading.Lock()
+
+
+def _get_new_file_mode() -> int:
+    # mkstemp creates 0o600 files: new files get the usual umask-based mode instead.
+    # The umask can only be read by setting it, so it is read once, on first use
+    # and under a lock; files created meanwhile by other threads get a private mode.
+    global _new_file_mode  # noqa: PLW0603
+    with _new_file_mode_lock:
+        if _new_file_mode is None:
+            umask = os.umask(0o077)
+            os.umask(umask)
+            _new_file_mode = 0o666 & ~umask
+        return _new_file_mode
+
+
+def _fsync_directory(dir_path: Path) -> None:
+    # makes the rename itself durable (not possible on Windows)
+    if os.name != "posix":
+        return
+    fd = os.open(dir_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def atomic_open(file_path: Path, mode: str = "w") -> Iterator[IO]:
+    """Open a temporary file that replaces `file_path` once fully written.
+
+    The data is fsync'd before the rename, so `file_path` always holds either
+    the previous or the new content, even if the process dies mid-write.
+    """
+    dir_path = file_path.parent
+    fd, tmp_name = tempfile.mkstemp(
+        dir=dir_path,
+        prefix=f".{file_path.name}.",
+        suffix=".tmp",
+    )
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, mode) as file:
+            tmp_path.chmod(
+                file_path.stat().st_mode if file_path.exists()
+                else _get_new_file_mode(),
+            )
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        tmp_path.replace(file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    _fsync_directory(dir_path)
+
+
+def _get_compression(file_path: Path) -> str|None:
+    for compression in ("gz", "xz"):
+        if file_path.name.endswith("." + compression):
+            return compression
+    return None
+
+
+@contextlib.contextmanager
+def open_text(file_path: Path, mode: str = "r") -> Iterator[IO[str]]:
+    """Open a text file, (de)compressed on the fly if it ends with .gz or .xz.
+
+    Files opened for writing are replaced atomically (see `atomic_open`).
+    """
+    compression = _get_compression(file_path)
+    if mode == "r":
+        if compression == "gz":
+            with gzip.open(file_path, "rt", encoding="utf-8") as file:
+                yield file
+        elif compression == "xz":
+            with lzma.open(file_path, "rt", encoding="utf-8") as file:
+                yield file
+        else:
+            with file_path.open("r") as file:
+                yield file
+        return
+    if mode != "w":
+        msg = f"unsupported mode: {mode}"
+        raise ValueError(msg)
+    if compression is None:
+        with atomic_open(file_path, "w") as file:
+            yield file
+        return
+    with atomic_open(file_path, "wb") as raw_file:
+        # closing the (de)compressor does not close raw_file
+        compressed_file = (
+            gzip.GzipFile(fileobj=raw_file, mode="wb", compresslevel=6, mtime=0)
+            if compression == "gz"
+            else lzma.LZMAFile(raw_file, "wb")
+        )
+        with io.TextIOWrapper(compressed_file, encoding="utf-8") as file:
+            yield file
+
+
+class BackgroundTask:
+    """Run a function on a (non-daemon) background thread.
+
+    The interpreter does not exit before the thread is done, and `wait` is also
+    registered with atexit, so the task always completes before the process ends.
+    Errors raised by the function are raised again by `wait`.
+    """
+
+    def __init__(
+            self,
+            func: Callable[..., object],
+            *args: object,
+            name: str = "sortfin-background",
+        ) -> None:
+        self._func = func
+        self._args = args
+        self._error: BaseException|None = None
+        self._thread = threading.Thread(target=self._run, name=name)
+        atexit.register(self.wait)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            self._func(*self._args)
+        except BaseException as e:  # noqa: BLE001
+            self._error = e
+
+    @property
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def wait(self) -> None:
+        """Block until the task is done and raise its error, if any."""
+        self._thread.join()
+        atexit.unregister(self.wait)
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+
+class LockTimeoutError(TimeoutError):
+    """Raised when a file lock could not be acquired in time."""
+
+
+def get_lock_path(file_path: Path) -> Path:
+    """Get the path of the lock file guarding writes to `file_path`."""
+    return file_path.with_name(file_path.name + LOCK_SUFFIX)
+
+
+def _try_lock(fd: int) -> bool:
+    try:
+        if os.name == "posix":
+            import fcntl  # noqa: PLC0415
+
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            import msvcrt  # noqa: PLC0415
+
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fd: int) -> None:
+    if os.name == "posix":
+        import fcntl  # noqa: PLC0415
+
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        import msvcrt  # noqa: PLC0415
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """Advisory exclusive lock on a lock file, waiting at most `timeout` seconds.
+
+    The lock is held by the open file, so the OS releases it if the process
+    dies: there are no stale locks. Only writers take it, readers never wait.
+    """
+
+    def __init__(
+            self,
+            lock_path: Path,
+            timeout: float = 10.0,
+            poll_interval: float = 0.05,
+        ) -> None:
+        self.lock_path = lock_path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd: int|None = None
+
+    @property
+    def is_locked(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self) -> None:
+        """Take the lock, raising LockTimeoutError if it is still busy after `timeout`."""
+        if self._fd is not None:
+            msg = f"lock already acquired: {self.lock_path}"
+            raise RuntimeError(msg)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, _get_new_file_mode())
+        deadline = time.monotonic() + self.timeout
+        while not _try_lock(fd):
+            if time.monotonic() >= deadline:
+                os.close(fd)
+                msg = (
+                    f"could not lock {self.lock_path} within {self.timeout}s"
+                    " (another sortfin process is writing the session)"
+                )
+                raise LockTimeoutError(msg)
+            time.sleep(self.poll_interval)
+        self._fd = fd
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        fd, self._fd = self._fd, None
+        try:
+            _unlock(fd)
+        finally:
+            os.close(fd)
+
+    def __enter__(self) -> FileLock:
+        self.acquire()
+        return self
+
+    def __exit__(
+            self,
+            exc_type: type[BaseException]|None,
+            exc_value: BaseException|None,
+            traceback: TracebackType|None,
+        ) -> None:
+        self.release()
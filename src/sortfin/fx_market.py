@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from .counters import COUNTERS
+from .profiling import phase
+
 if TYPE_CHECKING:
     from .asset_database import AssetDatabase
 
@@ -11,6 +14,8 @@ class FxMarket:
         """Initialize the FX market with an empty quotes dictionary."""
         self.quotes : dict[tuple[str, str], float] = {}
         self.secondary_quotes : dict[tuple[str, str], float] = {}
+        # unit -> (asset names by code, rates to unit by asset code)
+        self._rate_tables : dict[str, tuple[tuple[str, ...], list[float|None]]] = {}
 
     def __str__(self) -> str:
         res = "FX Market: \n"
@@ -31,6 +36,11 @@ class FxMarket:
                 return False
         return True
 
+    def clear_cache(self) -> None:
+        """Drop the quotes derived from `quotes` (to call after changing them)."""
+        self.secondary_quotes = {}
+        self._rate_tables = {}
+
     def copy(self) -> FxMarket:
         res = FxMarket()
         res.quotes = {
@@ -62,6 +72,8 @@ class FxMarket:
             asset2: str,
             filter_asset_list : list[str]|None = None,
         ) -> float|None:
+        if COUNTERS.enabled:
+            COUNTERS.add("fx.quote_search.calls")
         if filter_asset_list is None:
             filter_asset_list = []
         if asset1 == asset2:
@@ -117,10 +129,57 @@ class FxMarket:
             raise ValueError(msg)
         assert asset1 is not None #noqa: S101
         assert asset2 is not None #noqa: S101
-        return self._get_quote(
-            asset1.name,
-            asset2.name,
-        )
+        return self.get_rate_table(asset_db, asset2.name)[
+            asset_db.codes[asset1.name]
+        ]
+
+    def get_rate_table(self, asset_db: AssetDatabase, unit: str) -> list[float|None]:
+        """Get the rates of all the assets to `unit`, indexed by asset code.
+
+        The table is built by a single traversal of the quotes from `unit`
+        (None for the assets without a path to it) and kept until the quotes
+        change. It is only valid for the asset codes of `asset_db`.
+        """
+        table = self._rate_tables.get(unit)
+        if table is not None and table[0] is asset_db.names:
+            if COUNTERS.enabled:
+                COUNTERS.add("fx.rate_table.hits")
+            return table[1]
+        if COUNTERS.enabled:
+            COUNTERS.add("fx.rate_table.misses")
+        if unit not in asset_db.codes:
+            msg = f"Asset {unit} not found in the AssetDatabase"
+            raise ValueError(msg)
+        with phase("fx"):
+            rates = self._build_rate_table(asset_db, unit)
+        self._rate_tables[unit] = (asset_db.names, rates)
+        return rates
+
+    def _build_rate_table(self, asset_db: AssetDatabase, unit: str) -> list[float|None]:
+        # asset -> [(neighbour, rate of the neighbour to the asset)]
+        neighbours : dict[str, list[tuple[str, float]]] = {}
+        for (asset1, asset2), rate in self.quotes.items():
+            neighbours.setdefault(asset2, []).append((asset1, rate))
+            neighbours.setdefault(asset1, []).append((asset2, 1 / rate))
+        rates_by_name : dict[str, float] = {unit: 1.0}
+        queue = [unit]
+        for asset in queue:
+            asset_rate = rates_by_name[asset]
+            for other, rate in neighbours.get(asset, []):
+                if other not in rates_by_name:
+                    rates_by_name[other] = rate * asset_rate
+                    queue.append(other)
+        if COUNTERS.enabled:
+            COUNTERS.add("fx.rate_table.nodes", len(queue))
+        n_quotes = sum(1 for asset1, _ in self.quotes if asset1 in rates_by_name)
+        if n_quotes >= len(rates_by_name):
+            # the quotes connected to unit have a cycle: several paths give
+            # rates to unit, keep the ones of the original quote search
+            return [
+                self._get_quote(name, unit) if name in rates_by_name else None
+                for name in asset_db.names
+            ]
+        return [rates_by_name.get(name) for name in asset_db.names]
 
     def add_quote(
             self,
@@ -149,7 +208,7 @@ class FxMarket:
         self.quotes = {k: v for k, v in self.quotes.items() if k[0] != k[1]}
         if self.get_quote(asset_db, asset1, asset2) is None:
             self.quotes[(asset1, asset2)] = rate
-            self.secondary_quotes = {} # clean up secondary quotes
+            self.clear_cache()
             return True
         return False
 
@@ -166,8 +225,34 @@ class FxMarket:
             return False, f"Cannot modify quote for identical assets: {asset1}/{asset2}"
         if (asset1, asset2) not in self.quotes:
             if (asset2, asset1) in self.quotes:
-                self.quotes[(asset1, asset2)] = 1 / rate
-                return True, f"Modified quote for {asset1}/{asset2} to {1 / rate}"
+                self.quotes[(asset2, asset1)] = 1 / rate
+                self.clear_cache()
+                return True, f"Modified quote for {asset2}/{asset1} to {1 / rate}"
             return False, f"Quote for {asset1}/{asset2} does not exist"
         self.quotes[(asset1, asset2)] = rate
+        self.clear_cache()
         return True, f"Modified quote for {asset1}/{asset2} to {rate}"
+
+    def modify_quotes(
+            self,
+            rates: dict[tuple[str, str], float],
+        ) -> tuple[bool, str]:
+        """Modify several existing quotes, with a single secondary quotes clean up.
+
+        All the quotes are checked first: nothing is modified if one is invalid.
+        """
+        new_quotes : dict[tuple[str, str], float] = {}
+        for (asset1, asset2), rate in rates.items():
+            if rate <= 0:
+                return False, f"Rate must be positive, not {rate} for {asset1}/{asset2}"
+            if (asset1, asset2) in self.quotes:
+                new_quotes[(asset1, asset2)] = rate
+            elif (asset2, asset1) in self.quotes:
+                new_quotes[(asset2, asset1)] = 1 / rate
+            else:
+                return False, f"Quote for {asset1}/{asset2} does not exist"
+        modified = any(self.quotes[k] != v for k, v in new_quotes.items())
+        self.quotes.update(new_quotes)
+        if modified:
+            self.clear_cache()
+        return modified, f"Modified {len(new_quotes)} quotes"
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import threading
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import cProfile
+    from collections.abc import Iterator
+    from pathlib import Path
+
+PROFILE_VERSION = 1
+# time of the profile not spent in a named phase
+OTHER_PHASE = "other"
+
+_NO_PHASE = contextlib.nullcontext()
+_current : Profiler|None = None
+
+
+class Profiler:
+    """Time the phases of a run (load, FX, render, save...) and its peak memory.
+
+    Library code marks its phases with `phase(name)`, which does nothing unless
+    a profiler is running. Phase times are exclusive: a phase nested in another
+    one (e.g. FX rate tables built while rendering) is not counted twice.
+    Only the phases of the thread that started the profiler are recorded.
+    The peak memory is measured with tracemalloc, which slows down the
+    allocations: compare timings of profiled runs with each other only. It is
+    not measured if tracemalloc was already tracing when the profiler started.
+    With `cprofile_path`, the run is also profiled with cProfile and its
+    stats are dumped to that file (to be read with pstats or snakeviz).
+    """
+
+    def __init__(
+            self,
+            *,
+            trace_memory: bool = True,
+            cprofile_path: Path|None = None,
+        ) -> None:
+        self.trace_memory : bool = trace_memory
+        self.cprofile_path : Path|None = cprofile_path
+        # phase -> [exclusive time in s, calls]
+        self.phases : dict[str, list] = {}
+        self.total_time : float = 0.0
+        self.peak_memory : int|None = None
+        self._stack : list[list] = []
+        self._thread_id : int|None = None
+        self._start : float|None = None
+        self._cprofile : cProfile.Profile|None = None
+        self._started_tracing : bool = False
+
+    def start(self) -> None:
+        """Start profiling (only one profiler can run at a time)."""
+        global _current  # noqa: PLW0603
+        if _current is not None:
+            msg = "a profiler is already running"
+            raise ValueError(msg)
+        _current = self
+        self._thread_id = threading.get_ident()
+        # tracemalloc may already be tracing (started by the caller): the peak
+        # would not be the one of the run, and it must not be stopped here
+        self._started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        if self.cprofile_path is not None:
+            # only needed for dumps
+            import cProfile  # noqa: PLC0415
+
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        # the root phase gets the time not spent in named phases
+        self._stack = [[OTHER_PHASE, 0.0]]
+        self._start = time.perf_counter()
+
+    def stop(self) -> None:
+        """Stop profiling, and dump the cProfile stats if requested."""
+        global _current  # noqa: PLW0603
+        if self._start is None:
+            return
+        self.total_time = time.perf_counter() - self._start
+        self._add_time(OTHER_PHASE, self.total_time - self._stack[0][1], 1)
+        self._start = None
+        self._stack = []
+        _current = None
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_path)
+            self._cprofile = None
+        if self._started_tracing:
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self) -> Profiler:
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
+
+    def _add_time(self, name: str, elapsed: float, calls: int) -> None:
+        totals = self.phases.setdefault(name, [0.0, 0])
+        totals[0] += elapsed
+        totals[1] += calls
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Count the time of the block in phase `name`."""
+        if self._start is None or threading.get_ident() != self._thread_id:
+            yield
+            return
+        # [name, time of the nested phases]
+        frame = [name, 0.0]
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            self._stack[-1][1] += elapsed
+            self._add_time(name, elapsed - frame[1], 1)
+
+    def to_dict(self) -> dict:
+        """Get the results (times in s, memory in bytes), e.g. to write as JSON."""
+        return {
+            "version": PROFILE_VERSION,
+            "total_time": self.total_time,
+            "peak_memory": self.peak_memory,
+            "phases": {
+                name: {"time": elapsed, "calls": calls}
+                for name, (elapsed, calls) in self.phases.items()
+            },
+        }
+
+    def write_json(self, file_path: Path) -> None:
+        file_path.write_text(json.dumps(self.to_dict(), indent=2))
+
+    def format_table(self) -> str:
+        """Format the phases, slowest first, with their share of the total time."""
+        lines = [f"{'phase':<16} {'time (s)':>9} {'calls':>6} {'share':>6}"]
+        for name, (elapsed, calls) in sorted(
+            self.phases.items(), key=lambda item: -item[1][0],
+        ):
+            share = elapsed / self.total_time if self.total_time > 0 else 0.0
+            lines.append(f"{name:<16} {elapsed:>9.4f} {calls:>6} {share:>6.1%}")
+        lines.append(f"{'total':<16} {self.total_time:>9.4f}")
+        if self.peak_memory is not None:
+            lines.append(f"peak memory (tracemalloc): {self.peak_memory / 2**20:.1f} MiB")
+        if self.cprofile_path is not None:
+            lines.append(f"cProfile stats written to {self.cprofile_path}")
+        return "\n".join(lines)
+
+
+def get_profiler() -> Profiler|None:
+    """Get the running profiler (None if not profiling)."""
+    return _current
+
+
+def phase(name: str) -> contextlib.AbstractContextManager:
+    """Count the time of a block in phase `name` of the running profiler, if any."""
+    if _current is None:
+        return _NO_PHASE
+    return _current.phase(name)
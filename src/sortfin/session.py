@@ -10,6 +10,7 @@ from .statement import Statement
 
 if TYPE_CHECKING:
     import datetime as dt
+    from collections.abc import MutableMapping
 
     from .account_path import AccountPath
     from .asset import Asset
@@ -26,7 +27,9 @@ class Session:
         ) -> None:
         self.asset_db: AssetDatabase = asset_db \
             if asset_db is not None else AssetDatabase()
-        self.data : dict[tuple[dt.datetime, str], Statement] = {}
+        self.data : MutableMapping[tuple[dt.datetime, str], Statement] = {}
+        # revision of the session file this session was loaded from/saved to
+        self.revision: int = 0
 
     def keys(self) -> list[tuple[dt.datetime, str]]:
         """Get the list of keys (date, branch) for the session data."""
@@ -151,7 +154,7 @@ class Session:
         state = Session(
             self.asset_db.copy(),
         )
-        state.data = self.data.copy()
+        state.data = dict(self.data)
         return state
 
     def copy_statement(
@@ -243,7 +246,7 @@ class Session:
         ) -> Account:
         """Get the account at the specified folder path."""
         statement = self.get_statement(date, branch)
-        return statement.account.get_account(folder_path)
+        return statement.get_account(folder_path)
 
     def delete_account(
             self,
@@ -253,7 +256,7 @@ class Session:
     ) -> bool:
         """Delete an account at the specified folder path."""
         statement = self.get_statement(date, branch)
-        return statement.account.delete_account(folder_path)
+        return statement.delete_account(folder_path)
 
     def get_fxmarket(
             self,
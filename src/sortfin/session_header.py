@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+from typing import IO
+
+from .session import Session
+
+HEADER_VERSION = 1
+# YAML session files start with the header as a comment line (ignored by yaml)
+YAML_HEADER_PREFIX = "#sortfin "
+# JSON session files are an object holding the header (on its first line) and the session
+JSON_HEADER_PREFIX = '{"sortfin":'
+JSON_SESSION_KEY = "session"
+
+type StatementKey = tuple[dt.datetime, str]
+
+
+class SessionHeader:
+    """Metadata of a session file, readable without decoding any statement.
+
+    It holds the file format version, the file revision (incremented by each
+    save, see `save_session`), the asset list and, for each (date, branch) key,
+    the number of accounts of the statement.
+    """
+
+    def __init__(
+            self,
+            assets: list,
+            statements: dict[StatementKey, int],
+            version: int = HEADER_VERSION,
+            revision: int = 0,
+        ) -> None:
+        self.version: int = version
+        self.revision: int = revision
+        self.assets: list = assets
+        self.statements: dict[StatementKey, int] = statements
+
+    def keys(self) -> list[StatementKey]:
+        """Get the sorted list of keys (date, branch) of the session statements."""
+        return sorted(self.statements)
+
+    def dates(self, branch: str|None = Session.DEFAULT_BRANCH) -> list[dt.datetime]:
+        """Get the list of dates for which statements are available."""
+        return sorted(
+            date for (date, name) in self.statements if branch is None or name == branch
+        )
+
+    def branches(self) -> list[str]:
+        return sorted({name for (_, name) in self.statements})
+
+    def to_dict(self) -> dict:
+        return {
+            "sortfin": self.version,
+            "revision": self.revision,
+            "assets": self.assets,
+            "statements": [
+                [date.isoformat(), branch, n_accounts]
+                for (date, branch), n_accounts in sorted(self.statements.items())
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, header_dict: dict) -> SessionHeader:
+        version = header_dict.get("sortfin")
+        if not isinstance(version, int) or version > HEADER_VERSION:
+            msg = f"unsupported session header version: {version}"
+            raise ValueError(msg)
+        return cls(
+            header_dict["assets"],
+            {
+                (dt.datetime.fromisoformat(date_str), branch): n_accounts
+                for date_str, branch, n_accounts in header_dict["statements"]
+            },
+            version,
+            header_dict.get("revision", 0),
+        )
+
+
+def _count_accounts(account_list: list) -> int:
+    if not isinstance(account_list[2], list):
+        return 1
+    return 1 + sum(_count_accounts(sa) for sa in account_list[2])
+
+
+def get_session_header(session_list: list, revision: int = 0) -> SessionHeader:
+    """Build the header of a serialized session (see `from_session_to_list`)."""
+    return SessionHeader(
+        session_list[0],
+        {
+            (dt.datetime.fromisoformat(date_str), branch): _count_accounts(
+                statement_list[2],
+            )
+            for date_str, branch, statement_list in session_list[1]
+        },
+        revision=revision,
+    )
+
+
+def write_yaml_header(header: SessionHeader, file: IO[str]) -> None:
+    """Write the header line of a YAML session file."""
+    file.write(YAML_HEADER_PREFIX + json.dumps(header.to_dict()) + "\n")
+
+
+def read_yaml_header(file: IO[str]) -> SessionHeader|None:
+    """Read the header line of a YAML session file (None for files without one).
+
+    Files without a header are left at their start.
+    """
+    line = file.readline()
+    if not line.startswith(YAML_HEADER_PREFIX):
+        file.seek(0)
+        return None
+    return SessionHeader.from_dict(json.loads(line[len(YAML_HEADER_PREFIX):]))
+
+
+def write_json_header(header: SessionHeader, file: IO[str]) -> None:
+    """Write the start of a JSON session file, up to its session list.
+
+    The file is a single object {"sortfin": header, "session": session list}:
+    the session list and a closing "}" must follow.
+    """
+    file.write(
+        JSON_HEADER_PREFIX + json.dumps(header.to_dict(), separators=(",", ":"))
+        + f',\n"{JSON_SESSION_KEY}":',
+    )
+
+
+def get_json_session(session_data: dict|list) -> tuple[SessionHeader|None, list]:
+    """Split the decoded content of a JSON session file into its header and session list.
+
+    Files written before headers were introduced hold the session list alone.
+    """
+    if isinstance(session_data, list):
+        return None, session_data
+    return SessionHeader.from_dict(session_data["sortfin"]), session_data[JSON_SESSION_KEY]
+
+
+def read_json_header(file: IO[str]) -> SessionHeader|None:
+    """Read the header of a JSON session file (None for files without one).
+
+    Only the first line is decoded, unless the file was reformatted.
+    """
+    line = file.readline()
+    if line.lstrip().startswith("["):
+        return None
+    if line.startswith(JSON_HEADER_PREFIX):
+        try:
+            header_dict, _ = json.JSONDecoder().raw_decode(
+                line[len(JSON_HEADER_PREFIX):].lstrip(),
+            )
+        except json.JSONDecodeError:
+            header_dict = None
+        if isinstance(header_dict, dict):
+            return SessionHeader.from_dict(header_dict)
+    # not written by sortfin (e.g. reformatted): decoded in full
+    file.seek(0)
+    return get_json_session(json.load(file))[0]
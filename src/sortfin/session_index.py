@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import mmap
+import os
+import uuid
+from collections.abc import MutableMapping
+from typing import TYPE_CHECKING
+
+from .file_io import atomic_open
+from .session import Session
+from .session_header import SessionHeader, get_session_header
+from .to_yaml import _from_list_to_assetdb, from_list_to_statement, from_session_to_list
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from .asset_database import AssetDatabase
+    from .statement import Statement
+
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 2
+# data files start with a line holding a token drawn at each write, also stored
+# in the index: slices are only read from the data file the index was written for
+DATA_TOKEN_PREFIX = b"sortfin-data "
+
+type StatementKey = tuple[dt.datetime, str]
+
+
+class SessionIndexError(ValueError):
+    """Raised when an indexed session file and its sidecar index disagree."""
+
+
+def get_index_path(data_path: Path) -> Path:
+    """Get the sidecar index path of an indexed session file."""
+    return data_path.with_name(data_path.name + INDEX_SUFFIX)
+
+
+class SessionIndex:
+    """Map each (date, branch) of a session to the byte range of its statement."""
+
+    def __init__(
+            self,
+            assets: list,
+            entries: dict[StatementKey, tuple[int, int]],
+            data_size: int,
+            header: SessionHeader|None = None,
+            data_token: str = "",
+        ) -> None:
+        self.assets: list = assets
+        self.entries: dict[StatementKey, tuple[int, int]] = entries
+        self.data_size: int = data_size
+        self.header: SessionHeader|None = header
+        self.data_token: str = data_token
+
+    def keys(self) -> list[StatementKey]:
+        """Get the sorted list of keys (date, branch) of the indexed statements."""
+        return sorted(self.entries)
+
+    def dates(self, branch: str|None = Session.DEFAULT_BRANCH) -> list[dt.datetime]:
+        """Get the list of dates for which statements are available."""
+        return sorted(
+            date for (date, name) in self.entries if branch is None or name == branch
+        )
+
+    def branches(self) -> list[str]:
+        return sorted({name for (_, name) in self.entries})
+
+    def to_dict(self) -> dict:
+        index_dict = {
+            "version": INDEX_VERSION,
+            "data_size": self.data_size,
+            "data_token": self.data_token,
+            "assets": self.assets,
+            "statements": [
+                [date.isoformat(), branch, offset, length]
+                for (date, branch), (offset, length) in sorted(self.entries.items())
+            ],
+        }
+        if self.header is not None:
+            index_dict["header"] = self.header.to_dict()
+        return index_dict
+
+    @classmethod
+    def from_dict(cls, index_dict: dict) -> SessionIndex:
+        if index_dict.get("version") != INDEX_VERSION:
+            msg = f"unsupported session index version: {index_dict.get('version')}"
+            raise SessionIndexError(msg)
+        return cls(
+            index_dict["assets"],
+            {
+                (dt.datetime.fromisoformat(date_str), branch): (offset, length)
+                for date_str, branch, offset, length in index_dict["statements"]
+            },
+            index_dict["data_size"],
+            SessionHeader.from_dict(index_dict["header"])
+            if "header" in index_dict else None,
+            index_dict["data_token"],
+        )
+
+    @classmethod
+    def read(cls, index_path: Path) -> SessionIndex:
+        with index_path.open("r", encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
+
+    def write(self, index_path: Path) -> None:
+        with atomic_open(index_path) as file:
+            json.dump(self.to_dict(), file)
+
+
+class LazyStatements(MutableMapping):
+    """Statements of an indexed session, decoded from the data file on first access.
+
+    Only the requested slice of the data file is mapped and decoded, so getting
+    one statement does not depend on the number of statements in the session.
+    A SessionIndexError is raised if the data file was written again since the
+    index was read (its token changed).
+    """
+
+    def __init__(
+            self,
+            data_path: Path,
+            index: SessionIndex,
+            asset_db: AssetDatabase,
+        ) -> None:
+        self.data_path: Path = data_path
+        self.asset_db: AssetDatabase = asset_db
+        self._data_size: int = index.data_size
+        self._data_token: bytes = _get_token_line(index.data_token)
+        self._offsets: dict[StatementKey, tuple[int, int]] = dict(index.entries)
+        self._loaded: dict[StatementKey, Statement] = {}
+
+    def __getitem__(self, key: StatementKey) -> Statement:
+        if key in self._loaded:
+            return self._loaded[key]
+        offset, length = self._offsets[key]
+        statement = from_list_to_statement(
+            json.loads(self._read_slice(offset, length)),
+            self.asset_db,
+        )
+        del self._offsets[key]
+        self._loaded[key] = statement
+        return statement
+
+    def __setitem__(self, key: StatementKey, value: Statement) -> None:
+        self._offsets.pop(key, None)
+        self._loaded[key] = value
+
+    def __delitem__(self, key: StatementKey) -> None:
+        if key in self._loaded:
+            del self._loaded[key]
+            return
+        del self._offsets[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._loaded or key in self._offsets
+
+    def __iter__(self) -> Iterator[StatementKey]:
+        yield from self._loaded
+        yield from self._offsets
+
+    def __len__(self) -> int:
+        return len(self._loaded) + len(self._offsets)
+
+    def copy(self) -> dict[StatementKey, Statement]:
+        return dict(self.items())
+
+    @property
+    def loaded_keys(self) -> list[StatementKey]:
+        """Get the keys of the statements decoded so far."""
+        return list(self._loaded)
+
+    def _read_slice(self, offset: int, length: int) -> bytes:
+        with self.data_path.open("rb") as file:
+            if os.fstat(file.fileno()).st_size != self._data_size or \
+                file.read(len(self._data_token)) != self._data_token:
+                msg = f"session index is out of date for {self.data_path}"
+                raise SessionIndexError(msg)
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm[offset:offset + length]
+
+
+def _get_token_line(data_token: str) -> bytes:
+    return DATA_TOKEN_PREFIX + data_token.encode("ascii") + b"\n"
+
+
+def load_session_index(data_path: Path) -> SessionIndex:
+    """Read the sidecar index of an indexed session file."""
+    return SessionIndex.read(get_index_path(data_path))
+
+
+def load_indexed_session(data_path: Path) -> Session:
+    """Load an indexed session; statements are decoded only when accessed."""
+    index = load_session_index(data_path)
+    session = Session(_from_list_to_assetdb(index.assets))
+    session.data = LazyStatements(data_path, index, session.asset_db)
+    if index.header is not None:
+        session.revision = index.header.revision
+    return session
+
+
+def write_indexed_session(
+        session_list: list,
+        data_path: Path,
+        revision: int = 0,
+    ) -> None:
+    """Write a serialized session as one JSON line per statement plus an index."""
+    entries: dict[StatementKey, tuple[int, int]] = {}
+    data_token = uuid.uuid4().hex
+    token_line = _get_token_line(data_token)
+    offset = len(token_line)
+    with atomic_open(data_path, "wb") as file:
+        file.write(token_line)
+        for date_str, branch, statement_list in session_list[1]:
+            line = json.dumps(statement_list).encode("utf-8") + b"\n"
+            file.write(line)
+            entries[(dt.datetime.fromisoformat(date_str), branch)] = (offset, len(line))
+            offset += len(line)
+    SessionIndex(
+        session_list[0], entries, offset, get_session_header(session_list, revision),
+        data_token,
+    ).write(get_index_path(data_path))
+
+
+def save_indexed_session(session: Session, data_path: Path) -> None:
+    """Save a session as one JSON line per statement plus a sidecar index.
+
+    The revision is incremented as by `cmd.save_session`.
+    """
+    revision = session.revision + 1
+    write_indexed_session(from_session_to_list(session), data_path, revision)
+    session.revision = revision
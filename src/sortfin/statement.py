@@ -6,9 +6,13 @@ from typing import TYPE_CHECKING
 from .account import Account
 from .asset_database import AssetDatabase
 from .colors import Color
+from .counters import COUNTERS
 from .fx_market import FxMarket
+from .valuation import ValuationReport
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
     from .account_path import AccountPath
     from .asset import Asset
 
@@ -24,20 +28,78 @@ class Statement:
         self.date : dt.datetime = date
         self.fx_market : FxMarket = fx_mkt
         self.account : Account = acc
+        # normalized path -> account (None if ambiguous), see get_path_index
+        self._path_index : dict[str, Account|None]|None = None
+        self._path_index_root : Account|None = None
         if asset_db is not None:
             # forces the computation of all fx quotes needed
             # check if this is needed
             self.print_summary(asset_db)
 
     def copy(self, date: dt.datetime|None = None) -> Statement:
+        if COUNTERS.enabled:
+            COUNTERS.add("statement.copies")
+            COUNTERS.add("account.copies", self.account.count_accounts())
         return Statement(
             date if date is not None else self.date,
             self.fx_market.copy(),
             self.account.copy(),
         )
 
-    def get_account(self, ap: AccountPath) -> Account:
-        return self.account.get_account(ap)
+    def __getstate__(self) -> dict:
+        # the path index is built again on first use
+        state = self.__dict__.copy()
+        state["_path_index"] = None
+        state["_path_index_root"] = None
+        return state
+
+    def get_path_index(self) -> dict[str, Account|None]:
+        """Get the accounts by normalized path (see AccountPath.normalized).
+
+        Paths matching several accounts (same names up to case), or going
+        through such accounts, map to None. The index is built on first use and
+        kept up to date by add_account and delete_account: call
+        clear_path_index after changing the account tree directly.
+        """
+        if self._path_index is None or self._path_index_root is not self.account:
+            if COUNTERS.enabled:
+                COUNTERS.add("statement.path_index.builds")
+            self._path_index = {}
+            self._index_accounts("", self.account, ambiguous=False)
+            self._path_index_root = self.account
+        return self._path_index
+
+    def _index_accounts(self, path: str, account: Account, *, ambiguous: bool) -> None:
+        index = self._path_index
+        assert index is not None #noqa: S101
+        index[path] = None if ambiguous else account
+        stack = [(path, account, ambiguous)]
+        while len(stack) > 0:
+            path, account, ambiguous = stack.pop()
+            if account.sub_accounts is None:
+                continue
+            names = [sa.name.upper() for sa in account.sub_accounts]
+            duplicates = {name for name in names if names.count(name) > 1} \
+                if len(set(names)) != len(names) else set()
+            for name, sa in zip(names, account.sub_accounts):
+                sa_path = name if path == "" else f"{path}/{name}"
+                sa_ambiguous = ambiguous or name in duplicates
+                index[sa_path] = None if sa_ambiguous else sa
+                stack.append((sa_path, sa, sa_ambiguous))
+
+    def clear_path_index(self) -> None:
+        """Drop the path index (to call after changing the account tree directly)."""
+        self._path_index = None
+        self._path_index_root = None
+
+    def get_account(self, ap: AccountPath|None) -> Account:
+        if ap is None:
+            return self.account
+        account = self.get_path_index().get(ap.normalized)
+        if account is None:
+            # raises the error of the missing/ambiguous account
+            return self.account.get_account(ap)
+        return account
 
     def change_terminal_account(
             self,
@@ -93,6 +155,24 @@ class Statement:
                 sub_accounts=[] if value is None else None,
             )
         folder_account.sub_accounts.append(new_account)
+        if self._path_index is not None:
+            folder_path_str = folder_path.normalized
+            path = new_account.name.upper() if folder_path_str == "" \
+                else f"{folder_path_str}/{new_account.name.upper()}"
+            if path in self._path_index:
+                # an account of the same name: both become ambiguous
+                self.clear_path_index()
+            else:
+                self._index_accounts(path, new_account, ambiguous=False)
+
+    def delete_account(self, ap: AccountPath) -> bool:
+        """Delete an account (and its sub-accounts), get whether it was deleted."""
+        account = self.get_account(ap) if not ap.is_empty else None
+        deleted = self.account.delete_account(ap)
+        if deleted and self._path_index is not None and account is not None:
+            for path in _iter_paths(ap.normalized, account):
+                self._path_index.pop(path, None)
+        return deleted
 
     def print_structure(self, asset_db: AssetDatabase) -> str:
         return (
@@ -100,18 +180,24 @@ class Statement:
             f"{self.fx_market}\n"
         )
 
+    def value(
+            self,
+            asset_db: AssetDatabase,
+            units: Iterable[str] = (),
+            path: AccountPath|None = None,
+        ) -> ValuationReport:
+        """Value the accounts (under path) in their own unit and in `units`, in one pass."""
+        return ValuationReport(self, asset_db, units, path)
+
     def print_summary(
             self,
             asset_db: AssetDatabase,
             path: AccountPath|None = None,
             unit: str|None = None,
         ) -> str:
-        return (
-            f"Statement: {self.date.date().isoformat()}\n"
-            f"{self.get_account(path).print_account_summary(
-                asset_db, self.fx_market, unit=unit
-            )}"
-        )
+        return self.value(
+            asset_db, [unit] if unit is not None else [], path,
+        ).print_summary(path, unit)
 
     def diff(self, other: Statement) -> str:
         if not isinstance(other, Statement):
@@ -158,6 +244,16 @@ class Statement:
         return f"{Color.YELLOW}No differences found.{Color.RESET}" if res == "" else res
 
 
+def _iter_paths(path: str, account: Account) -> Iterator[str]:
+    # normalized paths of an account and its sub-accounts
+    stack = [(path, account)]
+    while len(stack) > 0:
+        path, account = stack.pop()
+        yield path
+        for sa in account.sub_accounts or ():
+            stack.append((f"{path}/{sa.name.upper()}", sa))
+
+
 def initialize_statement(unit: Asset) -> Statement:
     """Initialize a statement with a given unit and the current date."""
     fx_mkt = FxMarket()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime as dt
+from typing import TYPE_CHECKING
 
 from .account import Account
 from .asset import Asset
@@ -10,6 +11,9 @@ from .price import Price
 from .session import Session
 from .statement import Statement
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 
 def _from_assetdb_to_list(asset_db: AssetDatabase) -> list:
     return [
@@ -28,8 +32,15 @@ def _from_list_to_assetdb(adb_list: list) -> AssetDatabase:
         asset_db.add_asset(ao)
     return asset_db
 
+def _get_asset_index(asset_db: AssetDatabase) -> dict[str, Asset]:
+    return {a.name: a for a in asset_db}
+
 def _get_asset_from_database(name: str, asset_db: AssetDatabase) -> Asset:
-    return next(x for x in asset_db if x.name == name)
+    asset = asset_db.get_asset_from_name(name)
+    if asset is None:
+        msg = f"asset {name} not found in asset database"
+        raise ValueError(msg)
+    return asset
 
 def _from_price_to_tuple(price: Price) -> tuple[float, str]:
     return (price.value, price.unit.name)
@@ -49,22 +60,19 @@ def _from_account_to_list(asset_db: AssetDatabase, account: Account) -> AccountD
         [_from_account_to_list(asset_db, sa) for sa in account.sub_accounts],
     )
 
-def _from_list_to_account(
-        account_dict: AccountDict,
-        asset_db: AssetDatabase,
-    ) -> Account:
-    account_asset = _get_asset_from_database(account_dict[1], asset_db)
+def _from_list_to_account(account_dict: AccountDict) -> Account:
+    # trusted path: units are checked once by _validate_statement
     if isinstance(account_dict[2], float|int):
         return Account(
             account_dict[0],
-            account_asset.name,
+            account_dict[1],
             value=account_dict[2],
         )
     return Account(
         account_dict[0],
-        account_asset.name,
+        account_dict[1],
         sub_accounts=[
-            _from_list_to_account(sa, asset_db)
+            _from_list_to_account(sa)
             for sa in account_dict[2]
         ],
     )
@@ -77,19 +85,53 @@ def _from_fxmkt_to_list(fx_mkt: FxMarket) -> fxmkt_list:
         for t, v in fx_mkt.quotes.items()
     ]
 
-def _from_list_to_fxmkt(fx_list: fxmkt_list, asset_db: AssetDatabase) -> FxMarket:
+def _from_list_to_fxmkt(fx_list: fxmkt_list) -> FxMarket:
+    # trusted path: quotes are checked once by _validate_statement
     res = FxMarket()
-    if len(fx_list) == 1 and fx_list[0][0] == fx_list[0][1]:
-        return res
-    for q in fx_list:
-        res.add_quote(
-            asset_db,
-            _get_asset_from_database(q[0], asset_db).name,
-            _get_asset_from_database(q[1], asset_db).name,
-            q[2],
-        )
+    res.quotes = {(q[0], q[1]): q[2] for q in fx_list if q[0] != q[1]}
     return res
 
+def _validate_account(account: Account, asset_index: dict[str, Asset]) -> None:
+    if account.unit not in asset_index:
+        msg=f"asset {account.unit} not found in asset database"
+        raise ValueError(msg)
+    if account.sub_accounts is not None:
+        for sa in account.sub_accounts:
+            _validate_account(sa, asset_index)
+
+def _validate_fxmkt(fx_mkt: FxMarket, asset_index: dict[str, Asset]) -> None:
+    """Check the quotes and drop the ones implied by previous quotes.
+
+    This gives the same FX market as adding the quotes one by one with
+    `FxMarket.add_quote`, using a union-find instead of a graph search per quote.
+    """
+    parent = {name: name for name in asset_index}
+    def _find(name: str) -> str:
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    quotes : dict[tuple[str, str], float] = {}
+    for (asset1, asset2), rate in fx_mkt.quotes.items():
+        if rate <= 0:
+            msg = f"Rate must be positive, not {rate}"
+            raise ValueError(msg)
+        for asset in (asset1, asset2):
+            if asset not in asset_index:
+                msg = f"Asset {asset} not found in the AssetDatabase"
+                raise ValueError(msg)
+        root1, root2 = _find(asset1), _find(asset2)
+        if root1 != root2:
+            parent[root1] = root2
+            quotes[(asset1, asset2)] = rate
+    fx_mkt.quotes = quotes
+    fx_mkt.clear_cache()
+
+def _validate_statement(state: Statement, asset_index: dict[str, Asset]) -> None:
+    _validate_account(state.account, asset_index)
+    _validate_fxmkt(state.fx_market, asset_index)
+
 def from_statement_to_list(state: Statement, asset_db: AssetDatabase) -> list:
     """Convert a statement object to a list of values for YAML serialization."""
     return [
@@ -98,34 +140,106 @@ def from_statement_to_list(state: Statement, asset_db: AssetDatabase) -> list:
         _from_account_to_list(asset_db, state.account),
     ]
 
-def from_list_to_statement(serialized_list: list, asset_db: AssetDatabase) -> Statement:
-    """Convert a list of values to a statement object."""
+def _from_list_to_statement(serialized_list: list) -> Statement:
     return Statement(
         dt.datetime.fromisoformat(serialized_list[0]),
-        _from_list_to_fxmkt(serialized_list[1], asset_db),
-        _from_list_to_account(serialized_list[2], asset_db),
+        _from_list_to_fxmkt(serialized_list[1]),
+        _from_list_to_account(serialized_list[2]),
     )
 
-def from_session_to_list(session: Session) -> list:
-    """Convert a session object to a list of values for YAML serialization."""
+def from_list_to_statement(
+        serialized_list: list,
+        asset_db: AssetDatabase,
+        *,
+        validate: bool = True,
+    ) -> Statement:
+    """Convert a list of values to a statement object."""
+    state = _from_list_to_statement(serialized_list)
+    if validate:
+        _validate_statement(state, _get_asset_index(asset_db))
+    return state
+
+PARALLEL_THRESHOLD = 64
+
+def _encode_statements(
+        states: list[Statement],
+        asset_db: AssetDatabase,
+    ) -> list[list]:
+    return [from_statement_to_list(state, asset_db) for state in states]
+
+def _decode_statements(
+        serialized_lists: list[list],
+        asset_index: dict[str, Asset]|None,
+    ) -> list[Statement]:
+    states = [_from_list_to_statement(sl) for sl in serialized_lists]
+    if asset_index is not None:
+        for state in states:
+            _validate_statement(state, asset_index)
+    return states
+
+def _map_chunks[T, R](
+        func: Callable[..., list[R]],
+        items: list[T],
+        *args: object,
+        workers: int|None,
+    ) -> list[R]:
+    """Apply `func` to chunks of `items`, across processes for large inputs.
+
+    Results keep the order of `items` whatever the number of workers.
+    """
+    if workers is None or workers <= 1 or len(items) < PARALLEL_THRESHOLD:
+        return func(items, *args)
+    from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+    n_chunks = min(len(items), workers * 4)
+    chunk_size = -(-len(items) // n_chunks)
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(func, chunk, *args) for chunk in chunks]
+        return [res for future in futures for res in future.result()]
+
+def from_session_to_list(session: Session, *, workers: int|None = None) -> list:
+    """Convert a session object to a list of values for YAML serialization.
+
+    With `workers` > 1, statements of large sessions are encoded in parallel.
+    """
     key_list = session.keys()
+    statement_lists = _map_chunks(
+        _encode_statements,
+        [session.data[key] for key in key_list],
+        session.asset_db,
+        workers=workers,
+    )
     return [
         _from_assetdb_to_list(session.asset_db),
         [
-            (
-                date.isoformat(),
-                branch,
-                from_statement_to_list(session.data[(date, branch)], session.asset_db),
+            (date.isoformat(), branch, statement_list)
+            for (date, branch), statement_list in zip(
+                key_list, statement_lists, strict=True,
             )
-            for (date, branch) in key_list
         ],
     ]
 
-def from_list_to_session(serialized_list: list) -> Session:
-    """Convert a list of values to a session object."""
+def from_list_to_session(
+        serialized_list: list,
+        *,
+        validate: bool = True,
+        workers: int|None = None,
+    ) -> Session:
+    """Convert a list of values to a session object.
+
+    Statements are built directly from the serialized data; when `validate` is
+    set, they are checked against the asset database in a single final pass.
+    With `workers` > 1, statements of large sessions are decoded in parallel.
+    """
     asset_db = _from_list_to_assetdb(serialized_list[0])
     session = Session(asset_db)
-    for date_str, branch, statement_list in serialized_list[1]:
-        date = dt.datetime.fromisoformat(date_str)
-        session.data[(date, branch)] = from_list_to_statement(statement_list, asset_db)
+    states = _map_chunks(
+        _decode_statements,
+        [statement_list for _, _, statement_list in serialized_list[1]],
+        _get_asset_index(asset_db) if validate else None,
+        workers=workers,
+    )
+    for (date_str, branch, _), state in zip(serialized_list[1], states, strict=True):
+        session.data[(dt.datetime.fromisoformat(date_str), branch)] = state
     return session
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+from .account import format_account_summary
+from .counters import COUNTERS
+from .price import Price
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .account import Account
+    from .account_path import AccountPath
+    from .asset_database import AssetDatabase
+    from .statement import Statement
+
+
+class ValuationReport:
+    """Values of all the accounts of a statement, in several units at once.
+
+    The account tree is walked once (post-order): each terminal value is
+    converted to every unit of the report with the FX rate tables of the
+    statement, and each folder adds up the values of its sub-accounts. The
+    report then answers any (account, unit) query of these units without
+    walking the tree again. It is not updated when the statement changes.
+
+    With `path`, only the accounts under it are valued (paths of the queries
+    are still relative to the statement account). The units of a report are
+    the units of the valued accounts plus the requested ones, so the native
+    value of every account is always available.
+    Sums are done in the same order as `Account.get_account_price`, so the
+    values are identical.
+    """
+
+    def __init__(
+            self,
+            statement: Statement,
+            asset_db: AssetDatabase,
+            units: Iterable[str] = (),
+            path: AccountPath|None = None,
+        ) -> None:
+        self.statement : Statement = statement
+        self.asset_db : AssetDatabase = asset_db
+        # only the accounts under path are valued (all of them by default)
+        self.account : Account = statement.get_account(path)
+        self._path_parts : list[str] = [
+            part.upper() for part in (path.parts if path is not None else [])
+        ]
+        units = list(dict.fromkeys(
+            self._get_unit_name(unit)
+            for unit in [*units, *_get_units(self.account)]
+        ))
+        self.units : tuple[str, ...] = tuple(units)
+        self._unit_index : dict[str, int] = {unit: i for i, unit in enumerate(units)}
+        rate_tables = [
+            statement.fx_market.get_rate_table(asset_db, unit) for unit in units
+        ]
+        # asset code -> rates to the report units (nan when there is no quote)
+        self._factors : list[list[float]] = [
+            [math.nan if table[code] is None else table[code] for table in rate_tables]
+            for code in range(len(asset_db.names))
+        ]
+        # id of the folder account -> (account, values in the report units), the
+        # account is kept so that its id cannot be reused
+        self._values : dict[int, tuple[Account, list[float]]] = {}
+        self._value_accounts()
+        if COUNTERS.enabled:
+            COUNTERS.add("valuation.calls")
+            COUNTERS.add("valuation.nodes", self.account.count_accounts())
+
+    def _value_accounts(self) -> None:
+        factors = self._factors
+        codes = self.asset_db.codes
+        zero = [0] * len(self.units)
+        values_by_id = self._values
+
+        def _value_folder(account: Account) -> list[float]:
+            # terminal values are not stored: they are computed again from the
+            # factors when queried (see _get_values)
+            rows = []
+            for sa in account.sub_accounts:
+                if sa.sub_accounts is None:
+                    code = codes.get(sa.unit)
+                    if code is None or sa.value is None:
+                        code = self._get_terminal_code(sa)
+                    value = sa.value
+                    rows.append([value * factor for factor in factors[code]])
+                else:
+                    rows.append(_value_folder(sa))
+            values = list(map(sum, zip(*rows))) if len(rows) > 0 else zero
+            values_by_id[id(account)] = (account, values)
+            return values
+
+        if self.account.sub_accounts is not None:
+            _value_folder(self.account)
+        else:
+            self._get_terminal_code(self.account)
+
+    def _get_terminal_code(self, account: Account) -> int:
+        if account.value is None:
+            msg="account is not terminal"
+            raise ValueError(msg)
+        code = self.asset_db.get_code(account.unit)
+        if code is None:
+            msg=f"asset {account.unit} not found in asset database"
+            raise ValueError(msg)
+        return code
+
+    def _get_unit_name(self, unit: str) -> str:
+        # account units may also be set to assets
+        asset = self.asset_db.get_asset_from_name(unit)
+        if asset is None:
+            msg=f"asset {unit} not found in asset database"
+            raise ValueError(msg)
+        return asset.name
+
+    def _get_values(self, account: Account) -> list[float]:
+        if account.sub_accounts is None:
+            factors = self._factors[self._get_terminal_code(account)]
+            return [account.value * factor for factor in factors]
+        values = self._values.get(id(account))
+        if values is None:
+            msg = f"account {account.name} is not part of the valued accounts"
+            raise ValueError(msg)
+        return values[1]
+
+    def _get_account(self, path: AccountPath|None) -> Account:
+        parts = path.parts if path is not None else []
+        if [part.upper() for part in parts[:len(self._path_parts)]] != self._path_parts:
+            msg = f"account {path} is not part of the valued accounts"
+            raise ValueError(msg)
+        return self.statement.get_account(path)
+
+    def get_value(self, path: AccountPath|None = None, unit: str|None = None) -> float:
+        """Get the value of an account (in its own unit if `unit` is not set)."""
+        return self._get_account_value(self._get_account(path), unit)
+
+    def _get_account_value(self, account: Account, unit: str|None) -> float:
+        unit = self._get_unit_name(unit if unit is not None else account.unit)
+        i = self._unit_index.get(unit)
+        if i is None:
+            msg = (
+                f"unit {unit} is not valued in this report"
+                f" (available units: {', '.join(self.units)})"
+            )
+            raise ValueError(msg)
+        value = self._get_values(account)[i]
+        if isinstance(value, float) and math.isnan(value):
+            msg=f"no quote to {unit} for all the assets of account {account.name}"
+            raise ValueError(msg)
+        return value
+
+    def _get_price(self, account: Account, unit: str|None) -> Price:
+        asset_unit = self.asset_db.get_asset_from_name(
+            unit if unit is not None else account.unit,
+        )
+        if asset_unit is None:
+            msg=f"asset {unit} not found in asset database"
+            raise ValueError(msg)
+        return Price(self._get_account_value(account, unit), asset_unit)
+
+    def get_price(self, path: AccountPath|None = None, unit: str|None = None) -> Price:
+        """Get the price of an account (in its own unit if `unit` is not set)."""
+        return self._get_price(self._get_account(path), unit)
+
+    def get_summary(
+            self,
+            path: AccountPath|None = None,
+            unit: str|None = None,
+        ) -> list[tuple[str, Price, Price]]:
+        """Get the (name, native price, price in unit) of the sub-accounts of an account.
+
+        Same result as `Account.get_account_summary`.
+        """
+        account = self._get_account(path)
+        if account.sub_accounts is None:
+            msg="account is not terminal"
+            raise ValueError(msg)
+        if unit is None:
+            unit = account.unit
+        return [
+            (sa.name, self._get_price(sa, sa.unit), self._get_price(sa, unit))
+            for sa in account.sub_accounts
+        ]
+
+    def print_summary(self, path: AccountPath|None = None, unit: str|None = None) -> str:
+        """Format the summary of an account, as `Statement.print_summary`."""
+        account = self._get_account(path)
+        summary = self.get_summary(path, unit)
+        asset_unit = self.asset_db.get_asset_from_name(account.unit)
+        if asset_unit is None:
+            msg=f"asset {account.unit} not found in asset database"
+            raise ValueError(msg)
+        return (
+            f"Statement: {self.statement.date.date().isoformat()}\n"
+            f"{format_account_summary(account.name, asset_unit, summary)}"
+        )
+
+
+def _get_units(account: Account) -> list[str]:
+    units : dict[str, None] = {account.unit: None}
+    stack = [account]
+    while len(stack) > 0:
+        for sa in stack.pop().sub_accounts or ():
+            units[sa.unit] = None
+            if sa.sub_accounts:
+                stack.append(sa)
+    return list(units)
@@ -1,6 +1,7 @@
+import pickle
 import unittest
 
-from src.sortfin.asset import Asset
+from src.sortfin.asset import Asset, _show_value_slow
 
 JPY_SEPARATOR = 4
 GBP = Asset("GBP", "£")
@@ -43,3 +44,45 @@ class TestAsset(unittest.TestCase):
         assert USD != GBP #noqa: S101
         assert USD != JPY #noqa: S101
         assert GBP != JPY #noqa: S101
+
+    def test_asset_show_value_edge_cases(self) -> None:
+        # rounding carries, small values and log10 rounding just below 10**13
+        assert USD.show_value(999.999) == "$ 1,000" #noqa: S101
+        assert USD.show_value(-0.999) == "- $ 1" #noqa: S101
+        assert USD.show_value(0.5) == "$ 0.50" #noqa: S101
+        assert USD.show_value(-1234.005) == "- $ 1,234.01" #noqa: S101
+        assert USD.show_value(0.05) == "$ .05" #noqa: S101
+        assert JPY.show_value(99999.5) == "¥ 9,9999" #noqa: S101
+        assert USD.show_value(9999999999999.994) == "$ 99,999,999,999,99.99" #noqa: S101
+        values = [
+            sign * 10 ** (exponent / 7) + offset
+            for sign in (-1, 1)
+            for exponent in range(-20, 100)
+            for offset in (0, 0.005, 0.4999, 0.995)
+        ]
+        for asset in (USD, JPY, Asset("BTC", "B", ",", ".", 8, 2)):
+            for value in values:
+                assert asset.show_value(value) == _show_value_slow( #noqa: S101
+                    value, asset.symbol, asset.separator_symbol,
+                    asset.decimal_param, asset.separator_param,
+                )
+
+    def test_asset_show_value_format_change(self) -> None:
+        asset = USD.copy()
+        assert asset.show_value(1234.5) == "$ 1,234.50" #noqa: S101
+        asset.separator_symbol = " "
+        asset.decimal_param = 1
+        assert asset.show_value(1234.5) == "$ 1 234.5" #noqa: S101
+        assert pickle.loads(pickle.dumps(asset)).show_value(1234.5) == "$ 1 234.5" #noqa: S101, S301
+
+    def test_asset_hash_change(self) -> None:
+        asset = Asset("USD", "$")
+        hash_before = hash(asset)
+        assert hash(asset) == hash_before #noqa: S101
+        asset.symbol = "US$"
+        assert hash(asset) != hash_before #noqa: S101
+        assert asset != USD #noqa: S101
+        asset.symbol = "$"
+        assert hash(asset) == hash(USD) #noqa: S101
+        assert asset == USD #noqa: S101
+        assert "_hash" not in pickle.loads(pickle.dumps(asset)).__dict__ #noqa: S101, S301
@@ -1,5 +1,6 @@
 import unittest
 
+from src.sortfin.asset import Asset
 from src.sortfin.asset_database import AssetDatabase
 
 from .test_asset import EUR, GBP, JPY, USD
@@ -25,3 +26,33 @@ class TestAssetDB(unittest.TestCase):
         return len(new_adb.assets) == bmk0 and \
             len(new_adb_1.assets) == bmk1 and \
             len(new_adb_2.assets) == bmk2
+
+    def test_find_asset(self) -> None:
+        asset_db = ASSET_DB.copy()
+        test, asset = asset_db.find_asset_from_input("JPY")
+        assert test #noqa: S101
+        assert asset == JPY #noqa: S101
+        assert asset_db.get_asset_from_name("CHF") is None #noqa: S101
+        asset_db.remove_asset(JPY)
+        assert asset_db.get_asset_from_name("JPY") is None #noqa: S101
+        assert len(asset_db.assets) == 3 #noqa: S101, PLR2004
+        assert ASSET_DB.get_asset_from_name("JPY") is not None #noqa: S101
+
+    def test_add_duplicate_name(self) -> None:
+        asset_db = ASSET_DB.copy()
+        with self.assertRaises(ValueError):
+            asset_db.add_asset(Asset("EUR", "€"))
+        with self.assertRaises(ValueError):
+            asset_db.add_asset(Asset("EUR", "EUR"))
+        assert len(asset_db.assets) == 4 #noqa: S101, PLR2004
+
+    def test_codes(self) -> None:
+        asset_db = ASSET_DB.copy()
+        assert asset_db.names == ASSET_DB.names #noqa: S101
+        assert [asset_db.codes[name] for name in asset_db.names] == list(range(4)) #noqa: S101
+        assert asset_db.get_code(GBP) == asset_db.codes["GBP"] #noqa: S101
+        asset_db.remove_asset(EUR)
+        assert "EUR" not in asset_db.names #noqa: S101
+        assert sorted(asset_db.codes.values()) == list(range(3)) #noqa: S101
+        assert asset_db.get_code("EUR") is None #noqa: S101
+        assert ASSET_DB.get_code("EUR") is not None #noqa: S101
@@ -0,0 +1,144 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.sortfin.account_path import AccountPath
+from src.sortfin.cmd import ReportCache, load_session_with_cache, save_session, show_summary
+from src.sortfin.cmd.cache import CACHE_FILE_NAME, MTIME_GRANULARITY_NS, _read_cache_header
+from src.sortfin.cmd.report_cache import REPORT_SUFFIX
+from src.sortfin.session import Session
+
+from .test_assetdb import ASSET_DB
+from .test_statement import STATEMENT
+
+
+class TestSessionCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.tmp_dir.name)
+        self.file_path = self.cache_dir / "session.json"
+        self.session = Session(ASSET_DB)
+        self.session.data[(STATEMENT.date, Session.DEFAULT_BRANCH)] = STATEMENT.copy()
+        save_session(self.session, self.file_path)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _load(self) -> tuple[Session, bool]:
+        with mock.patch(
+            "src.sortfin.cmd.cache.load_session",
+            wraps=mock.DEFAULT,
+        ) as load_mock:
+            from src.sortfin.cmd.main import load_session  # noqa: PLC0415
+            load_mock.side_effect = load_session
+            session = load_session_with_cache(self.file_path, self.cache_dir)
+            return session, load_mock.called
+
+    def test_cache_hit(self) -> None:
+        _, parsed = self._load()
+        assert parsed #noqa: S101
+        assert (self.cache_dir / CACHE_FILE_NAME).exists() #noqa: S101
+        session, parsed = self._load()
+        assert not parsed #noqa: S101
+        assert session.get_statement( #noqa: S101
+            STATEMENT.date,
+        ).account == STATEMENT.account
+
+    def test_cache_stale(self) -> None:
+        self._load()
+        stat = self.file_path.stat()
+        content = self.file_path.read_text()
+        # same size and modification time, different content
+        self.file_path.write_text(content.replace("my_bank", "my_bonk"))
+        os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        session, parsed = self._load()
+        assert parsed #noqa: S101
+        assert session.get_statement(STATEMENT.date).account != STATEMENT.account #noqa: S101
+        _, parsed = self._load()
+        assert not parsed #noqa: S101
+
+    def test_cache_hit_without_hash(self) -> None:
+        stat = self.file_path.stat()
+        old_ns = stat.st_mtime_ns - 10 * MTIME_GRANULARITY_NS
+        os.utime(self.file_path, ns=(old_ns, old_ns))
+        self._load()
+        with mock.patch("src.sortfin.cmd.cache.hashlib.sha256", side_effect=AssertionError):
+            _, parsed = self._load()
+        assert not parsed #noqa: S101
+
+    def test_cache_refresh(self) -> None:
+        self._load()
+        cache_path = self.cache_dir / CACHE_FILE_NAME
+        assert _read_cache_header(cache_path)["sha256"] is not None #noqa: S101
+        # later, the modification time of the file can be trusted
+        later_ns = self.file_path.stat().st_mtime_ns + MTIME_GRANULARITY_NS
+        with mock.patch("src.sortfin.cmd.cache.time.time_ns", return_value=later_ns):
+            _, parsed = self._load()
+        assert not parsed #noqa: S101
+        assert _read_cache_header(cache_path)["sha256"] is None #noqa: S101
+
+    def test_cache_unreadable(self) -> None:
+        self._load()
+        cache_path = self.cache_dir / CACHE_FILE_NAME
+        # a cache pickled by a version with other classes
+        cache_path.write_bytes(b"\x80\x04csrc.sortfin.unknown\nClass\n.")
+        assert _read_cache_header(cache_path) is None #noqa: S101
+        _, parsed = self._load()
+        assert parsed #noqa: S101
+
+
+class TestReportCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.tmp_dir.name) / "reports"
+        self.session = Session(ASSET_DB)
+        self.session.data[(STATEMENT.date, Session.DEFAULT_BRANCH)] = STATEMENT.copy()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _show(self, report_cache: ReportCache, path: str = "") -> tuple[str, bool]:
+        with mock.patch.object(
+            self.session, "print_summary", wraps=self.session.print_summary,
+        ) as render_mock:
+            report = show_summary(
+                self.session, STATEMENT.date, Session.DEFAULT_BRANCH,
+                AccountPath(path), report_cache,
+            )
+            return report, render_mock.called
+
+    def test_report_cache_hit(self) -> None:
+        report_cache = ReportCache(self.cache_dir)
+        report, rendered = self._show(report_cache)
+        assert rendered #noqa: S101
+        assert report == self.session.print_summary(STATEMENT.date) #noqa: S101
+        cached_report, rendered = self._show(report_cache)
+        assert not rendered #noqa: S101
+        assert cached_report == report #noqa: S101
+        _, rendered = self._show(report_cache, "europe")
+        assert rendered #noqa: S101
+
+    def test_report_cache_statement_change(self) -> None:
+        report_cache = ReportCache(self.cache_dir)
+        report, _ = self._show(report_cache)
+        self.session.get_statement(STATEMENT.date).change_terminal_account(
+            AccountPath("europe/my_bank"), value=2000,
+        )
+        new_report, rendered = self._show(report_cache)
+        assert rendered #noqa: S101
+        assert new_report != report #noqa: S101
+
+    def test_report_cache_eviction(self) -> None:
+        report_cache = ReportCache(self.cache_dir)
+        for i in range(5):
+            report_cache.put(("command", i), "x" * 100)
+            os.utime(report_cache._get_path(("command", i)), ns=(i, i))  # noqa: SLF001
+        report_cache.get(("command", 0))
+        report_cache.max_size = 250
+        report_cache.evict()
+        assert len(list(self.cache_dir.glob("*" + REPORT_SUFFIX))) == 2 #noqa: S101, PLR2004
+        assert report_cache.get(("command", 0)) is not None #noqa: S101
+        assert report_cache.get(("command", 4)) is not None #noqa: S101
+        assert report_cache.get(("command", 3)) is None #noqa: S101
@@ -0,0 +1,273 @@
+import io
+import json
+import logging
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from src.sortfin.account_path import AccountPath
+from src.sortfin.cli.cli_statement import main
+from src.sortfin.cmd import change_account_value, load_session, save_session
+from src.sortfin.session import Session
+
+LOGGER = logging.getLogger("test_cli")
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cwd = Path.cwd()
+        os.chdir(self.tmp_dir.name)
+        self.run_cli("create", "books", "--initial_date", "2025-01-31")
+        self.file_path = Path(self.tmp_dir.name) / "books.yaml"
+
+    def tearDown(self) -> None:
+        os.chdir(self.cwd)
+        self.tmp_dir.cleanup()
+
+    def run_cli(self, *argv: str, stdin: str = "") -> str:
+        with self.assertLogs(LOGGER, level=logging.INFO) as logs, \
+            mock.patch("sys.argv", ["sortfin-cli", *argv]), \
+            mock.patch("sys.stdin", io.StringIO(stdin)):
+            LOGGER.info("run: %s", " ".join(argv))
+            main(LOGGER)
+        return "\n".join(logs.output)
+
+    def get_value(self, account_path: str) -> float|None:
+        session = load_session(self.file_path)
+        return session.get_account(
+            session.dates(Session.DEFAULT_WORKING_BRANCH)[-1],
+            Session.DEFAULT_WORKING_BRANCH,
+            AccountPath(account_path),
+        ).value
+
+    def test_shell(self) -> None:
+        mtime = self.file_path.stat().st_mtime_ns
+        output = self.run_cli("shell", stdin=(
+            "add-account bank . terminal\n"
+            "change-account-value bank 12\n"
+            "change-account-value unknown 1\n"
+            "print-summary\n"
+        ))
+        assert "no match for unknown in root" in output #noqa: S101
+        assert "Session modified and saved" in output #noqa: S101
+        assert self.file_path.stat().st_mtime_ns != mtime #noqa: S101
+        assert self.get_value("bank") == 12 #noqa: S101
+
+    def test_shell_autosave(self) -> None:
+        output = self.run_cli("shell", "--autosave", "2", stdin=(
+            "add-account bank . terminal\n"
+            "change-account-value bank 12\n"
+            "change-account-value bank 13\n"
+            "exit\n"
+        ))
+        assert output.count("Session modified and saved") == 2 #noqa: S101, PLR2004
+        assert self.get_value("bank") == 13 #noqa: S101, PLR2004
+
+    def test_shell_rollback(self) -> None:
+        self.run_cli("add-account", "bank", ".", "terminal")
+        def _fail_after_change(*args: object) -> tuple[bool, str]:
+            change_account_value(*args)
+            msg = "failed after the change"
+            raise RuntimeError(msg)
+        with mock.patch(
+            "src.sortfin.cli.cli_statement.change_account_value",
+            side_effect=_fail_after_change,
+        ):
+            output = self.run_cli("shell", stdin=(
+                "change-account-value bank 12\n"
+                "add-account cash . terminal\n"
+            ))
+        assert "Changes of `change-account-value` discarded" in output #noqa: S101
+        assert self.get_value("bank") == 0 #noqa: S101
+        # the next commands still run and are saved
+        assert self.get_value("cash") == 0 #noqa: S101
+
+    def test_shell_save_error(self) -> None:
+        self.run_cli("add-account", "bank", ".", "terminal")
+        with mock.patch(
+            "src.sortfin.cli.cli_statement.save_session",
+            side_effect=[OSError("disk full"), None],
+        ) as save_mock:
+            output = self.run_cli("shell", stdin=(
+                "change-account-value bank 12\n"
+                "save\n"
+                "exit\n"
+            ))
+        assert "OSError: disk full" in output #noqa: S101
+        assert save_mock.call_count == 2 #noqa: S101, PLR2004
+
+    def test_shell_exit_save_error(self) -> None:
+        self.run_cli("add-account", "bank", ".", "terminal")
+        with self.assertLogs(LOGGER, level=logging.ERROR) as logs, \
+            mock.patch("sys.argv", ["sortfin-cli", "shell"]), \
+            mock.patch("sys.stdin", io.StringIO("change-account-value bank 12\nexit\n")), \
+            mock.patch(
+                "src.sortfin.cli.cli_statement.save_session",
+                side_effect=OSError("disk full"),
+            ), \
+            self.assertRaises(SystemExit) as exit_context:
+            main(LOGGER)
+        assert exit_context.exception.code == 1 #noqa: S101
+        output = "\n".join(logs.output)
+        assert "Shell not exited" in output #noqa: S101
+        assert "the changes not saved are lost" in output #noqa: S101
+        assert self.get_value("bank") == 0 #noqa: S101
+
+    def test_run(self) -> None:
+        script = Path(self.tmp_dir.name) / "commands.txt"
+        script.write_text(
+            "# nightly update\n"
+            "add-account bank . terminal\n"
+            "change-account-value bank 12\n"
+            "change-account-value bank 14\n",
+        )
+        output = self.run_cli("run", str(script))
+        assert output.count("Session modified and saved") == 1 #noqa: S101
+        assert self.get_value("bank") == 14 #noqa: S101, PLR2004
+
+    def test_run_stdin_error(self) -> None:
+        mtime = self.file_path.stat().st_mtime_ns
+        with self.assertRaises(SystemExit):
+            self.run_cli("run", stdin=(
+                "add-account bank . terminal\n"
+                "change-account-value unknown 1\n"
+                "change-account-value bank 14\n"
+            ))
+        assert self.file_path.stat().st_mtime_ns == mtime #noqa: S101
+
+    def test_run_invalid_script(self) -> None:
+        with self.assertRaises(SystemExit):
+            self.run_cli("run", stdin="add-account bank . terminal\nchange-session other\n")
+        with self.assertRaises(SystemExit):
+            self.run_cli("run", stdin="change-account-value bank not_a_float\n")
+
+    def test_show_dates_from_header(self) -> None:
+        with mock.patch(
+            "src.sortfin.cli.cli_statement.load_session_with_cache",
+            side_effect=AssertionError("session loaded"),
+        ):
+            output = self.run_cli("show-dates")
+            assert "2025-01-31" in output #noqa: S101
+            output = self.run_cli("show-branches")
+            assert Session.DEFAULT_WORKING_BRANCH in output #noqa: S101
+
+    def test_report_cache(self) -> None:
+        self.run_cli("add-account", "bank", ".", "terminal")
+        self.run_cli("change-account-value", "bank", "12")
+        reports_dir = Path(self.tmp_dir.name) / ".sortfin" / "reports"
+        output = self.run_cli("print-summary")
+        assert "$ 12" in output #noqa: S101
+        assert len(list(reports_dir.iterdir())) == 1 #noqa: S101
+        with mock.patch(
+            "src.sortfin.session.Session.print_summary",
+            side_effect=AssertionError("summary rendered"),
+        ):
+            assert self.run_cli("print-summary") == output #noqa: S101
+        self.run_cli("change-account-value", "bank", "13")
+        assert "$ 13" in self.run_cli("print-summary") #noqa: S101
+        self.run_cli("--no-cache", "print-structure")
+        assert len(list(reports_dir.iterdir())) == 2 #noqa: S101, PLR2004
+
+    def test_import_values(self) -> None:
+        self.run_cli("add-account", "bank", ".", "terminal")
+        csv_path = Path(self.tmp_dir.name) / "values.csv"
+        csv_path.write_text(
+            "date,branch,account_path,value\n"
+            f"2025-01-31,{Session.DEFAULT_WORKING_BRANCH},bank,42\n",
+        )
+        output = self.run_cli("import-values", str(csv_path))
+        assert "rows/s" in output #noqa: S101
+        assert self.get_value("bank") == 42 #noqa: S101, PLR2004
+
+    def test_shell_conflict(self) -> None:
+        self.run_cli("add-account", "bank", ".", "terminal")
+        def _concurrent_save(prompt: str) -> str:
+            line = next(lines)
+            if line == "save" and not conflicts:
+                # another process saves the session in the meantime
+                session = load_session(self.file_path)
+                session.get_account(
+                    session.dates(Session.DEFAULT_WORKING_BRANCH)[-1],
+                    Session.DEFAULT_WORKING_BRANCH,
+                    AccountPath("bank"),
+                ).value = 7
+                save_session(session, self.file_path)
+                conflicts.append(line)
+            return line
+        conflicts = []
+        lines = iter([
+            "change-account-value bank 12", "save",
+            "reload", "change-account-value bank 13", "save", "exit",
+        ])
+        with mock.patch("builtins.input", _concurrent_save):
+            output = self.run_cli("shell")
+        assert "was modified since it was loaded" in output #noqa: S101
+        assert self.get_value("bank") == 13 #noqa: S101, PLR2004
+
+    def test_profile(self) -> None:
+        self.run_cli("add-account", "bank", ".", "terminal")
+        profile_path = Path(self.tmp_dir.name) / "profile.json"
+        output = self.run_cli(
+            "--no-cache", "--profile", "--profile-json", str(profile_path),
+            "change-account-value", "bank", "12",
+        )
+        assert "peak memory (tracemalloc)" in output #noqa: S101
+        profile = json.loads(profile_path.read_text())
+        for name in ["load.parse", "load.build", "save.encode", "save.write", "other"]:
+            assert profile["phases"][name]["calls"] == 1 #noqa: S101
+        assert profile["peak_memory"] > 0 #noqa: S101
+        assert sum(p["time"] for p in profile["phases"].values()) == \
+            pytest.approx(profile["total_time"]) #noqa: S101
+
+    def test_counters(self) -> None:
+        self.run_cli("add-account", "bank", ".", "terminal")
+        self.run_cli("change-account-value", "bank", "12")
+        counters_path = Path(self.tmp_dir.name) / "counters.json"
+        output = self.run_cli(
+            "--no-cache", "--counters", "--counters-json", str(counters_path),
+            "print-summary",
+        )
+        assert "valuation.calls" in output #noqa: S101
+        counts = json.loads(counters_path.read_text())
+        assert counts["valuation.calls"] == 1 #noqa: S101
+        assert counts["fx.rate_table.misses"] >= 1 #noqa: S101
+
+    def test_mem_report(self) -> None:
+        self.run_cli("add-account", "bank", ".", "terminal")
+        report_path = Path(self.tmp_dir.name) / "memory.json"
+        output = self.run_cli(
+            "mem-report", "--no-trace", "--period", "year", "--json", str(report_path),
+        )
+        assert "accounts" in output #noqa: S101
+        report = json.loads(report_path.read_text())
+        assert report["traced"] is None #noqa: S101
+        assert {group["period"] for group in report["groups"]} == {"2025"} #noqa: S101
+
+    def test_convert_session(self) -> None:
+        self.run_cli("add-account", "bank", ".", "terminal")
+        self.run_cli("change-account-value", "bank", "12")
+        self.run_cli("convert-session", "books", "json")
+        assert not self.file_path.exists() #noqa: S101
+        self.file_path = self.file_path.with_suffix(".json")
+        assert "2025-01-31" in self.run_cli("show-dates") #noqa: S101
+        self.run_cli("change-account-value", "bank", "13")
+        assert self.get_value("bank") == 13 #noqa: S101, PLR2004
+
+    def test_several_session_files(self) -> None:
+        self.run_cli("add-account", "bank", ".", "terminal")
+        save_session(load_session(self.file_path), self.file_path.with_suffix(".json"))
+        with self.assertLogs(LOGGER, level=logging.ERROR) as logs, \
+            mock.patch("sys.argv", ["sortfin-cli", "show-dates"]), \
+            self.assertRaises(SystemExit):
+            main(LOGGER)
+        assert "several files found for session books" in logs.output[0] #noqa: S101
+
+    def test_option_value_named_as_command(self) -> None:
+        output = self.run_cli("--profile-no-memory", "--profile-json", "diff", "show-dates")
+        assert "2025-01-31" in output #noqa: S101
+        assert "total_time" in (Path(self.tmp_dir.name) / "diff").read_text() #noqa: S101
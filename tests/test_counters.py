@@ -0,0 +1,45 @@
+import unittest
+
+from src.sortfin import AccountPath
+from src.sortfin.counters import COUNTERS
+
+from .test_asset import EUR, GBP
+from .test_assetdb import ASSET_DB
+from .test_statement import STATEMENT
+
+
+class TestCounters(unittest.TestCase):
+    def setUp(self) -> None:
+        COUNTERS.reset()
+
+    def tearDown(self) -> None:
+        COUNTERS.disable()
+        COUNTERS.reset()
+
+    def test_disabled(self) -> None:
+        statement = STATEMENT.copy()
+        statement.fx_market.get_quote(ASSET_DB, GBP.name, EUR.name)
+        assert COUNTERS.snapshot() == {} #noqa: S101
+
+    def test_counts(self) -> None:
+        with COUNTERS.recording():
+            statement = STATEMENT.copy()
+            statement.fx_market.get_quote(ASSET_DB, GBP.name, EUR.name)
+            statement.fx_market.get_quote(ASSET_DB, GBP.name, EUR.name)
+            statement.get_account(AccountPath("usa/my_bank"))
+            statement.account.get_account_price(
+                ASSET_DB, statement.fx_market, unit=EUR.name,
+            )
+        assert not COUNTERS.enabled #noqa: S101
+        counts = COUNTERS.snapshot()
+        assert counts["statement.copies"] == 1 #noqa: S101
+        assert counts["account.copies"] == 7 #noqa: S101, PLR2004
+        assert counts["fx.rate_table.misses"] == 1 #noqa: S101
+        assert counts["fx.rate_table.hits"] == 2 #noqa: S101, PLR2004
+        assert counts["fx.rate_table.nodes"] == 4 #noqa: S101, PLR2004
+        # the statement resolves paths with its index, the valued account is the root
+        assert counts["statement.path_index.builds"] == 1 #noqa: S101
+        assert counts["account.get_account.calls"] == 1 #noqa: S101
+        assert counts["account.get_account.nodes"] == 1 #noqa: S101
+        assert counts["valuation.calls"] == 1 #noqa: S101
+        assert counts["valuation.nodes"] == 7 #noqa: S101, PLR2004
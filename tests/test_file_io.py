@@ -0,0 +1,173 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from src.sortfin.cmd import (
+    SessionConflictError,
+    convert_session,
+    load_session,
+    load_session_header,
+    save_session,
+    save_session_to_json,
+    save_session_to_yaml,
+)
+from src.sortfin.file_io import (
+    BackgroundTask,
+    FileLock,
+    LockTimeoutError,
+    atomic_open,
+    get_lock_path,
+)
+from src.sortfin.session import Session
+from src.sortfin.session_index import save_indexed_session
+
+from .test_assetdb import ASSET_DB
+from .test_statement import STATEMENT
+
+
+class TestFileIO(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dir_path = Path(self.tmp_dir.name)
+        self.file_path = self.dir_path / "file.txt"
+        self.file_path.write_text("old content")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_atomic_open(self) -> None:
+        with atomic_open(self.file_path) as file:
+            file.write("new content")
+            assert self.file_path.read_text() == "old content" #noqa: S101
+        assert self.file_path.read_text() == "new content" #noqa: S101
+        assert list(self.dir_path.iterdir()) == [self.file_path] #noqa: S101
+
+    def test_atomic_open_failure(self) -> None:
+        with pytest.raises(KeyboardInterrupt), atomic_open(self.file_path) as file:
+            file.write("partial")
+            raise KeyboardInterrupt
+        assert self.file_path.read_text() == "old content" #noqa: S101
+        assert list(self.dir_path.iterdir()) == [self.file_path] #noqa: S101
+
+    def test_atomic_open_new_file_mode(self) -> None:
+        umask = os.umask(0)
+        os.umask(umask)
+        new_path = self.dir_path / "new.txt"
+        with atomic_open(new_path) as file:
+            file.write("content")
+        assert new_path.stat().st_mode & 0o777 == 0o666 & ~umask #noqa: S101
+
+    def test_background_task(self) -> None:
+        def _fail() -> None:
+            msg = "save failed"
+            raise OSError(msg)
+        task = BackgroundTask(_fail)
+        with pytest.raises(OSError, match="save failed"):
+            task.wait()
+        assert task.done #noqa: S101
+
+    def test_background_save(self) -> None:
+        session = Session(ASSET_DB)
+        session.data[(STATEMENT.date, Session.DEFAULT_BRANCH)] = STATEMENT.copy()
+        session_path = self.dir_path / "session.yaml"
+        task = save_session(session, session_path, background=True)
+        assert task is not None #noqa: S101
+        task.wait()
+        reloaded = load_session(session_path)
+        assert reloaded.keys() == session.keys() #noqa: S101
+        assert reloaded.get_statement(STATEMENT.date).account == STATEMENT.account #noqa: S101
+
+    def test_compressed_session(self) -> None:
+        session = Session(ASSET_DB)
+        session.data[(STATEMENT.date, Session.DEFAULT_BRANCH)] = STATEMENT.copy()
+        for suffix, magic in ((".yaml.gz", b"\x1f\x8b"), (".yaml.xz", b"\xfd7zXZ")):
+            session_path = self.dir_path / ("session" + suffix)
+            save_session(session, session_path)
+            assert session_path.read_bytes().startswith(magic) #noqa: S101
+            reloaded = load_session(session_path)
+            assert reloaded.keys() == session.keys() #noqa: S101
+            assert reloaded.get_statement( #noqa: S101
+                STATEMENT.date,
+            ).account == STATEMENT.account
+
+    def test_convert_session(self) -> None:
+        session = Session(ASSET_DB)
+        session.data[(STATEMENT.date, Session.DEFAULT_BRANCH)] = STATEMENT.copy()
+        yaml_path = self.dir_path / "session.yaml"
+        json_path = self.dir_path / "session.json"
+        back_path = self.dir_path / "back.yaml"
+        save_session(session, yaml_path)
+        convert_session(yaml_path, json_path)
+        convert_session(json_path, back_path)
+        for file_path in (json_path, back_path):
+            reloaded = load_session(file_path)
+            assert reloaded.keys() == session.keys() #noqa: S101
+            assert reloaded.asset_db.assets == ASSET_DB.assets #noqa: S101
+            assert reloaded.get_statement( #noqa: S101
+                STATEMENT.date,
+            ).account == STATEMENT.account
+        with pytest.raises(ValueError, match="file already exists"):
+            convert_session(yaml_path, json_path)
+
+    def test_file_lock(self) -> None:
+        lock_path = get_lock_path(self.file_path)
+        with FileLock(lock_path) as lock:
+            assert lock.is_locked #noqa: S101
+            with pytest.raises(LockTimeoutError):
+                FileLock(lock_path, timeout=0.1).acquire()
+        with FileLock(lock_path, timeout=0.1) as lock:
+            assert lock.is_locked #noqa: S101
+        assert self.file_path.read_text() == "old content" #noqa: S101
+
+    def test_session_revision(self) -> None:
+        session = Session(ASSET_DB)
+        session.data[(STATEMENT.date, Session.DEFAULT_BRANCH)] = STATEMENT.copy()
+        file_path = self.dir_path / "session.yaml"
+        save_session(session, file_path)
+        assert load_session_header(file_path).revision == 1 #noqa: S101
+        session1 = load_session(file_path)
+        session2 = load_session(file_path)
+        assert session1.revision == session2.revision == 1 #noqa: S101
+        save_session(session1, file_path, check_revision=True)
+        assert load_session_header(file_path).revision == 2 #noqa: S101, PLR2004
+        with pytest.raises(SessionConflictError):
+            save_session(session2, file_path, check_revision=True)
+        assert load_session_header(file_path).revision == 2 #noqa: S101, PLR2004
+        save_session(session1, file_path, check_revision=True)
+        assert load_session(file_path).revision == 3 #noqa: S101, PLR2004
+
+    def test_session_revision_helpers(self) -> None:
+        session = Session(ASSET_DB)
+        session.data[(STATEMENT.date, Session.DEFAULT_BRANCH)] = STATEMENT.copy()
+        for save, suffix in [
+            (save_session_to_yaml, ".yaml"),
+            (save_session_to_json, ".json"),
+            (save_indexed_session, ".sfdb"),
+        ]:
+            file_path = self.dir_path / f"session{suffix}"
+            save_session(session, file_path)
+            save(session, file_path)
+            assert load_session_header(file_path).revision == session.revision #noqa: S101
+            save_session(session, file_path, check_revision=True)
+
+    def test_session_revision_failed_write(self) -> None:
+        session = Session(ASSET_DB)
+        session.data[(STATEMENT.date, Session.DEFAULT_BRANCH)] = STATEMENT.copy()
+        file_path = self.dir_path / "session.yaml"
+        save_session(session, file_path)
+        for background in [False, True]:
+            with mock.patch(
+                "src.sortfin.cmd.main._write_session_list",
+                side_effect=OSError("disk full"),
+            ), pytest.raises(OSError, match="disk full"):
+                task = save_session(session, file_path, background=background)
+                if task is not None:
+                    task.wait()
+            assert session.revision == 1 #noqa: S101
+        task = save_session(session, file_path, check_revision=True, background=True)
+        task.wait()
+        assert session.revision == load_session_header(file_path).revision == 2 #noqa: S101, PLR2004
@@ -24,3 +24,33 @@ class TestFXMarket(unittest.TestCase):
         assert abs(FXM.get_quote(ASSET_DB, EUR.name, JPY.name) - 1.05 / 1.5 * 200) < TOLERANCE #noqa: S101, E501
 
 
+
+    def test_modify_quote(self) -> None:
+        fxm = FXM.copy()
+        assert abs(fxm.get_quote(ASSET_DB, GBP.name, EUR.name) - 1.5 / 1.05) < TOLERANCE #noqa: S101
+        assert fxm.modify_quote(USD.name, EUR.name, 0.5)[0] #noqa: S101
+        assert set(fxm.quotes) == set(FXM.quotes) #noqa: S101
+        assert fxm.get_quote(ASSET_DB, EUR.name, USD.name) == 2 #noqa: S101, PLR2004
+        assert abs(fxm.get_quote(ASSET_DB, GBP.name, EUR.name) - 1.5 / 2) < TOLERANCE #noqa: S101
+
+    def test_modify_quotes(self) -> None:
+        fxm = FXM.copy()
+        assert not fxm.modify_quotes({(EUR.name, USD.name): 1.1, (EUR.name, JPY.name): 1})[0] #noqa: S101
+        assert fxm.quotes == FXM.quotes #noqa: S101
+        assert fxm.modify_quotes({(EUR.name, USD.name): 1.1, (USD.name, GBP.name): 0.5})[0] #noqa: S101
+        assert fxm.quotes[(EUR.name, USD.name)] == 1.1 #noqa: S101, PLR2004
+        assert fxm.quotes[(GBP.name, USD.name)] == 2 #noqa: S101, PLR2004
+
+    def test_rate_table(self) -> None:
+        fxm = FXM.copy()
+        rates = fxm.get_rate_table(ASSET_DB, EUR.name)
+        assert len(rates) == len(ASSET_DB.names) #noqa: S101
+        for name, code in ASSET_DB.codes.items():
+            assert rates[code] == fxm._get_quote(name, EUR.name) #noqa: S101, SLF001
+        assert fxm.get_rate_table(ASSET_DB, EUR.name) is rates #noqa: S101
+        fxm.modify_quote(EUR.name, USD.name, 2)
+        rates = fxm.get_rate_table(ASSET_DB, EUR.name)
+        assert rates[ASSET_DB.codes[USD.name]] == 0.5 #noqa: S101, PLR2004
+        fxm_2 = FxMarket()
+        fxm_2.add_quote(ASSET_DB, EUR.name, USD.name, 1.05)
+        assert fxm_2.get_rate_table(ASSET_DB, USD.name)[ASSET_DB.codes[JPY.name]] is None #noqa: S101
@@ -0,0 +1,99 @@
+import datetime as dt
+import unittest
+
+import pytest
+
+from src.sortfin.account_path import AccountPath
+from src.sortfin.cmd import import_fx, import_values
+from src.sortfin.session import Session
+
+from .test_assetdb import ASSET_DB
+from .test_statement import STATEMENT
+
+
+class TestImportValues(unittest.TestCase):
+    def setUp(self) -> None:
+        self.session = Session(ASSET_DB.copy())
+        self.dates = [
+            dt.datetime(2025, m, 28, 23, 59, 59, 999999, tzinfo=dt.timezone.utc)
+            for m in (1, 2, 3)
+        ]
+        for date in self.dates:
+            self.session.data[(date, Session.DEFAULT_BRANCH)] = STATEMENT.copy(date)
+
+    def get_value(self, date: dt.datetime, account_path: str) -> float|None:
+        return self.session.get_account(date, folder_path=AccountPath(account_path)).value
+
+    def test_import_values(self) -> None:
+        modified, msg = import_values(self.session, [
+            ["date", "branch", "account_path", "value", "unit"],
+            ["2025-01-28", Session.DEFAULT_BRANCH, "europe/my_bank", "1500"],
+            ["2025-02-28", Session.DEFAULT_BRANCH, "Europe/My_Bank", "1600", ""],
+            ["2025-02-28", Session.DEFAULT_BRANCH, "usa/my_bank", "300", "GBP"],
+        ])
+        assert modified #noqa: S101
+        assert "3 values into 2 statements" in msg #noqa: S101
+        assert self.get_value(self.dates[0], "europe/my_bank") == 1500 #noqa: S101, PLR2004
+        assert self.get_value(self.dates[1], "europe/my_bank") == 1600 #noqa: S101, PLR2004
+        assert self.get_value(self.dates[2], "europe/my_bank") == 1000 #noqa: S101, PLR2004
+        account = self.session.get_account(self.dates[1], folder_path=AccountPath("usa/my_bank"))
+        assert (account.value, account.unit) == (300, "GBP") #noqa: S101
+
+    def test_import_values_error(self) -> None:
+        for rows in [
+            [["2025-01-28", Session.DEFAULT_BRANCH, "europe/unknown", "1"]],
+            [["2025-01-28", Session.DEFAULT_BRANCH, "europe", "1"]],
+            [["2025-01-28", Session.DEFAULT_BRANCH, "europe/my_bank", "x"]],
+            [["2025-01-28", Session.DEFAULT_BRANCH, "europe/my_bank", "1", "XXX"]],
+            [["2025-01-15", Session.DEFAULT_BRANCH, "europe/my_bank", "1"]],
+        ]:
+            with pytest.raises(ValueError):  # noqa: PT011
+                import_values(self.session, [
+                    ["2025-02-28", Session.DEFAULT_BRANCH, "europe/my_bank", "1500"],
+                    *rows,
+                ])
+            # nothing applied, even the valid rows
+            assert self.get_value(self.dates[1], "europe/my_bank") == 1000 #noqa: S101, PLR2004
+
+
+class TestImportFx(unittest.TestCase):
+    def setUp(self) -> None:
+        self.session = Session(ASSET_DB.copy())
+        self.dates = [
+            dt.datetime(2025, m, 1, tzinfo=dt.timezone.utc) for m in (1, 2, 3)
+        ]
+        for date in self.dates:
+            self.session.data[(date, Session.DEFAULT_BRANCH)] = STATEMENT.copy(date)
+
+    def get_quote(self, date: dt.datetime, asset1: str, asset2: str) -> float|None:
+        return self.session.get_fxmarket(date).get_quote(self.session.asset_db, asset1, asset2)
+
+    def test_import_fx(self) -> None:
+        # cached derived quote, invalidated by the import
+        assert abs(self.get_quote(self.dates[1], "GBP", "EUR") - 1.5 / 1.05) < 1e-9 #noqa: S101, PLR2004
+        modified, msg = import_fx(self.session, [
+            ["date", "pair", "rate"],
+            ["2025-01-01", "EUR/USD", "1.1"],
+            ["2025-02-10", "EUR/USD", "1.3"],
+            ["2025-02-03", "EUR/USD", "1.2"],
+            ["2025-02-03", "USD/GBP", "0.5"],
+            ["2025-03-15", "EUR/USD", "1.4"],
+        ])
+        assert modified #noqa: S101
+        assert "5 quotes into 3 statements" in msg #noqa: S101
+        assert self.get_quote(self.dates[0], "EUR", "USD") == 1.1 #noqa: S101, PLR2004
+        assert self.get_quote(self.dates[1], "EUR", "USD") == 1.3 #noqa: S101, PLR2004
+        assert self.get_quote(self.dates[1], "GBP", "USD") == 2 #noqa: S101, PLR2004
+        assert abs(self.get_quote(self.dates[1], "GBP", "EUR") - 2 / 1.3) < 1e-9 #noqa: S101, PLR2004
+        assert self.get_quote(self.dates[2], "EUR", "USD") == 1.4 #noqa: S101, PLR2004
+
+    def test_import_fx_error(self) -> None:
+        for rows in [
+            [["2024-12-31", "EUR/USD", "1.2"]],
+            [["2025-02-01", "EUR/JPY", "150"]],
+            [["2025-02-01", "EUR/USD", "-1"]],
+            [["2025-02-01", "EURUSD", "1.2"]],
+        ]:
+            with pytest.raises(ValueError):  # noqa: PT011
+                import_fx(self.session, [["2025-02-01", "EUR/USD", "1.2"], *rows])
+            assert self.get_quote(self.dates[1], "EUR", "USD") == 1.05 #noqa: S101, PLR2004
@@ -0,0 +1,58 @@
+import datetime as dt
+import tempfile
+import unittest
+from pathlib import Path
+
+import pytest
+
+from src.sortfin.cmd import get_memory_report, get_session_memory, save_session
+from src.sortfin.session import Session
+
+from .test_assetdb import ASSET_DB
+from .test_statement import STATEMENT
+
+# 7 accounts and the sub_accounts lists of the 3 folders
+N_ACCOUNT_OBJECTS = 10
+
+
+class TestMemoryReport(unittest.TestCase):
+    def setUp(self) -> None:
+        self.session = Session(ASSET_DB)
+        for days in [0, 1, 40]:
+            date = STATEMENT.date + dt.timedelta(days=days)
+            self.session.data[(date, Session.DEFAULT_BRANCH)] = STATEMENT.copy(date)
+        self.session.data[(STATEMENT.date, Session.DEFAULT_WORKING_BRANCH)] = STATEMENT.copy()
+
+    def test_session_memory(self) -> None:
+        report = get_session_memory(self.session, period="month")
+        assert list(report.groups) == [ #noqa: S101
+            (Session.DEFAULT_BRANCH, "2025-01"),
+            (Session.DEFAULT_BRANCH, "2025-02"),
+            (Session.DEFAULT_WORKING_BRANCH, "2025-01"),
+        ]
+        assert report.n_statements[(Session.DEFAULT_BRANCH, "2025-01")] == 2 #noqa: S101, PLR2004
+        components = report.groups[(Session.DEFAULT_BRANCH, "2025-01")]
+        assert components["accounts"][0] == 2 * N_ACCOUNT_OBJECTS #noqa: S101
+        # statements and their keys
+        assert components["statements"][0] == 4 #noqa: S101, PLR2004
+        report = get_session_memory(
+            self.session,
+            branches=[Session.DEFAULT_BRANCH],
+            date_to=STATEMENT.date + dt.timedelta(days=1),
+        )
+        assert list(report.groups) == [(Session.DEFAULT_BRANCH, "all")] #noqa: S101
+        assert report.n_statements[(Session.DEFAULT_BRANCH, "all")] == 2 #noqa: S101, PLR2004
+        with pytest.raises(ValueError, match="unknown period"):
+            get_session_memory(self.session, period="week")
+
+    def test_memory_report(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir) / "session.json"
+            save_session(self.session, file_path)
+            report = get_memory_report(file_path)
+        assert report.traced is not None #noqa: S101
+        assert report.traced["raw_list"] > 0 #noqa: S101
+        assert report.traced["session"] > 0 #noqa: S101
+        assert len(report.top_allocations) > 0 #noqa: S101
+        assert sum(report.n_statements.values()) == len(self.session.data) #noqa: S101
+        assert "accounts" in report.format_table() #noqa: S101
@@ -0,0 +1,48 @@
+import time
+import tracemalloc
+import unittest
+
+import pytest
+
+from src.sortfin.profiling import OTHER_PHASE, Profiler, get_profiler, phase
+
+
+class TestProfiling(unittest.TestCase):
+    def test_phases(self) -> None:
+        with phase("outside"):
+            pass
+        with Profiler(trace_memory=False) as profiler:
+            assert get_profiler() is profiler #noqa: S101
+            start = time.perf_counter()
+            with phase("render"):
+                with phase("fx"):
+                    time.sleep(0.01)
+            render_time = time.perf_counter() - start
+            with phase("fx"):
+                pass
+        assert get_profiler() is None #noqa: S101
+        assert set(profiler.phases) == {"render", "fx", OTHER_PHASE} #noqa: S101
+        # nested phases are not counted in the outer one
+        assert profiler.phases["render"][0] < render_time - 0.01 #noqa: S101
+        assert profiler.phases["fx"][1] == 2 #noqa: S101, PLR2004
+        assert sum(t for t, _ in profiler.phases.values()) == \
+            pytest.approx(profiler.total_time) #noqa: S101
+        assert profiler.peak_memory is None #noqa: S101
+
+    def test_single_profiler(self) -> None:
+        with Profiler(trace_memory=False), pytest.raises(ValueError, match="already running"):
+            Profiler(trace_memory=False).start()
+
+    def test_tracing_started_before(self) -> None:
+        with Profiler() as profiler:
+            pass
+        assert profiler.peak_memory is not None #noqa: S101
+        assert not tracemalloc.is_tracing() #noqa: S101
+        tracemalloc.start()
+        try:
+            with Profiler() as profiler:
+                pass
+            assert tracemalloc.is_tracing() #noqa: S101
+            assert profiler.peak_memory is None #noqa: S101
+        finally:
+            tracemalloc.stop()
@@ -0,0 +1,86 @@
+import datetime as dt
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+from src.sortfin.account import Account
+from src.sortfin.cmd import (
+    SESSION_FORMATS,
+    load_session,
+    load_session_header,
+    save_session,
+)
+from src.sortfin.file_io import open_text
+from src.sortfin.session import Session
+from src.sortfin.to_yaml import from_session_to_list
+
+from .test_assetdb import ASSET_DB
+from .test_statement import STATEMENT
+
+
+def _count_accounts(account: Account) -> int:
+    if account.sub_accounts is None:
+        return 1
+    return 1 + sum(_count_accounts(sa) for sa in account.sub_accounts)
+
+
+class TestSessionHeader(unittest.TestCase):
+    def setUp(self) -> None:
+        self.session = Session(ASSET_DB)
+        self.session.data[(STATEMENT.date, Session.DEFAULT_BRANCH)] = STATEMENT.copy()
+        self.dates = [STATEMENT.date + dt.timedelta(days=i) for i in range(3)]
+        for date in self.dates[1:]:
+            self.session.copy_statement(STATEMENT.date, date)
+        self.session.copy_statement(
+            self.dates[-1], self.dates[-1],
+            branch_paste=Session.DEFAULT_WORKING_BRANCH,
+        )
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dir_path = Path(self.tmp_dir.name)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_header(self) -> None:
+        n_accounts = _count_accounts(STATEMENT.account)
+        for session_format, suffix in SESSION_FORMATS.items():
+            file_path = self.dir_path / f"session{suffix}"
+            save_session(self.session, file_path)
+            header = load_session_header(file_path)
+            assert header is not None, session_format #noqa: S101
+            assert header.keys() == self.session.keys() #noqa: S101
+            assert header.dates() == self.dates #noqa: S101
+            assert header.branches() == self.session.branches() #noqa: S101
+            assert len(header.assets) == len(list(ASSET_DB)) #noqa: S101
+            assert set(header.statements.values()) == {n_accounts} #noqa: S101
+            assert load_session(file_path).keys() == self.session.keys() #noqa: S101
+
+    def test_no_header(self) -> None:
+        # files written before headers were introduced
+        file_path = self.dir_path / "session.json"
+        file_path.write_text(json.dumps(from_session_to_list(self.session)))
+        assert load_session_header(file_path) is None #noqa: S101
+        assert load_session(file_path).keys() == self.session.keys() #noqa: S101
+
+    def test_no_yaml_header(self) -> None:
+        for suffix in [".yaml", ".yaml.gz", ".yaml.xz"]:
+            file_path = self.dir_path / f"session{suffix}"
+            with open_text(file_path, "w") as file:
+                yaml.safe_dump(from_session_to_list(self.session), file)
+            assert load_session_header(file_path) is None #noqa: S101
+            assert load_session(file_path).keys() == self.session.keys() #noqa: S101
+
+    def test_json_object(self) -> None:
+        file_path = self.dir_path / "session.json"
+        save_session(self.session, file_path)
+        session_data = json.loads(file_path.read_text())
+        assert session_data["sortfin"]["revision"] == 1 #noqa: S101
+        assert session_data["session"] == \
+            json.loads(json.dumps(from_session_to_list(self.session))) #noqa: S101
+        # reformatted files are still read
+        file_path.write_text(json.dumps(session_data, indent=2))
+        assert load_session_header(file_path).revision == 1 #noqa: S101
+        assert load_session(file_path).keys() == self.session.keys() #noqa: S101
@@ -0,0 +1,91 @@
+import datetime as dt
+import tempfile
+import unittest
+from pathlib import Path
+
+import pytest
+
+from src.sortfin.account_path import AccountPath
+from src.sortfin.cmd import load_session, save_session
+from src.sortfin.session import Session
+from src.sortfin.session_index import (
+    LazyStatements,
+    SessionIndexError,
+    get_index_path,
+    load_session_index,
+)
+
+from .test_assetdb import ASSET_DB
+from .test_statement import STATEMENT
+
+
+class TestSessionIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.session = Session(ASSET_DB)
+        self.session.data[(STATEMENT.date, Session.DEFAULT_BRANCH)] = STATEMENT.copy()
+        self.dates = [STATEMENT.date + dt.timedelta(days=i) for i in range(5)]
+        for date in self.dates[1:]:
+            self.session.copy_statement(STATEMENT.date, date)
+        self.session.copy_statement(
+            self.dates[-1], self.dates[-1],
+            branch_paste=Session.DEFAULT_WORKING_BRANCH,
+        )
+        self.session.get_account(
+            self.dates[2], folder_path=AccountPath("europe/my_bank"),
+        ).value = 2000
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = Path(self.tmp_dir.name) / "session.sfdb"
+        save_session(self.session, self.file_path)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_index_only(self) -> None:
+        index = load_session_index(self.file_path)
+        assert index.keys() == self.session.keys() #noqa: S101
+        assert index.dates() == self.dates #noqa: S101
+        assert index.branches() == self.session.branches() #noqa: S101
+
+        session = load_session(self.file_path)
+        assert isinstance(session.data, LazyStatements) #noqa: S101
+        assert session.dates() == self.dates #noqa: S101
+        assert session.branches() == self.session.branches() #noqa: S101
+        assert session.data.loaded_keys == [] #noqa: S101
+
+    def test_get_statement(self) -> None:
+        session = load_session(self.file_path)
+        statement = session.get_statement(self.dates[2])
+        assert session.data.loaded_keys == [ #noqa: S101
+            (self.dates[2], Session.DEFAULT_BRANCH),
+        ]
+        ref = self.session.get_statement(self.dates[2])
+        assert statement.date == ref.date #noqa: S101
+        assert statement.account == ref.account #noqa: S101
+        assert statement.fx_market == ref.fx_market #noqa: S101
+
+    def test_save_lazy_session(self) -> None:
+        session = load_session(self.file_path)
+        session.copy_statement(self.dates[2], self.dates[-1] + dt.timedelta(days=1))
+        save_session(session, self.file_path)
+        reloaded = load_session(self.file_path)
+        assert reloaded.keys() == session.keys() #noqa: S101
+        assert reloaded.get_statement( #noqa: S101
+            self.dates[-1] + dt.timedelta(days=1),
+        ).account == self.session.get_statement(self.dates[2]).account
+
+    def test_stale_index(self) -> None:
+        session = load_session(self.file_path)
+        with self.file_path.open("ab") as file:
+            file.write(b"\n")
+        with pytest.raises(SessionIndexError):
+            session.get_statement(self.dates[0])
+        assert get_index_path(self.file_path).exists() #noqa: S101
+
+    def test_rewritten_same_size(self) -> None:
+        session = load_session(self.file_path)
+        size = self.file_path.stat().st_size
+        # another process saves the same session: same size, other data file
+        save_session(load_session(self.file_path), self.file_path)
+        assert self.file_path.stat().st_size == size #noqa: S101
+        with pytest.raises(SessionIndexError):
+            session.get_statement(self.dates[0])
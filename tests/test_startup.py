@@ -0,0 +1,61 @@
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).parent.parent
+CLI_MODULE = "src.sortfin.cli.cli_statement"
+
+# generous budget: the CLI typically starts in a few tens of milliseconds
+STARTUP_BUDGET_S = 0.5
+
+STARTUP_CODE = f"""
+import json, sys, time
+start = time.perf_counter()
+from {CLI_MODULE} import build_parser, get_command
+argv = ["show-branches"]
+build_parser(get_command(argv)).parse_args(argv)
+print(json.dumps({{
+    "elapsed": time.perf_counter() - start,
+    "yaml": "yaml" in sys.modules,
+}}))
+"""
+
+
+def _parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """Get the (self, cumulative) import times in us of each module."""
+    res = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        res[name.strip()] = (int(self_us), int(cumulative_us))
+    return res
+
+
+class TestStartup(unittest.TestCase):
+    def test_show_branches_startup(self) -> None:
+        process = subprocess.run(  # noqa: S603
+            [sys.executable, "-X", "importtime", "-c", STARTUP_CODE],
+            cwd=ROOT_PATH,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result = json.loads(process.stdout)
+        import_times = _parse_importtime(process.stderr)
+        slowest = sorted(
+            (
+                (self_us, name) for name, (self_us, _) in import_times.items()
+                if name.startswith("src.")
+            ),
+            reverse=True,
+        )[:5]
+        msg = (
+            f"sortfin-cli show-branches startup took {result['elapsed']:.3f}s "
+            f"(budget: {STARTUP_BUDGET_S}s, import: "
+            f"{import_times[CLI_MODULE][1] / 1e6:.3f}s, slowest modules: {slowest})"
+        )
+        assert result["elapsed"] < STARTUP_BUDGET_S, msg #noqa: S101
+        assert not result["yaml"], "yaml imported at startup" #noqa: S101
@@ -1,4 +1,5 @@
 import datetime as dt
+import pickle
 import unittest
 
 import pytest
@@ -143,3 +144,26 @@ class TestStatement(unittest.TestCase):
         if log_4 != bmk_4:
             assert log_4 == bmk_4 # noqa: S101
 
+
+    def test_path_index(self) -> None:
+        statement = self.my_state
+        assert statement.get_account(AccountPath("EUROPE/My_Bank")) is \
+            statement.account.get_account(AccountPath("europe/my_bank")) #noqa: S101
+        statement.add_account(AccountPath("usa"), "broker", value=5)
+        assert statement.get_account(AccountPath("usa/broker")).value == 5 #noqa: S101, PLR2004
+        assert statement.delete_account(AccountPath("europe")) #noqa: S101
+        with pytest.raises(ValueError, match="no match for europe in root"):
+            statement.get_account(AccountPath("europe/my_bank"))
+        # same errors as walking the account tree
+        statement.add_account(AccountPath("usa"), "MY_BANK", value=1)
+        with pytest.raises(ValueError, match="multiple matches for my_bank in usa"):
+            statement.get_account(AccountPath("usa/my_bank"))
+        with pytest.raises(ValueError, match="is terminal and cannot have sub_accounts"):
+            statement.get_account(AccountPath("usa/broker/x"))
+        # direct changes of the tree need the index to be cleared
+        statement.account.sub_accounts.append(Account("japan", JPY.name, value=3))
+        statement.clear_path_index()
+        assert statement.get_account(AccountPath("japan")).value == 3 #noqa: S101, PLR2004
+        copy = pickle.loads(pickle.dumps(statement)) #noqa: S301
+        assert copy._path_index is None #noqa: S101, SLF001
+        assert copy.get_account(AccountPath("usa/broker")).value == 5 #noqa: S101, PLR2004
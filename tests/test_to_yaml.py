@@ -0,0 +1,58 @@
+import datetime as dt
+import json
+import unittest
+from unittest import mock
+
+import pytest
+
+from src.sortfin.session import Session
+from src.sortfin.to_yaml import from_list_to_session, from_session_to_list
+
+from .test_assetdb import ASSET_DB
+from .test_statement import STATEMENT
+
+
+class TestToYaml(unittest.TestCase):
+    def setUp(self) -> None:
+        self.session = Session(ASSET_DB)
+        self.session.data[(STATEMENT.date, Session.DEFAULT_BRANCH)] = STATEMENT.copy()
+        self.session_list = json.loads(json.dumps(from_session_to_list(self.session)))
+
+    def test_round_trip(self) -> None:
+        session = from_list_to_session(self.session_list)
+        statement = session.get_statement(STATEMENT.date)
+        assert session.keys() == self.session.keys() #noqa: S101
+        assert statement.account == STATEMENT.account #noqa: S101
+        assert statement.fx_market == STATEMENT.fx_market #noqa: S101
+
+    def test_validate_redundant_quote(self) -> None:
+        # EUR/JPY is implied by EUR/USD, GBP/USD and GBP/JPY
+        self.session_list[1][0][2][1].append(["EUR", "JPY", 100.0])
+        session = from_list_to_session(self.session_list)
+        fx_mkt = session.get_fxmarket(STATEMENT.date)
+        assert fx_mkt == STATEMENT.fx_market #noqa: S101
+        trusted = from_list_to_session(self.session_list, validate=False)
+        assert ("EUR", "JPY") in trusted.get_fxmarket(STATEMENT.date).quotes #noqa: S101
+
+    def test_validate_unknown_asset(self) -> None:
+        self.session_list[1][0][2][2][2][0][1] = "CHF"
+        with pytest.raises(ValueError, match="asset CHF not found"):
+            from_list_to_session(self.session_list)
+        self.session_list[1][0][2][2][2][0][1] = "EUR"
+        self.session_list[1][0][2][1].append(["CHF", "EUR", 1.0])
+        with pytest.raises(ValueError, match="Asset CHF not found"):
+            from_list_to_session(self.session_list)
+
+    def test_parallel(self) -> None:
+        for i in range(1, 8):
+            self.session.copy_statement(
+                STATEMENT.date, STATEMENT.date + dt.timedelta(days=i),
+            )
+        serial_list = from_session_to_list(self.session)
+        with mock.patch("src.sortfin.to_yaml.PARALLEL_THRESHOLD", 4):
+            parallel_list = from_session_to_list(self.session, workers=2)
+            session = from_list_to_session(parallel_list, workers=2)
+        assert parallel_list == serial_list #noqa: S101
+        assert session.keys() == self.session.keys() #noqa: S101
+        for key in session.keys():
+            assert session.data[key].account == self.session.data[key].account #noqa: S101
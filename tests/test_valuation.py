@@ -0,0 +1,59 @@
+import unittest
+
+import pytest
+
+from src.sortfin import AccountPath, ValuationReport
+
+from .test_asset import GBP, JPY, USD
+from .test_assetdb import ASSET_DB
+from .test_statement import STATEMENT
+
+PATHS = ["", "europe", "europe/my_bank", "usa", "usa/my_investment"]
+
+
+class TestValuation(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.statement = STATEMENT.copy()
+        self.statement.change_terminal_account(
+            AccountPath("usa/my_investment"), value=123456, unit=JPY.name,
+        )
+
+    def test_values(self) -> None:
+        report = self.statement.value(ASSET_DB, [GBP.name, USD.name])
+        assert report.units[:2] == (GBP.name, USD.name) #noqa: S101
+        for path_str in PATHS:
+            path = AccountPath(path_str)
+            account = self.statement.get_account(path)
+            for unit in [None, GBP.name, USD.name, JPY.name]:
+                assert report.get_value(path, unit) == account.get_account_price( #noqa: S101
+                    ASSET_DB, self.statement.fx_market, unit=unit,
+                ).value
+
+    def test_summary(self) -> None:
+        report = self.statement.value(ASSET_DB, [GBP.name])
+        for path_str in ["", "europe", "usa"]:
+            path = AccountPath(path_str)
+            assert report.print_summary(path) == ( #noqa: S101
+                f"Statement: {self.statement.date.date().isoformat()}\n"
+                + self.statement.get_account(path).print_account_summary(
+                    ASSET_DB, self.statement.fx_market,
+                )
+            )
+            summary = report.get_summary(path, GBP.name)
+            legacy_summary = self.statement.get_account(path).get_account_summary(
+                ASSET_DB, self.statement.fx_market, unit=GBP.name,
+            )
+            assert [(n, p1.value, p2.value) for n, p1, p2 in summary] == [ #noqa: S101
+                (n, p1.value, p2.value) for n, p1, p2 in legacy_summary
+            ]
+
+    def test_invalid_queries(self) -> None:
+        report = ValuationReport(self.statement, ASSET_DB, path=AccountPath("usa"))
+        assert report.get_value(AccountPath("USA/my_bank")) == 250 #noqa: S101, PLR2004
+        with pytest.raises(ValueError, match="not part of the valued accounts"):
+            report.get_value(AccountPath("europe"))
+        with pytest.raises(ValueError, match="is not valued in this report"):
+            report.get_value(AccountPath("usa"), GBP.name)
+        with pytest.raises(ValueError, match="not found in asset database"):
+            self.statement.value(ASSET_DB, ["CHF"])